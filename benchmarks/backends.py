@@ -0,0 +1,80 @@
+"""
+Benchmark the parallel backends of NDJSON validation against each other.
+
+Every backend the interpreter supports (threads, processes & on Python 3.14+
+subinterpreters) validates the same NDJSON buffer with each worker count, next to the
+single threaded baseline, so the fastest backend for a host can be picked.
+
+Usage:
+
+    python -m benchmarks.backends --workers 2 4 8 --lines 500000
+
+Functions:
+
+    - bench_backend: Measure NDJSON validation throughput of a backend.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from benchmarks.harness import EXPECTED, OPTIONAL, document, interpreter, rate
+from jval.parallel import available_backends, validate_ndjson
+
+
+def bench_backend(buffer: bytes, lines: int, backend: str, workers: int) -> float:
+    """
+    Measure NDJSON validation throughput of a backend.
+
+    Args
+    ----
+        - buffer (bytes): NDJSON to validate.
+        - lines (int): Number of lines in the buffer.
+        - backend (str): "thread", "process" or "interpreter".
+        - workers (int): Number of workers.
+
+    Returns
+    -------
+        - float: Lines validated per second.
+    """
+    return rate(
+        lambda: validate_ndjson(buffer, EXPECTED, OPTIONAL, workers, backend), lines
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark & print one row per backend & worker count.
+
+    Args
+    ----
+        - argv (Optional[List[str]]): Command line arguments, defaults to sys.argv.
+
+    Returns
+    -------
+        - int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--lines", type=int, default=500_000)
+    args = parser.parse_args(argv)
+    logging.disable(logging.ERROR)
+    print(interpreter())
+    buffer = "\n".join(json.dumps(document(index)) for index in range(args.lines))
+    data = buffer.encode()
+    baseline = bench_backend(data, args.lines, "thread", 1)
+    print(f"{'backend':>12} {'workers':>8} {'lines/s':>14} {'x':>6}")
+    print(f"{'-':>12} {1:>8} {baseline:>14,.0f} {1:>6.2f}")
+    for backend in available_backends():
+        for workers in args.workers:
+            lines = bench_backend(data, args.lines, backend, workers)
+            print(
+                f"{backend:>12} {workers:>8} {lines:>14,.0f} {lines / baseline:>6.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
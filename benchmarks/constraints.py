@@ -0,0 +1,190 @@
+"""
+Benchmark constraints checked in the validation pass against a second pass.
+
+Documents carry an email, a UUID, a date-time & a code matching a pattern. The single
+pass validates them against a schema constraining those keys; the two pass approach
+validates them against the same schema without constraints, then walks the document
+again checking each value, either with the same compiled checks (so only the extra walk
+differs) or with hand written regular expressions.
+
+Numeric constraints are benchmarked on batches: columns checked at once against their
+bounds & the greatest common divisor of their ints, against a batch validated without
+them followed by a loop over the valid documents.
+
+Usage:
+
+    python -m benchmarks.constraints --documents 100000
+
+Functions:
+
+    - bench_constraints: Measure single & two pass throughput.
+    - bench_columns: Measure batch throughput with & without numeric constraints.
+"""
+
+import argparse
+import logging
+import re
+import sys
+import uuid
+from typing import List, Optional, Tuple
+
+from benchmarks.harness import EXPECTED, OPTIONAL, document, interpreter, rate
+from jval.batch import validate_batch
+from jval.constraints import compile_constraints
+from jval.prewarm import compiled
+
+# constrained key -> constraints
+CONSTRAINED = {
+    "email": {"format": "email"},
+    "user_id": {"format": "uuid"},
+    "created": {"format": "date-time"},
+    "code": {"pattern": "^[A-Z]{2}[0-9]+$", "min_length": 3, "max_length": 12},
+}
+# hand written regular expressions of the second pass
+SECOND_PASS = {
+    "email": re.compile(r"[^@\s]+@[^@\s.]+(\.[^@\s.]+)+"),
+    "user_id": re.compile(r"[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}"),
+    "created": re.compile(
+        r"\d{4}-\d\d-\d\d[Tt ]\d\d:\d\d:\d\d(\.\d+)?([Zz]|[+-]\d\d:\d\d)"
+    ),
+    "code": re.compile(r"[A-Z]{2}[0-9]{1,10}"),
+}
+
+
+def bench_constraints(documents: int) -> Tuple[float, float, float, float]:
+    """
+    Measure single & two pass throughput.
+
+    Args
+    ----
+        - documents (int): Number of documents validated.
+
+    Returns
+    -------
+        - Tuple[float, float, float, float]: Documents validated per second without
+                                             constraints, with constraints in the
+                                             validation pass & with a second pass of the
+                                             same checks or of regular expressions.
+    """
+    plain = compiled(
+        EXPECTED + [{"param_name": name, "param_type": str} for name in CONSTRAINED],
+        OPTIONAL,
+    )
+    constrained = compiled(
+        EXPECTED
+        + [
+            dict({"param_name": name, "param_type": str}, **constraints)
+            for name, constraints in CONSTRAINED.items()
+        ],
+        OPTIONAL,
+    )
+    docs = [
+        dict(
+            document(index),
+            email=f"user{index}@example.com",
+            user_id=str(uuid.UUID(int=index)),
+            created="2024-01-31T23:59:59Z",
+            code=f"AB{index}",
+        )
+        for index in range(documents)
+    ]
+    same = [
+        (name, compile_constraints(constraints).reason)
+        for name, constraints in CONSTRAINED.items()
+    ]
+    regexes = list(SECOND_PASS.items())
+
+    def unconstrained():
+        for doc in docs:
+            plain.validate(doc)
+
+    def single():
+        for doc in docs:
+            constrained.validate(doc)
+
+    def two_pass():
+        for doc in docs:
+            if plain.validate(doc):
+                for name, reason in same:
+                    if reason(doc[name]) is not None:
+                        break
+
+    def two_pass_regex():
+        for doc in docs:
+            if plain.validate(doc):
+                for name, regex in regexes:
+                    if regex.fullmatch(doc[name]) is None:
+                        break
+
+    return (
+        rate(unconstrained, documents),
+        rate(single, documents),
+        rate(two_pass, documents),
+        rate(two_pass_regex, documents),
+    )
+
+
+def bench_columns(documents: int) -> Tuple[float, float, float]:
+    """
+    Measure batch throughput with & without numeric constraints.
+
+    Args
+    ----
+        - documents (int): Number of documents in the batch.
+
+    Returns
+    -------
+        - Tuple[float, float, float]: Documents validated per second without
+                                      constraints, with constraints over whole columns
+                                      & with a second pass.
+    """
+    size = {"param_name": "size", "param_type": int}
+    bounds = {"minimum": 0, "maximum": 1 << 40, "multiple_of": 4}
+    plain = compiled(EXPECTED + [size], OPTIONAL)
+    constrained = compiled(EXPECTED + [dict(size, **bounds)], OPTIONAL)
+    docs = [dict(document(index), size=index * 4) for index in range(documents)]
+
+    def two_pass():
+        for valid, doc in zip(validate_batch(docs, plain), docs):
+            if valid:
+                value = doc["size"]
+                if not 0 <= value <= 1 << 40 or value % 4:
+                    break
+
+    return (
+        rate(lambda: validate_batch(docs, plain), documents),
+        rate(lambda: validate_batch(docs, constrained), documents),
+        rate(two_pass, documents),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark & print its results.
+
+    Args
+    ----
+        - argv (Optional[List[str]]): Command line arguments, defaults to sys.argv.
+
+    Returns
+    -------
+        - int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--documents", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    logging.disable(logging.ERROR)
+    print(interpreter())
+    rates = bench_constraints(args.documents)
+    print(
+        f"{'unconstrained/s':>16} {'single pass/s':>16} {'two pass/s':>16}"
+        f" {'two pass regex/s':>16}"
+    )
+    print(" ".join(f"{value:>16,.0f}" for value in rates))
+    print(f"{'batch/s':>16} {'columns/s':>16} {'two pass/s':>16}")
+    print(" ".join(f"{value:>16,.0f}" for value in bench_columns(args.documents)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
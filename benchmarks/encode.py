@@ -0,0 +1,99 @@
+"""
+Benchmark validating while encoding against validating & then encoding.
+
+Valid documents are serialized with `JVal.dumps_validated`, with a precompiled schema &
+by validating them with `JVal.validate` or the compiled schema followed by
+`json.dumps`. Plain `json.dumps` is the floor none of them can beat.
+
+Usage:
+
+    python -m benchmarks.encode --documents 100000
+
+Functions:
+
+    - bench_encode: Measure the throughput of each way of validating & encoding.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import Dict, List, Optional
+
+from benchmarks.harness import EXPECTED, OPTIONAL, document, interpreter, rate
+from jval import JVal
+from jval.prewarm import compiled
+
+
+def bench_encode(documents: int) -> Dict[str, float]:
+    """
+    Measure the throughput of each way of validating & encoding.
+
+    Args
+    ----
+        - documents (int): Number of documents encoded.
+
+    Returns
+    -------
+        - Dict[str, float]: Documents encoded per second by each way.
+    """
+    docs = [document(index) for index in range(documents)]
+    validator = JVal()
+    schema = compiled(EXPECTED, OPTIONAL)
+
+    def dumps_validated():
+        for doc in docs:
+            validator.dumps_validated(doc, EXPECTED, OPTIONAL)
+
+    def precompiled():
+        for doc in docs:
+            validator.dumps_validated(doc, schema)
+
+    def validate_dumps():
+        for doc in docs:
+            if validator.validate(doc, EXPECTED, OPTIONAL):
+                json.dumps(doc).encode()
+
+    def compiled_dumps():
+        for doc in docs:
+            if schema.validate(doc):
+                json.dumps(doc).encode()
+
+    def dumps():
+        for doc in docs:
+            json.dumps(doc).encode()
+
+    return {
+        "dumps_validated": rate(dumps_validated, documents),
+        "precompiled": rate(precompiled, documents),
+        "validate + dumps": rate(validate_dumps, documents),
+        "compiled + dumps": rate(compiled_dumps, documents),
+        "dumps": rate(dumps, documents),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark & print one row per way of encoding.
+
+    Args
+    ----
+        - argv (Optional[List[str]]): Command line arguments, defaults to sys.argv.
+
+    Returns
+    -------
+        - int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--documents", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    logging.disable(logging.ERROR)
+    print(interpreter())
+    print(f"{'':>16} {'documents/s':>12}")
+    for name, documents in bench_encode(args.documents).items():
+        print(f"{name:>16} {documents:>12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
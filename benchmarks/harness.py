@@ -0,0 +1,80 @@
+"""
+Shared schema, documents & timing for the benchmarks.
+
+Attributes
+----------
+    EXPECTED (list): Expected keys of the benchmark schema.
+    OPTIONAL (list): Optional keys of the benchmark schema.
+
+Functions:
+
+    - document: Build a document valid against the benchmark schema.
+    - rate: Time a function & compute its throughput.
+    - interpreter: Describe the running interpreter.
+"""
+
+import sys
+import time
+from typing import Any, Callable, Dict
+
+EXPECTED = [
+    {"param_name": "source_type", "param_type": str, "possible_values": ["local"]},
+    {
+        "param_name": "store_info",
+        "param_type": dict,
+        "expected": [
+            {"param_name": "host", "param_type": str},
+            {"param_name": "port", "param_type": int},
+        ],
+    },
+]
+OPTIONAL = [{"param_name": "tags", "param_type": list}]
+
+
+def document(index: int) -> Dict[str, Any]:
+    """
+    Build a document valid against the benchmark schema.
+
+    Args
+    ----
+        - index (int): Varies the values of the document.
+
+    Returns
+    -------
+        - Dict[str, Any]: Document.
+    """
+    return {
+        "source_type": "local",
+        "store_info": {"host": f"host-{index}", "port": index},
+        "tags": ["a", "b"],
+    }
+
+
+def rate(function: Callable[[], Any], items: int) -> float:
+    """
+    Time a function & compute its throughput.
+
+    Args
+    ----
+        - function (Callable[[], Any]): Function processing the items.
+        - items (int): Number of items processed by one call.
+
+    Returns
+    -------
+        - float: Items processed per second.
+    """
+    start = time.perf_counter()
+    function()
+    return items / (time.perf_counter() - start)
+
+
+def interpreter() -> str:
+    """
+    Describe the running interpreter.
+
+    Returns
+    -------
+        - str: Python version & whether the GIL is enabled.
+    """
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    return f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}"
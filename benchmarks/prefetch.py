@@ -0,0 +1,112 @@
+"""
+Benchmark validating many files with read-ahead against reading them one at a time.
+
+Network filesystems are stood in for by a throttled reader that waits a fixed latency
+before every read, so the benchmark runs against local files. Each thread count is
+compared with a single reader thread, which is what a plain `fvalidate` loop does.
+
+Usage:
+
+    python -m benchmarks.prefetch --threads 1 4 16 --files 500 --latency 0.005
+
+Functions:
+
+    - throttled: Wrap a reader so every read waits a fixed latency first.
+    - bench_fvalidate_many: Measure file validation throughput with read-ahead.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+from unittest import mock
+
+from benchmarks.harness import EXPECTED, OPTIONAL, document, interpreter, rate
+from jval import JVal
+from jval.sources import read_source
+
+
+def throttled(latency: float) -> Callable[[str], bytes]:
+    """
+    Wrap the file reader so every read waits a fixed latency first.
+
+    Args
+    ----
+        - latency (float): Seconds each read waits.
+
+    Returns
+    -------
+        - Callable[[str], bytes]: Throttled reader.
+    """
+
+    def read(jpath: str) -> bytes:
+        time.sleep(latency)
+        return read_source(jpath)
+
+    return read
+
+
+def bench_fvalidate_many(paths: List[str], threads: int, latency: float) -> float:
+    """
+    Measure file validation throughput with read-ahead over a throttled filesystem.
+
+    Args
+    ----
+        - paths (List[str]): JSON files to validate.
+        - threads (int): Number of reader threads.
+        - latency (float): Seconds each read waits.
+
+    Returns
+    -------
+        - float: Files validated per second.
+    """
+    validator = JVal()
+
+    def run():
+        results = validator.fvalidate_many(paths, EXPECTED, OPTIONAL, threads=threads)
+        assert all(result for _, result in results)
+
+    with mock.patch("jval.read_source", throttled(latency)):
+        return rate(run, len(paths))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark & print one row per thread count.
+
+    Args
+    ----
+        - argv (Optional[List[str]]): Command line arguments, defaults to sys.argv.
+
+    Returns
+    -------
+        - int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args(argv)
+    logging.disable(logging.ERROR)
+    print(f"{interpreter()}, {args.latency * 1000:.1f}ms per read")
+    with tempfile.TemporaryDirectory() as root:
+        paths = []
+        for index in range(args.files):
+            path = os.path.join(root, f"{index}.json")
+            with open(path, "w", encoding="utf-8") as jfile:
+                json.dump(document(index), jfile)
+            paths.append(path)
+        baseline = bench_fvalidate_many(paths, 1, args.latency)
+        print(f"{'threads':>8} {'files/s':>12} {'x':>6}")
+        for threads in args.threads:
+            files = bench_fvalidate_many(paths, threads, args.latency)
+            print(f"{threads:>8} {files:>12,.0f} {files / baseline:>6.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Benchmark validation throughput against the number of threads.
+
+Two workloads are measured for each thread count:
+
+    - validate: CPU bound, compiled schema validation of in-memory objects. Throughput
+                only scales with threads on free-threaded (no-GIL) builds of CPython.
+    - fvalidate: file I/O bound validation of JSON files, which scales on GIL builds too
+                 since reads release the GIL.
+
+Usage:
+
+    python -m benchmarks.threads --threads 1 2 4 8 --objects 200000 --files 2000
+
+Functions:
+
+    - bench_validate: Measure compiled validation throughput with a number of threads.
+    - bench_fvalidate: Measure file validation throughput with a number of threads.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from benchmarks.harness import EXPECTED, OPTIONAL, document, interpreter, rate
+from jval import JVal
+from jval.prewarm import compiled
+
+
+def bench_validate(jobjs: List[Dict[str, Any]], threads: int) -> float:
+    """
+    Measure compiled validation throughput.
+
+    Args
+    ----
+        - jobjs (List[Dict[str, Any]]): Objects to validate.
+        - threads (int): Number of threads.
+
+    Returns
+    -------
+        - float: Objects validated per second.
+    """
+    schema = compiled(EXPECTED, OPTIONAL)
+    chunks = [jobjs[index::threads] for index in range(threads)]
+
+    def run():
+        with ThreadPoolExecutor(threads) as pool:
+            assert all(pool.map(lambda chunk: all(map(schema.validate, chunk)), chunks))
+
+    return rate(run, len(jobjs))
+
+
+def bench_fvalidate(paths: List[str], threads: int) -> float:
+    """
+    Measure file validation throughput.
+
+    Args
+    ----
+        - paths (List[str]): JSON files to validate.
+        - threads (int): Number of threads.
+
+    Returns
+    -------
+        - float: Files validated per second.
+    """
+    validator = JVal()
+
+    def run():
+        with ThreadPoolExecutor(threads) as pool:
+            assert all(
+                pool.map(
+                    lambda path: validator.fvalidate(path, EXPECTED, OPTIONAL), paths
+                )
+            )
+
+    return rate(run, len(paths))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark & print one row per thread count.
+
+    Args
+    ----
+        - argv (Optional[List[str]]): Command line arguments, defaults to sys.argv.
+
+    Returns
+    -------
+        - int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--objects", type=int, default=200_000)
+    parser.add_argument("--files", type=int, default=2_000)
+    args = parser.parse_args(argv)
+    logging.disable(logging.ERROR)
+    print(interpreter())
+    jobjs = [document(index) for index in range(args.objects)]
+    with tempfile.TemporaryDirectory() as root:
+        paths = []
+        for index in range(args.files):
+            path = os.path.join(root, f"{index}.json")
+            with open(path, "w", encoding="utf-8") as jfile:
+                json.dump(document(index), jfile)
+            paths.append(path)
+        baseline: Dict[str, float] = {}
+        print(
+            f"{'threads':>8} {'validate/s':>14} {'x':>6} {'fvalidate/s':>14} {'x':>6}"
+        )
+        for threads in args.threads:
+            rates = {
+                "validate": bench_validate(jobjs, threads),
+                "fvalidate": bench_fvalidate(paths, threads),
+            }
+            for name, rate in rates.items():
+                baseline.setdefault(name, rate)
+            print(
+                f"{threads:>8} {rates['validate']:>14,.0f} "
+                f"{rates['validate'] / baseline['validate']:>6.2f} "
+                f"{rates['fvalidate']:>14,.0f} "
+                f"{rates['fvalidate'] / baseline['fvalidate']:>6.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Benchmark schema unions against trying each alternative in turn.
+
+A union of alternatives that share their first keys & differ by the presence of one key
+validates documents matching its last alternative, the worst case for trying each
+alternative in turn. Both are compared with validating the document against the
+matching schema alone.
+
+Usage:
+
+    python -m benchmarks.union --alternatives 2 8 32 --documents 100000
+
+Functions:
+
+    - alternatives: Build alternatives sharing the benchmark schema's keys.
+    - bench_union: Measure union & try-each-in-turn throughput.
+"""
+
+import argparse
+import logging
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.harness import EXPECTED, OPTIONAL, document, interpreter, rate
+from jval.prewarm import compiled
+from jval.union import SchemaUnion
+
+
+def alternatives(
+    count: int,
+) -> List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Build alternatives sharing the benchmark schema's keys, each adding a key of its own.
+
+    Args
+    ----
+        - count (int): Number of alternatives.
+
+    Returns
+    -------
+        - List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]: (expected, optional)
+                                                                    pairs.
+    """
+    return [
+        (EXPECTED + [{"param_name": f"key_{index}", "param_type": int}], OPTIONAL)
+        for index in range(count)
+    ]
+
+
+def bench_union(count: int, documents: int) -> Tuple[float, float, float]:
+    """
+    Measure union & try-each-in-turn throughput.
+
+    Args
+    ----
+        - count (int): Number of alternatives.
+        - documents (int): Number of documents validated.
+
+    Returns
+    -------
+        - Tuple[float, float, float]: Documents validated per second by the matching
+                                      schema alone, the union & each alternative in
+                                      turn.
+    """
+    pairs = alternatives(count)
+    schemas = [compiled(*pair) for pair in pairs]
+    union = SchemaUnion(pairs)
+    docs = [
+        dict(document(index), **{f"key_{count - 1}": index})
+        for index in range(documents)
+    ]
+
+    def single():
+        for doc in docs:
+            schemas[-1].validate(doc)
+
+    def tree():
+        for doc in docs:
+            union.match(doc)
+
+    def in_turn():
+        for doc in docs:
+            next((index for index, s in enumerate(schemas) if s.validate(doc)), None)
+
+    return rate(single, documents), rate(tree, documents), rate(in_turn, documents)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark & print one row per number of alternatives.
+
+    Args
+    ----
+        - argv (Optional[List[str]]): Command line arguments, defaults to sys.argv.
+
+    Returns
+    -------
+        - int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--alternatives", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--documents", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    logging.disable(logging.ERROR)
+    print(interpreter())
+    print(f"{'alternatives':>12} {'single/s':>12} {'union/s':>12} {'in turn/s':>12}")
+    for count in args.alternatives:
+        single, tree, in_turn = bench_union(count, args.documents)
+        print(f"{count:>12} {single:>12,.0f} {tree:>12,.0f} {in_turn:>12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,6 +25,21 @@ They can be simple, nested, or conditional.
             "param_name": "source_type",
             "param_type": str
         }
+        constrained_key = {
+            "param_name": "user_id",
+            "param_type": str,
+            "format": "uuid"
+        }
+        bounded_key = {
+            "param_name": "port",
+            "param_type": int,
+            "minimum": 1,
+            "maximum": 65535
+        }
+
+      String values can also be constrained with "pattern", "min_length", "max_length"
+      & "format", numbers with "minimum", "maximum" & "multiple_of" (see
+      jval.constraints).
 
     - Nested:
         nested_key = {
@@ -78,18 +93,52 @@ or may not be in the JSON object. They are only checked for types.
 
 Methods:
 
-    - validate: Validate a JSON object against a schema.
+    - validate: Validate a JSON object (or any Mapping) against a schema.
+    - ovalidate: Validate a Python object (dataclass, slotted or plain) against a schema.
+    - dumps_validated: Serialize an object to JSON bytes, raising if it isn't valid.
+    - validate_batch: Validate a batch of JSON objects against a schema, key by key.
+    - validate_records: Validate every row of a NumPy structured array against a schema.
+    - validate_ndjson: Validate every line of an NDJSON buffer, optionally in parallel
+                       processes sharing it through shared memory.
+    - validate_buffer: Validate back-to-back JSON objects held in a bytes-like buffer.
     - fvalidate: Validate a JSON file against a schema.
+    - fvalidate_many: Validate many JSON files, overlapping reads in a thread pool.
+    - avalidate: Validate every JSON member of a tar or zip archive against a schema.
+    - fvalidate_array: Validate every element of a top-level JSON array against a schema.
+    - fvalidate_events: Validate a JSON file against a schema from parse events in
+                        constant memory.
+    - fvalidate_ndjson: Validate every line of a line-delimited JSON file against a schema.
+    - watcher: Watch a directory tree & incrementally revalidate changed JSON files.
 """
-
 import json
 import logging
 import os
 from logging.config import dictConfig
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from jval import _version
-from jval.common import LOGGING_DICT
+from jval.adapters import AttributeMapping, as_mapping, check_type
+from jval.archive import ARCHIVE_ERRORS, is_archive, validate_archive
+from jval.arrays import validate_records
+from jval.batch import validate_batch
+from jval.cache import ResultCache
+from jval.common import FETCH_THREADS, LOGGING_DICT
+from jval.constraints import Constraints, compile_constraints
+from jval.decode import decode_validated
+from jval.encode import encode_validated
+from jval.errors import SchemaError, ValidationError
+from jval.events import EventValidator
+from jval.files import validate_file, validate_lines, validate_many
+from jval.metaschema import check_schema
+from jval.parallel import validate_ndjson
+from jval.prewarm import compiled, prewarm_from_env
+from jval.registry import SchemaRegistry
+from jval.router import Router
+from jval.schema import CompiledSchema, fingerprint
+from jval.sources import READ_ERRORS, open_source, read_source
+from jval.stream import iter_array, iter_concatenated
+from jval.union import SchemaUnion
+from jval.watch import Watcher
 
 __version__ = _version.get_versions()["version"]
 
@@ -102,10 +151,16 @@ class JVal:
     JSON validator class for checking if a given JSON object or file matches a schema.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ResultCache] = None):
         """
         Instantiate the JSON validator.
+
+        Args
+        ----
+            - cache (Optional[ResultCache]): Persistent cache of file validation results
+                                             used by `fvalidate`, disabled by default.
         """
+        self.cache = cache
 
     def _validate_expected(
         self, jobj: Dict[str, Any], expected: Dict[str, Any]
@@ -122,7 +177,16 @@ class JVal:
         Returns
         -------
             - bool: True if the JSON object is valid according to the schema, False otherwise.
+
+        Raises
+        ------
+            - SchemaError: If the constraints of a key are malformed, before any value
+                           is looked at.
         """
+        # compile constraints first so malformed ones are reported up front
+        key_constraints = [
+            compile_constraints(expected_key) for expected_key in expected
+        ]
         _contains_params = [
             parameter in jobj
             for parameter in [expected_key["param_name"] for expected_key in expected]
@@ -142,7 +206,7 @@ class JVal:
         # validate types
         correct_types = [
             # check if type matches specified in schema
-            isinstance(
+            check_type(
                 jobj[expected_key["param_name"]],
                 expected_key["param_type"],
             )
@@ -160,20 +224,12 @@ class JVal:
             logger.error("incorrect type for: %s", incorrect_type)
             return False
 
-        for expected_key in expected:
-            # validate possible values
-            if "possible_values" in expected_key:
-                if (
-                    jobj[expected_key["param_name"]]
-                    not in expected_key["possible_values"]
-                ):
-                    # log & return
-                    logger.error(
-                        "incorrect possible value: %s, for param: %s",
-                        jobj[expected_key["param_name"]],
-                        expected_key["param_name"],
-                    )
-                    return False
+        for expected_key, constraints in zip(expected, key_constraints):
+            # validate possible values & constraints
+            if not self._allowed_value(
+                jobj[expected_key["param_name"]], expected_key, constraints
+            ):
+                return False
             # validate nested
             if expected_key["param_type"] == dict:
                 # validate nested expected
@@ -203,6 +259,45 @@ class JVal:
                     )
         return True
 
+    def _allowed_value(
+        self,
+        value: Any,
+        expected_key: Dict[str, Any],
+        constraints: Optional[Constraints],
+    ) -> bool:
+        """
+        Validate the value of an expected key against its possible values & constraints.
+
+        Args
+        ----
+            - value (Any): Value of the key in the JSON object.
+            - expected_key (Dict[str, Any]): Expected key.
+            - constraints (Optional[Constraints]): Compiled constraints of the key.
+
+        Returns
+        -------
+            - bool: True if the value is allowed, False otherwise.
+        """
+        # validate possible values
+        if "possible_values" in expected_key:
+            if value not in expected_key["possible_values"]:
+                # log & return
+                logger.error(
+                    "incorrect possible value: %s, for param: %s",
+                    value,
+                    expected_key["param_name"],
+                )
+                return False
+        # validate constraints
+        reason = None if constraints is None else constraints.reason(value)
+        if reason is not None:
+            # log & return
+            logger.error(
+                "%s: %s, for param: %s", reason, value, expected_key["param_name"]
+            )
+            return False
+        return True
+
     def _validate_optional(
         self, jobj: Dict[str, Any], optional: Dict[str, Any]
     ) -> bool:
@@ -225,7 +320,7 @@ class JVal:
             # validate all optional keys in json object
             if optional_key["param_name"] in jobj:
                 # validate types
-                correct_type = isinstance(
+                correct_type = check_type(
                     jobj[optional_key["param_name"]],
                     optional_key["param_type"],
                 )
@@ -330,6 +425,9 @@ class JVal:
         """
         Validate a JSON object against a schema.
 
+        The object can be any `Mapping` (e.g. a `dict` subclass or `MappingProxyType`),
+        & nested mappings are accepted wherever the schema expects a `dict`.
+
         Args
         ----
             - jobj (Dict[str, Any]): JSON object to validate.
@@ -367,15 +465,266 @@ class JVal:
             return self._validate_optional(jobj, optional)
         return True
 
+    def _route(
+        self,
+        jobj: Dict[str, Any],
+        expected: Optional[List[Dict[str, Any]]],
+        optional: Optional[List[Dict[str, Any]]],
+        router: Optional[Router],
+    ) -> bool:
+        """
+        Validate a JSON object against a schema or the one a router selects for it.
+
+        Args
+        ----
+            - jobj (Dict[str, Any]): JSON object to validate.
+            - expected (Optional[List[Dict[str, Any]]]): Expected keys of the schema.
+            - optional (Optional[List[Dict[str, Any]]]): Optional keys of the schema.
+            - router (Optional[Router]): Router selecting the schema instead.
+
+        Returns
+        -------
+            - bool: True if the JSON object satisfies the schema, False otherwise.
+        """
+        if router is not None:
+            return router.validate(jobj)
+        return self.validate(jobj, expected=expected, optional=optional)
+
+    def ovalidate(
+        self,
+        obj: Any,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """
+        Validate a Python object against a schema without serializing it to JSON.
+
+        Mappings are validated as they are. Dataclass instances, `__slots__` classes &
+        plain objects are viewed as mappings of their attributes (see
+        `AttributeMapping`), nested objects included, without copying them. Nested
+        objects are only viewed as mappings under keys the schema expects a dict at.
+
+        Args
+        ----
+            - obj (Any): Mapping or attribute-bearing object to validate.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+
+        Returns
+        -------
+            - bool: True if the object satisfies the schema, False otherwise.
+        """
+        return self.validate(
+            as_mapping(obj, (expected, optional)),
+            expected=expected,
+            optional=optional,
+        )
+
+    def dumps_validated(
+        self,
+        obj: Any,
+        expected: Union[List[Dict[str, Any]], CompiledSchema, None] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+    ) -> bytes:
+        """
+        Serialize an object to JSON, raising if it doesn't satisfy a schema.
+
+        A convenience over `validate` followed by `json.dumps`, with the output identical
+        to `json.dumps(obj).encode()`: the object is checked by its compiled schema &
+        encoded by the C encoder, an invalid object is walked to find where it breaks
+        the schema. The schema is compiled once per process & reused by later calls
+        (see `jval.prewarm`); hot paths can pass an already compiled schema as
+        `expected` to skip even the lookup.
+
+        Args
+        ----
+            - obj (Any): Object (or any Mapping) to serialize.
+            - expected (Union[List[Dict[str, Any]], CompiledSchema, None]): Expected keys
+                        as for `validate`, or a compiled schema (then without `optional`)
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+
+        Returns
+        -------
+            - bytes: UTF-8 encoded JSON.
+
+        Raises
+        ------
+            - ValidationError: At the first violation of the schema.
+            - ValueError: If `optional` is given along with a compiled schema.
+        """
+        if not isinstance(expected, CompiledSchema):
+            expected = compiled(expected, optional)
+        elif optional is not None:
+            raise ValueError("optional keys are part of the compiled schema")
+        return encode_validated(obj, expected)
+
+    def validate_batch(
+        self,
+        jobjs: List[Any],
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        router: Optional[Router] = None,
+    ) -> List[bool]:
+        """
+        Validate a batch of JSON objects against a schema.
+
+        The batch is validated column by column (one key of the schema at a time across
+        all objects) rather than object by object, which is considerably faster for
+        large batches of objects with the same shape.
+
+        Args
+        ----
+            - jobjs (List[Any]): JSON objects to validate.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+            - router (Optional[Router]): Validate each object against the schema its
+                                         discriminator selects instead.
+
+        Returns
+        -------
+            - List[bool]: Result for each object, in batch order.
+        """
+        if router is not None:
+            return router.validate_batch(jobjs)
+        return validate_batch(jobjs, compiled(expected, optional))
+
+    def validate_records(
+        self,
+        records: Any,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+    ) -> Any:
+        """
+        Validate every row of a NumPy structured (record) array against a schema.
+
+        Fields are checked column by column, types once per field from its dtype, so
+        rows don't have to be converted to dicts. Requires NumPy.
+
+        Args
+        ----
+            - records (numpy.ndarray): Structured array or `numpy.recarray`.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+
+        Returns
+        -------
+            - numpy.ndarray: Boolean validity mask of the same shape as `records`.
+        """
+        return validate_records(records, compiled(expected, optional))
+
+    def validate_ndjson(  # pylint: disable=too-many-arguments
+        self,
+        buffer: Any,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        processes: Optional[int] = None,
+        backend: str = "process",
+        router: Optional[Router] = None,
+    ) -> List[Tuple[int, bool]]:
+        """
+        Validate every line of a line-delimited JSON (NDJSON) buffer against a schema.
+
+        With more than one process the buffer is copied into shared memory once &
+        worker processes validate slices of it in place, writing their results into a
+        shared result block, so no lines or results are pickled. Workers can also be
+        threads or, on Python 3.14+, subinterpreters (see `jval.parallel`).
+
+        Args
+        ----
+            - buffer (Any): bytes, bytearray, memoryview or mmap holding UTF-8 encoded
+                            NDJSON.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+            - processes (Optional[int]): Number of workers, lines are validated in the
+                                         calling thread if not greater than 1.
+            - backend (str): "thread", "process" or "interpreter".
+            - router (Optional[Router]): Validate each object against the schema its
+                                         discriminator selects instead.
+
+        Returns
+        -------
+            - List[Tuple[int, bool]]: (line number, result) for every non blank line,
+                                      line numbers start at 1.
+        """
+        return validate_ndjson(buffer, expected, optional, processes, backend, router)
+
+    def validate_buffer(
+        self,
+        buffer: Any,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        router: Optional[Router] = None,
+    ) -> Iterator[Tuple[int, int, bool]]:
+        """
+        Validate back-to-back (concatenated) JSON objects held in a bytes-like buffer.
+
+        Objects are decoded in place at increasing offsets, the buffer is never split
+        into per-object copies. Values that aren't JSON objects are reported as invalid.
+
+        Args
+        ----
+            - buffer (Any): bytes, bytearray, memoryview or mmap holding UTF-8 encoded
+                            JSON objects, optionally separated by whitespace.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+            - router (Optional[Router]): Validate each object against the schema its
+                                         discriminator selects instead.
+
+        Returns
+        -------
+            - Iterator[Tuple[int, int, bool]]: (byte offset, byte length, result) for every
+                                               object.
+        """
+        for offset, length, jobj in iter_concatenated(buffer):
+            if not isinstance(jobj, dict):
+                logger.error("value at offset is not an object: %s", offset)
+                yield offset, length, False
+                continue
+            yield offset, length, self._route(jobj, expected, optional, router)
+
     def fvalidate(
         self,
         jpath: str,
         expected: Optional[List[Dict[str, Any]]] = None,
         optional: Optional[List[Dict[str, Any]]] = None,
+        early_reject: bool = False,
     ) -> bool:
         """
         Validate a JSON file against a schema.
 
+        Documents that aren't JSON objects are invalid.
+
+        If the validator has a result cache, files that were already validated against
+        the same schema & haven't changed since are answered from the cache without
+        being decoded.
+
+        With `early_reject` the file is validated while it is decoded & decoding stops
+        at the first violation the rest of the file can't make up for (e.g. an unknown
+        or wrongly typed top-level key), so invalid documents are rejected in a fraction
+        of the time it takes to decode them.
+
         Args
         ----
             - jpath: Absolute path to the JSON file.
@@ -385,11 +734,245 @@ class JVal:
             - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
                                                          & names of each JSON parameter that
                                                          may or may not be in the JSON object
+            - early_reject (bool): Validate while decoding & stop at the first violation.
+
+        Returns
+        -------
+            - bool: True if the JSON file satisfies the schema, False otherwise.
+        """
+        return validate_file(self, jpath, expected, optional, early_reject)
+
+    def fvalidate_many(  # pylint: disable=too-many-arguments
+        self,
+        jpaths: Iterable[str],
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        threads: int = FETCH_THREADS,
+        read_ahead: Optional[int] = None,
+        router: Optional[Router] = None,
+    ) -> Iterator[Tuple[str, bool]]:
+        """
+        Validate many JSON files, reading them ahead in a thread pool.
+
+        Files are read (& result cache lookups done) by a pool of threads while the
+        calling thread decodes & validates each file as soon as it has been read, so
+        time spent waiting on I/O overlaps. At most `read_ahead` files are read ahead.
+        Files that can't be read or decoded (e.g. truncated archives) & documents that
+        aren't objects are reported as invalid.
+
+        Args
+        ----
+            - jpaths (Iterable[str]): Paths to the JSON files, consumed lazily.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+            - threads (int): Number of reader threads.
+            - read_ahead (Optional[int]): Maximum number of files read ahead, defaults
+                                          to twice the number of threads.
+            - router (Optional[Router]): Validate each document against the schema its
+                                         discriminator selects instead.
+
+        Returns
+        -------
+            - Iterator[Tuple[str, bool]]: (path, result) in the order reads complete.
+        """
+        return validate_many(
+            self,
+            jpaths,
+            expected=expected,
+            optional=optional,
+            threads=threads,
+            read_ahead=read_ahead,
+            router=router,
+        )
+
+    def avalidate(  # pylint: disable=too-many-arguments
+        self,
+        apath: str,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        pattern: str = "*.json",
+        processes: Optional[int] = None,
+        router: Optional[Router] = None,
+    ) -> Dict[str, bool]:
+        """
+        Validate every JSON member of a tar or zip archive against a schema.
+
+        Members are streamed from the archive into the decoder without being extracted
+        to disk. Members that aren't valid JSON objects are reported as invalid.
+
+        Args
+        ----
+            - apath: Absolute path to the tar (optionally compressed) or zip archive.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+            - pattern (str): Glob pattern member names must match to be validated.
+            - processes (Optional[int]): Spread members across this many worker processes
+                                         by index.
+            - router (Optional[Router]): Validate each object against the schema its
+                                         discriminator selects instead.
+
+        Returns
+        -------
+            - Dict[str, bool]: Map of member name to result, in archive order.
+        """
+        return validate_archive(
+            self,
+            apath,
+            expected=expected,
+            optional=optional,
+            pattern=pattern,
+            processes=processes,
+            router=router,
+        )
+
+    def fvalidate_array(
+        self,
+        jpath: str,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        router: Optional[Router] = None,
+    ) -> Iterator[Tuple[int, bool]]:
+        """
+        Validate every element of a file containing a top-level JSON array.
+
+        Elements are decoded & validated one at a time from a sliding buffer, so memory
+        use is bounded by the size of the largest element rather than the whole file.
+        Elements that aren't JSON objects are reported as invalid.
+
+        Args
+        ----
+            - jpath: Absolute path to the (optionally compressed) JSON file.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+            - router (Optional[Router]): Validate each object against the schema its
+                                         discriminator selects instead.
+
+        Returns
+        -------
+            - Iterator[Tuple[int, bool]]: (element index, result) for every element.
+        """
+        with open_source(jpath) as jfile:
+            for index, jobj in enumerate(iter_array(jfile)):
+                if not isinstance(jobj, dict):
+                    logger.error("element is not an object: %s", index)
+                    yield index, False
+                    continue
+                yield index, self._route(jobj, expected, optional, router)
+
+    def fvalidate_events(
+        self,
+        jpath: str,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """
+        Validate a (huge) JSON file against a schema without decoding it.
+
+        The file is tokenized & checked as the tokens stream past, subtrees not named in
+        the schema are skipped without being built. Memory use depends on the depth of
+        the schema rather than the size of the file, & reading stops at the first
+        unknown or wrongly typed top-level key.
+
+        Args
+        ----
+            - jpath: Absolute path to the (optionally compressed) JSON file.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
 
         Returns
         -------
             - bool: True if the JSON file satisfies the schema, False otherwise.
         """
-        with open(jpath, "rb") as jfile:
-            jobj = json.loads(jfile)
-            return self.validate(jobj, expected=expected, optional=optional)
+        with open_source(jpath) as jfile:
+            return EventValidator(expected, optional).validate(jfile)
+
+    def fvalidate_ndjson(
+        self,
+        jpath: str,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        router: Optional[Router] = None,
+    ) -> Iterator[Tuple[int, bool]]:
+        """
+        Validate every line of a line-delimited JSON (NDJSON) file against a schema.
+
+        The file is read (& if compressed decompressed) incrementally, one line at a
+        time, so memory use does not depend on the size of the file. Blank lines are
+        skipped & lines that aren't valid JSON objects are reported as invalid.
+
+        Args
+        ----
+            - jpath: Absolute path to the NDJSON file.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+            - router (Optional[Router]): Validate each object against the schema its
+                                         discriminator selects instead.
+
+        Returns
+        -------
+            - Iterator[Tuple[int, bool]]: (line number, result) for every non blank line,
+                                          line numbers start at 1.
+        """
+        with open_source(jpath) as jfile:
+            yield from validate_lines(self, jfile, expected, optional, router)
+
+    def watcher(  # pylint: disable=too-many-arguments
+        self,
+        root: str,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        pattern: str = "*.json",
+        use_hash: bool = False,
+    ) -> Watcher:
+        """
+        Watch a directory tree and incrementally revalidate JSON files that change.
+
+        Args
+        ----
+            - root (str): Directory tree to watch.
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+            - pattern (str): Glob pattern file names must match to be validated.
+            - use_hash (bool): Also compare content hashes so touched but unmodified files
+                               are not revalidated.
+
+        Returns
+        -------
+            - Watcher: Watcher whose `poll` / `watch` methods revalidate changed files.
+        """
+        return Watcher(
+            self,
+            root,
+            expected=expected,
+            optional=optional,
+            pattern=pattern,
+            use_hash=use_hash,
+        )
+
+
+# schemas named by JVAL_PREWARM are compiled (& frozen) once, at import
+prewarm_from_env()
@@ -0,0 +1,286 @@
+"""
+Validate Python objects directly, without a JSON round-trip.
+
+Any `collections.abc.Mapping` (`dict` subclasses, `types.MappingProxyType`, custom
+mappings) can be passed to the validator as is, & wherever a schema asks for a `dict` any
+mapping is accepted. Attribute-bearing objects (dataclass instances, `__slots__` classes &
+plain objects) are validated through `AttributeMapping`, a read-only mapping view over
+their attributes that copies nothing; nested objects are wrapped lazily as they are
+looked up, only under keys the schema expects a dict at (an Enum member or other object
+under a key of its own type is left as is).
+
+Functions:
+
+    - as_mapping: Wrap an attribute-bearing object in a mapping view, if needed.
+    - record_shape: Find the keys of a schema whose values may be viewed as mappings.
+    - check_type: isinstance check that accepts any mapping where a dict is expected.
+
+Classes:
+
+    - AttributeMapping: Read-only mapping view over an object's attributes.
+"""
+
+import dataclasses
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# types that are never treated as attribute-bearing records
+_SCALARS = (str, bytes, bytearray, int, float, bool, type(None), list, tuple, set)
+# class -> attribute names (dataclass fields or slots)
+_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """
+    Collect the slots of a class & its bases.
+
+    Args
+    ----
+        - cls (type): Class to inspect.
+
+    Returns
+    -------
+        - Tuple[str, ...]: Slot names, excluding __dict__ & __weakref__.
+    """
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(slot for slot in slots if slot not in ("__dict__", "__weakref__"))
+    return tuple(dict.fromkeys(names))
+
+
+def _attribute_names(obj: Any) -> Tuple[str, ...]:
+    """
+    Get the names of the attributes exposed by a record, cached per class.
+
+    Args
+    ----
+        - obj (Any): Dataclass instance, slotted or plain object.
+
+    Returns
+    -------
+        - Tuple[str, ...]: Attribute names, empty for objects that store them in __dict__.
+    """
+    cls = type(obj)
+    names = _NAMES.get(cls)
+    if names is None:
+        if dataclasses.is_dataclass(cls):
+            names = tuple(field.name for field in dataclasses.fields(cls))
+        else:
+            names = _slot_names(cls)
+        _NAMES[cls] = names
+    return names
+
+
+def _is_record(value: Any) -> bool:
+    """
+    Check if a value is an attribute-bearing object that should be viewed as a mapping.
+
+    Args
+    ----
+        - value (Any): Value to check.
+
+    Returns
+    -------
+        - bool: True for dataclass instances, slotted & plain objects.
+    """
+    if isinstance(value, (_SCALARS, Mapping, type)):
+        return False
+    return (
+        dataclasses.is_dataclass(value)
+        or hasattr(value, "__dict__")
+        or bool(_slot_names(type(value)))
+    )
+
+
+def as_mapping(
+    obj: Any,
+    schema: Optional[
+        Tuple[Optional[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]
+    ] = None,
+) -> Any:
+    """
+    Wrap an attribute-bearing object in a mapping view, leaving anything else as is.
+
+    Args
+    ----
+        - obj (Any): Object to wrap.
+        - schema (Optional[Tuple[...]]): (expected, optional) keys the object is
+                                         validated against, nested objects are then
+                                         only wrapped under keys expecting a dict. Any
+                                         nested object is wrapped if None.
+
+    Returns
+    -------
+        - Any: `AttributeMapping` for records, the object itself otherwise.
+    """
+    if not _is_record(obj):
+        return obj
+    return AttributeMapping(obj, None if schema is None else record_shape(*schema))
+
+
+def _expects_dict(param_type: Any) -> bool:
+    """
+    Check if a `param_type` accepts dicts.
+
+    Args
+    ----
+        - param_type (Any): Type or tuple of types from the schema.
+
+    Returns
+    -------
+        - bool: True if dict is (one of) the type(s), False otherwise.
+    """
+    return param_type is dict or (isinstance(param_type, tuple) and dict in param_type)
+
+
+def _fill_shape(shape: Dict[str, Any], keys: Optional[List[Dict[str, Any]]]):
+    """
+    Add the keys expecting a dict & the shape of their nested schemas to a shape.
+
+    Args
+    ----
+        - shape (Dict[str, Any]): Shape, updated in place.
+        - keys (Optional[List[Dict[str, Any]]]): Expected or optional keys.
+    """
+    for key in keys or ():
+        if not _expects_dict(key["param_type"]):
+            continue
+        nested = shape.setdefault(key["param_name"], {})
+        _fill_shape(nested, key.get("expected"))
+        _fill_shape(nested, key.get("optional"))
+        if "conditional" in key:
+            for branch in key["conditional"]["dependence_info"].values():
+                _fill_shape(nested, branch["expected"])
+                _fill_shape(nested, branch["optional"])
+
+
+def record_shape(
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Find the keys of a schema whose values may be records to view as mappings.
+
+    Args
+    ----
+        - expected (Optional[List[Dict[str, Any]]]): Expected keys.
+        - optional (Optional[List[Dict[str, Any]]]): Optional keys.
+
+    Returns
+    -------
+        - Dict[str, Any]: Name of each key expecting a dict -> shape of its value, made
+                          of the keys of every nested schema & conditional branch.
+    """
+    shape: Dict[str, Any] = {}
+    _fill_shape(shape, expected)
+    _fill_shape(shape, optional)
+    return shape
+
+
+def check_type(value: Any, param_type: Any) -> bool:
+    """
+    Check a value against a `param_type`, accepting any mapping where a dict is expected.
+
+    Args
+    ----
+        - value (Any): Value to check.
+        - param_type (Any): Type or tuple of types from the schema.
+
+    Returns
+    -------
+        - bool: True if the value has the expected type, False otherwise.
+    """
+    if isinstance(value, param_type):
+        return True
+    return isinstance(value, Mapping) and (
+        param_type is dict or (isinstance(param_type, tuple) and dict in param_type)
+    )
+
+
+class AttributeMapping(Mapping):
+    """
+    Read-only mapping view over the attributes of an object.
+
+    Keys are the dataclass fields, the (set) slots or the instance __dict__ of the object.
+    Nested attribute-bearing values are returned wrapped in a view as well, if their key
+    is in the shape of the view.
+    """
+
+    __slots__ = ("obj", "shape")
+
+    def __init__(self, obj: Any, shape: Optional[Dict[str, Any]] = None):
+        """
+        Args
+        ----
+            - obj (Any): Dataclass instance, slotted or plain object.
+            - shape (Optional[Dict[str, Any]]): Keys whose values are wrapped in turn
+                                                (see `record_shape`), any record value
+                                                if None.
+        """
+        self.obj = obj
+        self.shape = shape
+
+    def _keys(self) -> Iterator[str]:
+        """
+        Iterate over the names of the attributes that are set.
+        """
+        names = _attribute_names(self.obj)
+        if not names:
+            return iter(vars(self.obj))
+        obj = self.obj
+        return (name for name in names if hasattr(obj, name))
+
+    def __getitem__(self, name: str) -> Any:
+        """
+        Look up an attribute, wrapping attribute-bearing values.
+        """
+        names = _attribute_names(self.obj)
+        if names:
+            if name not in names:
+                raise KeyError(name)
+            try:
+                value = getattr(self.obj, name)
+            except AttributeError:
+                raise KeyError(name) from None
+        else:
+            try:
+                value = vars(self.obj)[name]
+            except TypeError:
+                raise KeyError(name) from None
+        if self.shape is None:
+            return as_mapping(value)
+        nested = self.shape.get(name)
+        if nested is None or not _is_record(value):
+            # values under keys not expecting a dict are checked as they are
+            return value
+        return AttributeMapping(value, nested)
+
+    def __contains__(self, name: object) -> bool:
+        """
+        Check if an attribute is set, without looking up its value.
+        """
+        names = _attribute_names(self.obj)
+        if names:
+            return name in names and hasattr(self.obj, name)  # type: ignore
+        return name in vars(self.obj)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterate over the names of the attributes that are set.
+        """
+        return self._keys()
+
+    def __len__(self) -> int:
+        """
+        Number of attributes that are set.
+        """
+        return sum(1 for _ in self._keys())
+
+    def __repr__(self) -> str:
+        """
+        Represent the view by the object it wraps.
+        """
+        return f"AttributeMapping({self.obj!r})"
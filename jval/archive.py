@@ -0,0 +1,179 @@
+"""
+Validate JSON members of tar & zip archives without extracting them to disk.
+
+Members are streamed straight from `tarfile` / `zipfile` into the JSON decoder. Tar
+archives (including .tar.gz / .tar.bz2 / .tar.xz) are read in stream mode so they're
+decompressed sequentially exactly once per reader. Members that aren't valid JSON objects
+are reported as invalid. Validation can optionally be spread across a process pool: each
+worker reads the archive itself & validates the members whose index falls into its
+share, so no member data is pickled between processes.
+
+Attributes
+----------
+    ARCHIVE_ERRORS (tuple): Errors raised reading a truncated or corrupt archive.
+
+Functions:
+
+    - is_archive: Check if a path names a supported archive.
+    - iter_members: Iterate over the JSON members of an archive as binary streams.
+    - validate_archive: Validate every JSON member of an archive.
+"""
+
+import fnmatch
+import json
+import logging
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from jval.common import ARCHIVE_SUFFIXES
+from jval.router import Router
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_ERRORS = (tarfile.TarError, zipfile.BadZipFile)
+
+
+def is_archive(apath: str) -> bool:
+    """
+    Check if a path names a supported tar or zip archive, judging by its suffix.
+
+    Args
+    ----
+        - apath (str): Path to check.
+
+    Returns
+    -------
+        - bool: True if the path has a tar / zip archive suffix, False otherwise.
+    """
+    return apath.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def iter_members(
+    apath: str, pattern: str = "*.json", worker: int = 0, workers: int = 1
+) -> Iterator[Tuple[int, str, BinaryIO]]:
+    """
+    Iterate over the members of an archive whose name matches a pattern.
+
+    Args
+    ----
+        - apath (str): Path to the tar or zip archive.
+        - pattern (str): Glob pattern member names must match.
+        - worker (int): Only yield members whose index modulo `workers` equals this.
+        - workers (int): Number of workers the members are shared between.
+
+    Returns
+    -------
+        - Iterator[Tuple[int, str, BinaryIO]]: (index, name, stream) for each member, the
+                                               stream is only valid until the next
+                                               member is requested.
+    """
+    index = 0
+    if zipfile.is_zipfile(apath):
+        with zipfile.ZipFile(apath) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not fnmatch.fnmatch(info.filename, pattern):
+                    continue
+                if index % workers == worker:
+                    with archive.open(info) as stream:
+                        yield index, info.filename, stream
+                index += 1
+        return
+    with tarfile.open(apath, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile() or not fnmatch.fnmatch(member.name, pattern):
+                continue
+            if index % workers == worker:
+                stream = archive.extractfile(member)
+                if stream is not None:
+                    yield index, member.name, stream
+            index += 1
+
+
+def _validate_members(
+    validator: Any, apath: str, schema: Any, pattern: str, share: Tuple[int, int]
+) -> List[Tuple[int, str, bool]]:
+    """
+    Validate one worker's share of the members of an archive.
+
+    Args
+    ----
+        - validator (JVal): Validator used to validate each decoded member.
+        - apath (str): Path to the tar or zip archive.
+        - schema (Any): (expected, optional) pair, or Router selecting the schema of
+                        each member.
+        - pattern (str): Glob pattern member names must match.
+        - share (Tuple[int, int]): Index of this worker & number of workers.
+
+    Returns
+    -------
+        - List[Tuple[int, str, bool]]: (index, name, result) for each member.
+    """
+    results = []
+    for index, name, stream in iter_members(apath, pattern, *share):
+        try:
+            jobj = json.load(stream)
+        except ValueError as err:
+            logger.error("invalid JSON in member: %s, %s", name, err)
+            results.append((index, name, False))
+            continue
+        if not isinstance(jobj, dict):
+            logger.error("member is not an object: %s", name)
+            results.append((index, name, False))
+            continue
+        if isinstance(schema, Router):
+            results.append((index, name, schema.validate(jobj)))
+        else:
+            results.append((index, name, validator.validate(jobj, *schema)))
+    return results
+
+
+def validate_archive(  # pylint: disable=too-many-arguments
+    validator: Any,
+    apath: str,
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+    pattern: str = "*.json",
+    processes: Optional[int] = None,
+    router: Optional[Router] = None,
+) -> Dict[str, bool]:
+    """
+    Validate every JSON member of a tar or zip archive.
+
+    Args
+    ----
+        - validator (JVal): Validator used to validate each decoded member.
+        - apath (str): Path to the tar or zip archive.
+        - expected (Optional[List[Dict[str, Any]]]): Expected keys of the schema.
+        - optional (Optional[List[Dict[str, Any]]]): Optional keys of the schema.
+        - pattern (str): Glob pattern member names must match.
+        - processes (Optional[int]): Number of worker processes, members are validated
+                                     in the calling process if not greater than 1.
+        - router (Optional[Router]): Validate each member against the schema its
+                                     discriminator selects instead.
+
+    Returns
+    -------
+        - Dict[str, bool]: Map of member name to result, in archive order.
+    """
+    schema = router if router is not None else (expected, optional)
+    if not processes or processes <= 1:
+        results = _validate_members(validator, apath, schema, pattern, (0, 1))
+    else:
+        # workers get a fresh validator, caches etc. aren't shared across processes
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [
+                pool.submit(
+                    _validate_members,
+                    type(validator)(),
+                    apath,
+                    schema,
+                    pattern,
+                    (worker, processes),
+                )
+                for worker in range(processes)
+            ]
+            results = [result for future in futures for result in future.result()]
+        results.sort()
+    return {name: result for _, name, result in results}
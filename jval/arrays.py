@@ -0,0 +1,380 @@
+"""
+Validate NumPy structured (record) arrays column by column.
+
+The fields of a structured array are the keys of every record in it, so presence, unknown
+key & type checks are decided once per field from its dtype instead of once per row.
+`possible_values` are checked with a vectorized `np.isin` & numeric constraints with
+vectorized comparisons over whole columns (floats close to a `multiple_of` are then
+confirmed exactly one by one), nested expected / optional keys are validated
+recursively over nested structured fields & conditional keys are validated per group of
+rows selecting the same branch. Only object fields (& `possible_values` that can't be
+compared in bulk or string constraints) fall back to row by row checks.
+
+Results are identical to converting each row into a dict (nested structured fields into
+nested dicts, scalars into Python scalars) & calling `JVal.validate` on it. NumPy is only
+needed to use this module.
+
+Functions:
+
+    - validate_records: Validate every row of a structured array, as a validity mask.
+"""
+
+import logging
+from typing import Any
+
+from jval.adapters import check_type
+from jval.constraints import MULTIPLE_TOLERANCE, Constraints, _is_multiple
+from jval.schema import CompiledSchema, _DeepCheck
+
+try:  # pragma: no cover - depends on the installed packages
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# dtype kind -> possible values of these types can be compared in bulk with the column
+_BULK_KINDS = {
+    "b": (bool, int, float),
+    "i": (bool, int, float),
+    "u": (bool, int, float),
+    "f": (bool, int, float),
+    "U": (str,),
+    "S": (bytes,),
+}
+
+
+def _to_python(value: Any, dtype: Any) -> Any:
+    """
+    Convert a value of a structured array field the way a row is converted to a dict.
+
+    Args
+    ----
+        - value (Any): Value of the field.
+        - dtype (numpy.dtype): dtype of the field.
+
+    Returns
+    -------
+        - Any: dict for nested structured fields, the Python value otherwise.
+    """
+    if dtype.names is not None:
+        return {name: _to_python(value[name], dtype[name]) for name in dtype.names}
+    if dtype.kind == "O" and dtype.subdtype is None:
+        return value
+    return value.tolist() if isinstance(value, np.ndarray) else value.item()
+
+
+def _representative(dtype: Any) -> Any:
+    """
+    Get a value of the Python type every value of a (non object) field converts to.
+
+    Args
+    ----
+        - dtype (numpy.dtype): dtype of the field.
+
+    Returns
+    -------
+        - Any: {} for nested structured fields, [] for sub-arrays, a zero otherwise.
+    """
+    if dtype.names is not None:
+        return {}
+    if dtype.subdtype is not None:
+        return []
+    return np.zeros((), dtype=dtype).item()
+
+
+def _per_row(column: Any) -> bool:
+    """
+    Check if a field's values have to be looked at row by row.
+
+    Args
+    ----
+        - column (numpy.ndarray): Values of the field.
+
+    Returns
+    -------
+        - bool: True for object fields.
+    """
+    return column.dtype.kind == "O" and column.dtype.subdtype is None
+
+
+def _type_mask(column: Any, param_type: Any) -> Any:
+    """
+    Type check a field, once for the whole column unless it holds objects.
+
+    Args
+    ----
+        - column (numpy.ndarray): Values of the field.
+        - param_type (Any): Type or tuple of types from the schema.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the rows with a value of the right type.
+    """
+    if _per_row(column):
+        return np.fromiter(
+            (check_type(value, param_type) for value in column), bool, len(column)
+        )
+    return np.full(len(column), check_type(_representative(column.dtype), param_type))
+
+
+def _numeric_mask(column: Any, constraints: Constraints) -> Any:
+    """
+    Check a numeric (or bool) field's values against numeric constraints, vectorized.
+
+    Args
+    ----
+        - column (numpy.ndarray): Values of the field.
+        - constraints (Constraints): Compiled constraints of the key.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the rows with an allowed value.
+    """
+    valid = np.ones(len(column), bool)
+    if column.dtype.kind == "b":
+        # bools are never constrained
+        return valid
+    if constraints.minimum is not None:
+        valid &= column >= constraints.minimum
+    if constraints.maximum is not None:
+        valid &= column <= constraints.maximum
+    step = constraints.multiple_of
+    if step is not None:
+        if column.dtype.kind in "iu" and isinstance(step, int):
+            valid &= column % step == 0
+        else:
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                quotient = column / step
+                # values far from a whole quotient are rejected in bulk, the others
+                # are checked exactly like single values
+                near = ~np.isfinite(quotient) | (
+                    np.abs(quotient - np.round(quotient))
+                    <= MULTIPLE_TOLERANCE * np.abs(quotient)
+                )
+            rows = np.flatnonzero(near & valid)
+            near[:] = False
+            near[rows] = [_is_multiple(value, step) for value in column[rows].tolist()]
+            valid &= near
+    return valid
+
+
+def _possible_mask(column: Any, check: _DeepCheck) -> Any:
+    """
+    Check a field's values against the possible values & constraints of a key.
+
+    Args
+    ----
+        - column (numpy.ndarray): Values of the field.
+        - check (_DeepCheck): Compiled checks of the key.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the rows with an allowed value.
+    """
+    dtype = column.dtype
+    constraints = check.constraints
+    mask = None
+    if constraints is not None and dtype.kind in "biuf" and column.ndim == 1:
+        # string constraints never apply to numbers, numeric ones are vectorized
+        mask = _numeric_mask(column, constraints)
+        constraints = None
+    types = _BULK_KINDS.get(dtype.kind)
+    if constraints is None and (
+        check.possible_values is None
+        or (
+            types is not None
+            and all(isinstance(value, types) for value in check.possible_values)
+        )
+    ):
+        if check.possible_values is None:
+            return mask
+        possible = np.isin(column, list(check.possible_values))
+        return possible if mask is None else possible & mask
+    return np.fromiter(
+        (check.allows(_to_python(value, dtype)) for value in column),
+        bool,
+        len(column),
+    )
+
+
+def _nested_mask(column: Any, schema: CompiledSchema) -> Any:
+    """
+    Validate a field's values against a nested schema.
+
+    Args
+    ----
+        - column (numpy.ndarray): Values of the field.
+        - schema (CompiledSchema): Nested schema.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the rows with a valid nested value.
+    """
+    if column.dtype.names is not None:
+        return _validate(column, schema)
+    if _per_row(column):
+        return np.fromiter(
+            (check_type(value, dict) and schema.validate(value) for value in column),
+            bool,
+            len(column),
+        )
+    return np.zeros(len(column), bool)
+
+
+def _conditional_mask(records: Any, check: _DeepCheck) -> Any:
+    """
+    Validate a conditional field, one group of rows selecting the same branch at a time.
+
+    Args
+    ----
+        - records (numpy.ndarray): Structured array holding the field.
+        - check (_DeepCheck): Compiled checks of the conditional key.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the rows with a valid conditional value.
+    """
+    valid = np.zeros(len(records), bool)
+    if check.depends_on not in records.dtype.names:
+        logger.error("no dependence_info for: None, in param: %s", check.name)
+        return valid
+    depends = records[check.depends_on]
+    column = records[check.name]
+    if _per_row(depends) or depends.dtype.names is not None:
+        groups: dict = {}
+        for row, value in enumerate(depends):
+            value = _to_python(value, depends.dtype)
+            try:
+                groups.setdefault(value, []).append(row)
+            except TypeError:
+                logger.error(
+                    "no dependence_info for: %s, in param: %s", value, check.name
+                )
+        selections = [(value, np.asarray(rows, int)) for value, rows in groups.items()]
+    else:
+        values, inverse = np.unique(depends, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        selections = [
+            (value.item(), np.flatnonzero(inverse == group))
+            for group, value in enumerate(values)
+        ]
+    for value, rows in selections:
+        try:
+            branch = check.branches.compile(value)
+        except (KeyError, TypeError):
+            logger.error("no dependence_info for: %s, in param: %s", value, check.name)
+            continue
+        # each row selects the branch, like validating the rows one by one
+        check.branches.stats.incr(value, len(rows))
+        valid[rows] = _nested_mask(column[rows], branch)
+    return valid
+
+
+def _expected_mask(records: Any, schema: CompiledSchema) -> Any:
+    """
+    Validate the expected keys of every row.
+
+    Args
+    ----
+        - records (numpy.ndarray): Structured array.
+        - schema (CompiledSchema): Schema of the rows.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the rows satisfying the expected keys.
+    """
+    fields = records.dtype.names
+    missing = [name for name, _ in schema.required if name not in fields]
+    if missing:
+        logger.error("missing expected: %s", missing)
+        return np.zeros(len(records), bool)
+    valid = np.ones(len(records), bool)
+    for name, param_type in schema.required:
+        valid &= _type_mask(records[name], param_type)
+    for check in schema.deep:
+        column = records[check.name]
+        if check.restricted:
+            valid &= _possible_mask(column, check)
+        if check.expected is not None:
+            valid &= _nested_mask(column, check.expected)
+        if check.branches is not None:
+            valid &= _conditional_mask(records, check)
+    return valid
+
+
+def _optional_mask(records: Any, schema: CompiledSchema) -> Any:
+    """
+    Validate the optional keys of every row.
+
+    Args
+    ----
+        - records (numpy.ndarray): Structured array.
+        - schema (CompiledSchema): Schema of the rows.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the rows satisfying the optional keys.
+    """
+    fields = records.dtype.names
+    valid = np.ones(len(records), bool)
+    for name, param_type, nested in schema.optional_checks:
+        if name not in fields:
+            continue
+        valid &= _type_mask(records[name], param_type)
+        if nested is not None:
+            # like the validator, optional keys after a nested one aren't checked
+            return valid & _nested_mask(records[name], nested)
+    return valid
+
+
+def _validate(records: Any, schema: CompiledSchema) -> Any:
+    """
+    Validate every row of a one dimensional structured array.
+
+    Args
+    ----
+        - records (numpy.ndarray): Structured array.
+        - schema (CompiledSchema): Schema of the rows.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the valid rows.
+    """
+    if schema.mode == "expected":
+        return _expected_mask(records, schema)
+    if schema.mode == "optional":
+        return _optional_mask(records, schema)
+    if not schema.names:
+        logger.error("no optional or expected specified")
+        return np.zeros(len(records), bool)
+    unknown = [name for name in records.dtype.names if name not in schema.names]
+    if unknown:
+        logger.error("invalid keys: %s", unknown)
+        return np.zeros(len(records), bool)
+    valid = np.ones(len(records), bool)
+    if schema.optional_checks:
+        valid &= _optional_mask(records, schema)
+    return valid & _expected_mask(records, schema)
+
+
+def validate_records(records: Any, schema: CompiledSchema) -> Any:
+    """
+    Validate every row of a structured (record) array against a schema.
+
+    Args
+    ----
+        - records (numpy.ndarray): Structured array or `numpy.recarray`, of any shape.
+        - schema (CompiledSchema): Compiled schema of the rows.
+
+    Returns
+    -------
+        - numpy.ndarray: Boolean mask of the same shape as `records`, True for the rows
+                         that satisfy the schema.
+    """
+    if np is None:
+        raise ValueError("validating record arrays requires the 'numpy' package")
+    records = np.asarray(records)
+    if records.dtype.names is None:
+        raise ValueError("records must be a structured array")
+    return _validate(records.reshape(-1), schema).reshape(records.shape)
@@ -0,0 +1,299 @@
+"""
+Columnar validation of large batches of homogeneous JSON objects.
+
+Instead of walking each object through the whole schema, the batch is pivoted into one
+column of values per key named in the schema & every check runs over a whole column at
+once. Checks are decided per distinct value type (type checks) or per distinct value
+(`possible_values`) rather than per value, so a column of a million ints is type checked
+with a single `isinstance`; numeric constraints are checked against the smallest &
+largest value of a column & the greatest common divisor of its ints first. Objects are
+only visited individually to record failures.
+Values the schema looks inside (nested expected, nested optional & conditional keys) are
+validated as sub-batches of their own, one per conditional branch, made of the objects
+that are still valid at that point.
+
+Results are identical to calling `JVal.validate` on each object of the batch.
+
+Functions:
+
+    - validate_batch: Validate a batch of objects, as a list of results.
+"""
+
+import logging
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Sequence
+
+from jval.schema import CompiledSchema
+
+logger = logging.getLogger(__name__)
+
+# placeholder for keys an object doesn't have
+_MISSING = object()
+
+
+def _column(records: Sequence[Mapping], name: str, columns: Dict[str, list]) -> list:
+    """
+    Get the values of a key in every object of the batch, pivoting them on first use.
+
+    Args
+    ----
+        - records (Sequence[Mapping]): Objects of the batch.
+        - name (str): Key.
+        - columns (Dict[str, list]): Columns pivoted so far.
+
+    Returns
+    -------
+        - list: Value of the key in each object, `_MISSING` where it isn't set.
+    """
+    column = columns.get(name)
+    if column is None:
+        column = columns[name] = [record.get(name, _MISSING) for record in records]
+    return column
+
+
+def _type_ok(kind: type, param_type: Any) -> bool:
+    """
+    Check if values of a type satisfy a `param_type`, like `check_type` does.
+
+    Args
+    ----
+        - kind (type): Type of the values.
+        - param_type (Any): Type or tuple of types from the schema.
+
+    Returns
+    -------
+        - bool: True if values of the type have the expected type, False otherwise.
+    """
+    if issubclass(kind, param_type):
+        return True
+    return issubclass(kind, Mapping) and (
+        param_type is dict or (isinstance(param_type, tuple) and dict in param_type)
+    )
+
+
+def _bad_types(column: list, param_type: Any) -> Iterable[int]:
+    """
+    Type check a column, once per distinct type of its values.
+
+    Args
+    ----
+        - column (list): Values of a key.
+        - param_type (Any): Type or tuple of types from the schema.
+
+    Returns
+    -------
+        - Iterable[int]: Positions of the values of the wrong type.
+    """
+    bad = {kind for kind in set(map(type, column)) if not _type_ok(kind, param_type)}
+    if not bad:
+        return ()
+    return (index for index, value in enumerate(column) if type(value) in bad)
+
+
+def _bad_values(column: list, check: Any) -> Iterable[int]:
+    """
+    Check a column against the possible values & constraints of a key, once per
+    distinct value.
+
+    Args
+    ----
+        - column (list): Values of a key.
+        - check (_DeepCheck): Compiled checks of the key.
+
+    Returns
+    -------
+        - Iterable[int]: Positions of the values that aren't allowed.
+    """
+    if (
+        check.possible_values is None
+        and check.constraints is not None
+        and check.constraints.column_ok(column)
+    ):
+        # numbers all within bounds, checked without visiting each value
+        return ()
+    # keyed by type too: True == 1 == 1.0 but constraints skip bools & only ints are
+    # checked exactly against multiple_of
+    keys = list(zip(map(type, column), column))
+    try:
+        bad = {key for key in set(keys) if not check.allows(key[1])}
+    except TypeError:
+        # unhashable values
+        return (index for index, value in enumerate(column) if not check.allows(value))
+    if not bad:
+        return ()
+    return (index for index, key in enumerate(keys) if key in bad)
+
+
+def _validate_nested(
+    column: list, indexes: List[int], schema: CompiledSchema, valid: List[bool]
+):
+    """
+    Validate the values of a key at some positions as a sub-batch.
+
+    Args
+    ----
+        - column (list): Values of the key.
+        - indexes (List[int]): Positions of the values to validate.
+        - schema (CompiledSchema): Schema the values are validated against.
+        - valid (List[bool]): Validity mask, updated in place.
+    """
+    if not indexes:
+        return
+    results = validate_batch([column[index] for index in indexes], schema)
+    for index, result in zip(indexes, results):
+        if not result:
+            valid[index] = False
+
+
+def _validate_optional(
+    records: Sequence[Mapping],
+    schema: CompiledSchema,
+    valid: List[bool],
+    columns: Dict[str, list],
+):
+    """
+    Validate the optional keys of every object in the batch.
+
+    Args
+    ----
+        - records (Sequence[Mapping]): Objects of the batch.
+        - schema (CompiledSchema): Schema of the objects.
+        - valid (List[bool]): Validity mask, updated in place.
+        - columns (Dict[str, list]): Columns pivoted so far.
+    """
+    # like the validator, optional keys after a present nested one aren't checked
+    reached = [True] * len(records)
+    for name, param_type, nested in schema.optional_checks:
+        column = _column(records, name, columns)
+        for index in _bad_types(column, param_type):
+            if column[index] is not _MISSING and reached[index]:
+                valid[index] = False
+        if nested is None:
+            continue
+        indexes = []
+        for index, value in enumerate(column):
+            if value is _MISSING or not reached[index]:
+                continue
+            reached[index] = False
+            if valid[index]:
+                indexes.append(index)
+        _validate_nested(column, indexes, nested, valid)
+
+
+def _validate_conditional(
+    records: Sequence[Mapping],
+    check: Any,
+    valid: List[bool],
+    columns: Dict[str, list],
+):
+    """
+    Validate a conditional key, one sub-batch per selected branch.
+
+    Args
+    ----
+        - records (Sequence[Mapping]): Objects of the batch.
+        - check (_DeepCheck): Compiled checks of the conditional key.
+        - valid (List[bool]): Validity mask, updated in place.
+        - columns (Dict[str, list]): Columns pivoted so far.
+    """
+    column = columns[check.name]
+    depends = _column(records, check.depends_on, columns)
+    groups: Dict[int, List[int]] = {}
+    branches: Dict[int, CompiledSchema] = {}
+    for index, valid_so_far in enumerate(valid):
+        if not valid_so_far:
+            continue
+        try:
+            branch = check.branches[depends[index]]
+        except (KeyError, TypeError):
+            logger.error(
+                "no dependence_info for: %s, in param: %s",
+                None if depends[index] is _MISSING else depends[index],
+                check.name,
+            )
+            valid[index] = False
+            continue
+        branches[id(branch)] = branch
+        groups.setdefault(id(branch), []).append(index)
+    for key, indexes in groups.items():
+        _validate_nested(column, indexes, branches[key], valid)
+
+
+def _validate_expected(
+    records: Sequence[Mapping],
+    schema: CompiledSchema,
+    valid: List[bool],
+    columns: Dict[str, list],
+):
+    """
+    Validate the expected keys of every object in the batch.
+
+    Args
+    ----
+        - records (Sequence[Mapping]): Objects of the batch.
+        - schema (CompiledSchema): Schema of the objects.
+        - valid (List[bool]): Validity mask, updated in place.
+        - columns (Dict[str, list]): Columns pivoted so far.
+    """
+    for name, param_type in schema.required:
+        # missing values are of type object, never a subclass of the expected type
+        # unless that is object itself
+        column = _column(records, name, columns)
+        if param_type is object or (
+            isinstance(param_type, tuple) and object in param_type
+        ):
+            for index, value in enumerate(column):
+                if value is _MISSING:
+                    valid[index] = False
+        for index in _bad_types(column, param_type):
+            valid[index] = False
+    for check in schema.deep:
+        column = columns[check.name]
+        if check.restricted:
+            for index in _bad_values(column, check):
+                valid[index] = False
+        if check.expected is not None:
+            _validate_nested(
+                column,
+                [index for index, ok in enumerate(valid) if ok],
+                check.expected,
+                valid,
+            )
+        if check.branches is not None:
+            _validate_conditional(records, check, valid, columns)
+
+
+def validate_batch(records: Sequence[Any], schema: CompiledSchema) -> List[bool]:
+    """
+    Validate a batch of JSON objects against a schema, one key at a time.
+
+    Args
+    ----
+        - records (Sequence[Any]): JSON objects (or any Mappings) to validate, anything
+                                   else is invalid.
+        - schema (CompiledSchema): Compiled schema of the objects.
+
+    Returns
+    -------
+        - List[bool]: Result for each object, in batch order.
+    """
+    valid = [isinstance(record, Mapping) for record in records]
+    if not all(valid):
+        records = [record if ok else {} for record, ok in zip(records, valid)]
+    if schema.mode == "validate":
+        if not schema.names:
+            logger.error("no optional or expected specified")
+            return [False] * len(records)
+        keys: set = set()
+        keys.update(*records)
+        if not keys <= schema.names:
+            names = schema.names
+            for index, record in enumerate(records):
+                if not record.keys() <= names:
+                    valid[index] = False
+    columns: Dict[str, list] = {}
+    if schema.mode != "expected" and schema.optional_checks:
+        _validate_optional(records, schema, valid, columns)
+    if schema.mode != "optional":
+        _validate_expected(records, schema, valid, columns)
+    return valid
@@ -0,0 +1,329 @@
+"""
+Persistent, opt-in cache of file validation results.
+
+Results are stored in a local SQLite database keyed by the schema fingerprint and a file
+key. The file key is either the file's stat signature (path, mtime, size, inode), which
+needs no read at all, or a hash of its contents, which survives copies & touches but
+needs one read (still no decoding). Because the schema fingerprint is part of the key, a
+changed schema never sees results computed against the old one.
+
+Hits don't write: each thread records the keys it hit & writes their access times back in
+one batch every so often (and before pruning), so lookups stay read-only.
+
+Usage:
+
+    from jval import JVal, ResultCache
+    validator = JVal(cache=ResultCache("jval-cache.sqlite"))
+    validator.fvalidate("data.json", expected=expected)
+
+Prune from the command line:
+
+    python -m jval.cache jval-cache.sqlite --max-entries 100000
+
+Functions:
+
+    - file_digest: Compute the content hash of a file.
+
+Classes:
+
+    - ResultCache: SQLite backed validation result cache.
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from jval.common import CACHE_MAX_ENTRIES, CACHE_PRUNE_EVERY, HASH_CHUNK_SIZE
+from jval.stats import STATS, Counters
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT NOT NULL,
+    file_key TEXT NOT NULL,
+    result INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (fingerprint, file_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+# hits a thread records before writing their access times back
+_TOUCH_EVERY = 1_000
+_TOUCH = "UPDATE results SET accessed = ? WHERE fingerprint = ? AND file_key = ?"
+
+
+def file_digest(path: str) -> str:
+    """
+    Compute the content hash of a file.
+
+    Args
+    ----
+        - path (str): Path to the file.
+
+    Returns
+    -------
+        - str: Hex digest of the file contents.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as jfile:
+        for chunk in iter(lambda: jfile.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite backed cache mapping (schema fingerprint, file key) to a validation result.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str = "stat",
+        max_entries: Optional[int] = CACHE_MAX_ENTRIES,
+    ):
+        """
+        Open (or create) a result cache.
+
+        Args
+        ----
+            - path (str): Path to the SQLite database file.
+            - key (str): How files are identified, either "stat" (path, mtime, size &
+                         inode) or "hash" (content hash).
+            - max_entries (Optional[int]): Maximum number of cached results, least recently
+                                           used results are pruned beyond it. None
+                                           disables the limit.
+        """
+        if key not in ("stat", "hash"):
+            raise ValueError(f"unknown cache key: {key}")
+        self.path = path
+        self.key = key
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # connection & pending hits of every live thread, with the thread owning them
+        self._connections: List[
+            Tuple[threading.Thread, sqlite3.Connection, List[tuple]]
+        ] = []
+        self._local = threading.local()
+        self._writes = Counters()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's database connection, opening it on first use.
+
+        Each thread has its own connection so lookups & writes never wait on a Python
+        lock; WAL mode lets readers proceed while another connection writes. Opening one
+        (and pruning) closes the connections of threads that have exited, so short-lived
+        worker threads don't leak connections.
+
+        Returns
+        -------
+            - sqlite3.Connection: Connection of the calling thread.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            touched: List[tuple] = []
+            with self._lock:
+                self._connections.append((threading.current_thread(), conn, touched))
+            self._local.touched = touched
+            self._local.conn = conn
+            self._reap()
+        return conn
+
+    def _reap(self):
+        """
+        Close the connections of threads that have exited, writing back their hits.
+        """
+        with self._lock:
+            exited = [entry for entry in self._connections if not entry[0].is_alive()]
+            self._connections = [
+                entry for entry in self._connections if entry[0].is_alive()
+            ]
+        for _, conn, touched in exited:
+            self._touch(conn, touched)
+            conn.close()
+
+    @staticmethod
+    def _touch(conn: sqlite3.Connection, touched: List[tuple]):
+        """
+        Write back the access times of recorded hits.
+
+        Args
+        ----
+            - conn (sqlite3.Connection): Connection to write with.
+            - touched (List[tuple]): (accessed, fingerprint, file_key) of each hit,
+                                     emptied once written.
+        """
+        if touched:
+            conn.executemany(_TOUCH, touched)
+            touched.clear()
+
+    def file_key(self, jpath: str) -> str:
+        """
+        Compute the key identifying the current state of a file.
+
+        Args
+        ----
+            - jpath (str): Path to the file.
+
+        Returns
+        -------
+            - str: Stat signature or content hash of the file.
+        """
+        if self.key == "hash":
+            return file_digest(jpath)
+        stat = os.stat(jpath)
+        return (
+            f"{os.path.abspath(jpath)}:{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}"
+        )
+
+    def get(self, fingerprint: str, file_key: str) -> Optional[bool]:
+        """
+        Look up a cached result.
+
+        Args
+        ----
+            - fingerprint (str): Schema fingerprint.
+            - file_key (str): File key as returned by `file_key`.
+
+        Returns
+        -------
+            - Optional[bool]: The cached result, None on a miss.
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT result FROM results WHERE fingerprint = ? AND file_key = ?",
+            (fingerprint, file_key),
+        ).fetchone()
+        if row is None:
+            STATS.incr("cache_misses")
+            return None
+        STATS.incr("cache_hits")
+        touched = self._local.touched
+        touched.append((time.time(), fingerprint, file_key))
+        if len(touched) >= _TOUCH_EVERY:
+            self._touch(conn, touched)
+        return bool(row[0])
+
+    def put(self, fingerprint: str, file_key: str, result: bool):
+        """
+        Store a result, pruning least recently used entries every so often.
+
+        Args
+        ----
+            - fingerprint (str): Schema fingerprint.
+            - file_key (str): File key as returned by `file_key`.
+            - result (bool): Validation result.
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (fingerprint, file_key, int(result), time.time()),
+        )
+        STATS.incr("cache_writes")
+        # every thread prunes after its own share of writes
+        if self._writes.incr("writes") % CACHE_PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(
+        self,
+        max_entries: Optional[int] = None,
+        keep: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Remove least recently used results beyond the size limit.
+
+        Args
+        ----
+            - max_entries (Optional[int]): Limit to prune to, defaults to the cache limit.
+            - keep (Optional[List[str]]): If given, results for any other schema
+                                          fingerprint are removed as well.
+
+        Returns
+        -------
+            - int: Number of removed results.
+        """
+        max_entries = self.max_entries if max_entries is None else max_entries
+        removed = 0
+        conn = self._connection()
+        self._reap()
+        self._touch(conn, self._local.touched)
+        if keep is not None:
+            placeholders = ",".join("?" * len(keep))
+            removed += conn.execute(
+                f"DELETE FROM results WHERE fingerprint NOT IN ({placeholders})",
+                keep,
+            ).rowcount
+        if max_entries is not None:
+            removed += conn.execute(
+                "DELETE FROM results WHERE (fingerprint, file_key) IN ("
+                "SELECT fingerprint, file_key FROM results "
+                "ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (max_entries,),
+            ).rowcount
+        return removed
+
+    def __len__(self) -> int:
+        """
+        Number of cached results.
+        """
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        """
+        Close the database connections of every thread, writing back pending hits.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for _, conn, touched in connections:
+            self._touch(conn, touched)
+            conn.close()
+        self._local = threading.local()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Prune a result cache from the command line.
+
+    Args
+    ----
+        - argv (Optional[List[str]]): Command line arguments, defaults to sys.argv.
+
+    Returns
+    -------
+        - int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m jval.cache", description="prune a jval result cache"
+    )
+    parser.add_argument("path", help="path to the cache database")
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=CACHE_MAX_ENTRIES,
+        help="number of most recently used results to keep",
+    )
+    parser.add_argument(
+        "--keep",
+        action="append",
+        help="schema fingerprint to keep, results for all others are removed",
+    )
+    args = parser.parse_args(argv)
+    cache = ResultCache(args.path, max_entries=args.max_entries)
+    try:
+        print(f"pruned {cache.prune(keep=args.keep)} results")
+    finally:
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
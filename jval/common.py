@@ -4,6 +4,19 @@ Module-wide / shared constants.
 Attributes
 ----------
     LOGGING_DICT (dict): Logging configuration dictionary.
+    HASH_CHUNK_SIZE (int): Number of bytes read at a time when hashing file contents.
+    CACHE_MAX_ENTRIES (int): Default maximum number of results kept in a result cache.
+    CACHE_PRUNE_EVERY (int): Number of cache writes between automatic prunes.
+    COMPRESSION_MAGIC (dict): Magic bytes identifying each supported compression.
+    ARCHIVE_SUFFIXES (tuple): File name suffixes of supported tar & zip archives.
+    STREAM_CHUNK_SIZE (int): Number of bytes read at a time when streaming JSON input.
+    STREAM_MAX_VALUE (int): Largest size a single streamed JSON value may span.
+    SLICES_PER_PROCESS (int): Number of slices a batch is split into per parallel worker.
+    COMPILED_MAX_ENTRIES (int): Maximum number of compiled schemas cached on demand.
+    PREWARM_ENV (str): Environment variable naming the schemas to prewarm at import.
+    FETCH_THREADS (int): Default number of threads reading files ahead of validation.
+    TYPE_NAMES (dict): Names `param_type`s are spelled with in JSON schema files.
+    EVICT_TO (float): Fraction of its budget a full registry evicts down to.
 
 """
 LOGGING_DICT = {
@@ -30,3 +43,39 @@ LOGGING_DICT = {
         }
     },
 }
+
+HASH_CHUNK_SIZE = 1 << 20
+CACHE_MAX_ENTRIES = 1_000_000
+CACHE_PRUNE_EVERY = 10_000
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+ARCHIVE_SUFFIXES = (
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+STREAM_CHUNK_SIZE = 1 << 16
+STREAM_MAX_VALUE = 1 << 30
+SLICES_PER_PROCESS = 4
+COMPILED_MAX_ENTRIES = 1024
+PREWARM_ENV = "JVAL_PREWARM"
+FETCH_THREADS = 8
+TYPE_NAMES = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "dict": dict,
+    "list": list,
+    "null": type(None),
+}
+EVICT_TO = 0.9
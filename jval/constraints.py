@@ -0,0 +1,420 @@
+"""
+Value constraints of expected keys, compiled once & checked in the validation pass.
+
+Besides `possible_values` an expected key can constrain numbers with:
+
+    - minimum / maximum: Bounds on the value, both inclusive, folded into a single
+                         chained comparison when both are set.
+    - multiple_of: Positive number the value must be a multiple of, checked exactly.
+                   Floats are taken as the shortest decimal they print as (their
+                   number in the JSON text), so 0.3 is a multiple of 0.1 but
+                   600000000.5 isn't a multiple of 1.
+
+& strings with:
+
+    - pattern: Regular expression the value must contain a match of (like JSON Schema,
+               anchor it with ^ & $ to match the whole value).
+    - min_length / max_length: Bounds on the number of characters, both inclusive.
+    - format: One of "email", "uuid", "date" (YYYY-MM-DD) & "date-time" (RFC 3339).
+              Each is a single precompiled regular expression, which also knows
+              the length of each month: only february 29th needs a leap year check.
+
+Constraints only apply to values of the type they're about (ints & floats but not bools,
+or strings), values of the key's other types (e.g. None when `param_type` is
+`(str, type(None))`) pass.
+
+The constraints of a key are compiled into a `Constraints` object the first time a key
+with the same constraints is seen, so regular expressions are compiled once however many
+schemas or validations use them. Compiled constraints are looked up by the values of the
+constraints, so a key modified in place gets the constraints it holds now. Constraints
+that can't be compiled (e.g. an unknown format or an invalid pattern) raise a
+`SchemaError`, like `check_schema` reports them.
+
+Attributes
+----------
+    STRING_FIELDS (frozenset): Key fields holding string constraints.
+    NUMERIC_FIELDS (frozenset): Key fields holding numeric constraints.
+    CONSTRAINT_FIELDS (frozenset): Key fields holding constraints.
+    MULTIPLE_TOLERANCE (float): Relative distance of a quotient from a whole number
+                                beyond which floats fail `multiple_of` without an
+                                exact check.
+    FORMATS (dict): Checks of each supported string format.
+
+Functions:
+
+    - compile_constraints: Get the compiled constraints of a key.
+
+Classes:
+
+    - Constraints: Compiled constraints of a key.
+"""
+
+import calendar
+import functools
+import math
+import re
+from fractions import Fraction
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from jval.common import COMPILED_MAX_ENTRIES
+from jval.errors import SchemaError
+
+STRING_FIELDS = frozenset(("pattern", "min_length", "max_length", "format"))
+NUMERIC_FIELDS = frozenset(("minimum", "maximum", "multiple_of"))
+CONSTRAINT_FIELDS = STRING_FIELDS | NUMERIC_FIELDS
+MULTIPLE_TOLERANCE = 1e-9
+
+# types constrained by numeric constraints, bools excluded by the checks
+_NUMBERS = (int, float)
+# value types a whole column can be checked for at once
+_NUMBER_TYPES = frozenset(_NUMBERS)
+
+# check of a constraint, returns a truthy value if the value satisfies it
+Check = Callable[[Any], Any]
+
+_EMAIL = re.compile(r"[^@\s]+@[^@\s.]+(?:\.[^@\s.]+)+")
+_UUID = re.compile(r"[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}")
+# days of each month, february 29th is checked against the year afterwards
+_DATE = (
+    r"\d{4}-(?:(?:0[13578]|1[02])-(?:0[1-9]|[12]\d|3[01])"
+    r"|(?:0[469]|11)-(?:0[1-9]|[12]\d|30)"
+    r"|02-(?:0[1-9]|1\d|2\d))"
+)
+_HOUR_MINUTE = r"(?:[01]\d|2[0-3]):[0-5]\d"
+# seconds up to 60 for leap seconds
+_TIME = rf"[Tt ]{_HOUR_MINUTE}:(?:[0-5]\d|60)(?:\.\d+)?(?:[Zz]|[+-]{_HOUR_MINUTE})"
+_DATE_ONLY = re.compile(_DATE, re.ASCII)
+_DATE_TIME = re.compile(_DATE + _TIME, re.ASCII)
+
+
+def _is_date(value: str) -> bool:
+    """
+    Check if a string is a valid YYYY-MM-DD calendar date.
+    """
+    return _DATE_ONLY.fullmatch(value) is not None and (
+        value[5:10] != "02-29" or calendar.isleap(int(value[:4]))
+    )
+
+
+def _is_date_time(value: str) -> bool:
+    """
+    Check if a string is an RFC 3339 date-time, e.g. 2024-01-31T23:59:59.5+01:00.
+    """
+    return _DATE_TIME.fullmatch(value) is not None and (
+        value[5:10] != "02-29" or calendar.isleap(int(value[:4]))
+    )
+
+
+FORMATS: Dict[str, Check] = {
+    "email": _EMAIL.fullmatch,
+    "uuid": _UUID.fullmatch,
+    "date": _is_date,
+    "date-time": _is_date_time,
+}
+
+
+def _reasoner(
+    checks: Tuple[Tuple[str, Any, Check], ...]
+) -> Callable[[Any], Optional[str]]:
+    """
+    Build the function finding the first constraint a value violates.
+
+    Args
+    ----
+        - checks (Tuple[Tuple[str, Any, Check], ...]): (reason, kinds, check) triples.
+
+    Returns
+    -------
+        - Callable[[Any], Optional[str]]: Function returning why a value is rejected,
+                                          None if it's allowed.
+    """
+    if len(checks) == 1:
+        # the common case, without a loop
+        ((only, kinds, check),) = checks
+
+        def first(value: Any) -> Optional[str]:
+            if isinstance(value, kinds) and not check(value):
+                return only
+            return None
+
+        return first
+
+    def every(value: Any) -> Optional[str]:
+        for reason, kinds, check in checks:
+            if isinstance(value, kinds) and not check(value):
+                return reason
+        return None
+
+    return every
+
+
+class Constraints:  # pylint: disable=too-few-public-methods
+    """
+    Compiled constraints of a key: (reason, kinds, check) triples checked in order.
+
+    Attributes
+    ----------
+        - reason (Callable[[Any], Optional[str]]): Find the first constraint a value
+                                                   violates, None if it's allowed.
+        - minimum, maximum, multiple_of (Optional[int | float]): Numeric bounds, for
+                                                                 checking whole columns.
+    """
+
+    __slots__ = ("checks", "reason", "minimum", "maximum", "multiple_of")
+
+    def __init__(self, checks: Tuple[Tuple[str, Any, Check], ...], key: Dict[str, Any]):
+        """
+        Args
+        ----
+            - checks (Tuple[Tuple[str, Any, Check], ...]): Reason reported, types of
+                                                           the values constrained &
+                                                           check of each constraint.
+            - key (Dict[str, Any]): Expected key the checks were compiled from.
+        """
+        self.checks = checks
+        self.reason = _reasoner(checks)
+        self.minimum = key.get("minimum")
+        self.maximum = key.get("maximum")
+        self.multiple_of = key.get("multiple_of")
+
+    def column_ok(self, column: Sequence[Any]) -> bool:
+        """
+        Check a whole column of numbers at once: bounds against its smallest & largest
+        value, `multiple_of` (an int) against the greatest common divisor of its ints.
+
+        Args
+        ----
+            - column (Sequence[Any]): Values of the key.
+
+        Returns
+        -------
+            - bool: True if every value is a number satisfying the constraints, False
+                    if the column has other values or some may violate them.
+        """
+        kinds = set(map(type, column))
+        if not kinds or not kinds <= _NUMBER_TYPES:
+            return False
+        if self.minimum is not None or self.maximum is not None:
+            try:
+                # NaN compares false with everything, min & max can't be trusted
+                unordered = float in kinds and math.isnan(sum(column))
+            except OverflowError:
+                # ints too large to add to a float, checked value by value instead
+                unordered = True
+            if unordered:
+                return False
+            if self.minimum is not None and min(column) < self.minimum:
+                return False
+            if self.maximum is not None and max(column) > self.maximum:
+                return False
+        if self.multiple_of is not None:
+            # every value is a multiple if their greatest common divisor is
+            return (
+                kinds == {int}
+                and isinstance(self.multiple_of, int)
+                and math.gcd(*column) % self.multiple_of == 0
+            )
+        return True
+
+
+def _string_checks(key: Dict[str, Any]) -> List[Tuple[str, Any, Check]]:
+    """
+    Compile the string constraints of a key, cheapest first.
+
+    Args
+    ----
+        - key (Dict[str, Any]): Expected key.
+
+    Returns
+    -------
+        - List[Tuple[str, Any, Check]]: (reason, kinds, check) triples.
+    """
+    checks: List[Tuple[str, Any, Check]] = []
+    low, high = key.get("min_length"), key.get("max_length")
+    if low is not None and high is not None:
+        # one chained comparison for both bounds
+        checks.append(
+            ("incorrect length", str, lambda value: low <= len(value) <= high)
+        )
+    elif low is not None:
+        checks.append(("incorrect length", str, lambda value: low <= len(value)))
+    elif high is not None:
+        checks.append(("incorrect length", str, lambda value: len(value) <= high))
+    if "format" in key:
+        checks.append(("incorrect format", str, FORMATS[key["format"]]))
+    if "pattern" in key:
+        checks.append(("pattern mismatch", str, re.compile(key["pattern"]).search))
+    return checks
+
+
+def _decimal(number: Any) -> Fraction:
+    """
+    Get the exact value of a number, floats taken as the shortest decimal they print as.
+    """
+    if isinstance(number, float):
+        return Fraction(float.__repr__(number))
+    return Fraction(number)
+
+
+def _is_multiple(value: Any, multiple_of: Any) -> bool:
+    """
+    Check if a number is a multiple of another, exactly: floats are taken as the
+    shortest decimal they print as (0.3 is a multiple of 0.1).
+
+    Args
+    ----
+        - value (int | float): Number.
+        - multiple_of (int | float): Positive number.
+
+    Returns
+    -------
+        - bool: True if the number is a multiple, False otherwise.
+    """
+    if isinstance(value, int) and isinstance(multiple_of, int):
+        return value % multiple_of == 0
+    if isinstance(value, float) and not math.isfinite(value):
+        return False
+    try:
+        quotient = value / multiple_of
+    except OverflowError:
+        # an int too large for a float, only checked exactly
+        pass
+    else:
+        if math.isfinite(quotient) and abs(quotient - round(quotient)) > (
+            MULTIPLE_TOLERANCE * abs(quotient)
+        ):
+            # far from a whole quotient, a float error can't explain it
+            return False
+    return _decimal(value) % _decimal(multiple_of) == 0
+
+
+def _numeric_checks(key: Dict[str, Any]) -> List[Tuple[str, Any, Check]]:
+    """
+    Compile the numeric constraints of a key, bounds folded into one comparison.
+
+    Booleans are ints but not numbers, they're never constrained.
+
+    Args
+    ----
+        - key (Dict[str, Any]): Expected key.
+
+    Returns
+    -------
+        - List[Tuple[str, Any, Check]]: (reason, kinds, check) triples.
+    """
+    checks: List[Tuple[str, Any, Check]] = []
+    low, high = key.get("minimum"), key.get("maximum")
+    if low is not None and high is not None:
+        # one chained comparison for both bounds
+        checks.append(
+            (
+                "out of range",
+                _NUMBERS,
+                lambda value: value.__class__ is bool or low <= value <= high,
+            )
+        )
+    elif low is not None:
+        checks.append(
+            (
+                "out of range",
+                _NUMBERS,
+                lambda value: value.__class__ is bool or low <= value,
+            )
+        )
+    elif high is not None:
+        checks.append(
+            (
+                "out of range",
+                _NUMBERS,
+                lambda value: value.__class__ is bool or value <= high,
+            )
+        )
+    if "multiple_of" in key:
+        step = key["multiple_of"]
+        checks.append(
+            (
+                "not a multiple",
+                _NUMBERS,
+                lambda value: value.__class__ is bool or _is_multiple(value, step),
+            )
+        )
+    return checks
+
+
+def _check_values(key: Dict[str, Any]):
+    """
+    Check constraints are of the right type, which `check_schema` reports up front for
+    compiled schemas, so a malformed one doesn't fail in the middle of a validation.
+
+    Args
+    ----
+        - key (Dict[str, Any]): Constraints of a key.
+
+    Raises
+    ------
+        - TypeError: If a length isn't an int or a numeric constraint isn't a number.
+        - ValueError: If `multiple_of` isn't positive.
+    """
+    for field in ("min_length", "max_length"):
+        value = key.get(field)
+        if value is not None and (
+            isinstance(value, bool) or not isinstance(value, int)
+        ):
+            raise TypeError(f"{field} is not an int: {value!r}")
+    for field in NUMERIC_FIELDS & key.keys():
+        if isinstance(key[field], bool) or not isinstance(key[field], _NUMBERS):
+            raise TypeError(f"{field} is not a number: {key[field]!r}")
+    if "multiple_of" in key and not key["multiple_of"] > 0:
+        raise ValueError(f"multiple_of is not positive: {key['multiple_of']!r}")
+
+
+@functools.lru_cache(maxsize=COMPILED_MAX_ENTRIES)
+def _compile(fields: Tuple[Tuple[str, type, Any], ...]) -> Constraints:
+    """
+    Compile constraints, shared by keys with the same constraints.
+
+    Args
+    ----
+        - fields (Tuple[Tuple[str, type, Any], ...]): Sorted (field, type, value) of
+                                                      each constraint.
+
+    Returns
+    -------
+        - Constraints: Compiled constraints.
+    """
+    key = {field: value for field, _, value in fields}
+    _check_values(key)
+    return Constraints(tuple(_numeric_checks(key) + _string_checks(key)), key)
+
+
+def compile_constraints(key: Dict[str, Any]) -> Optional[Constraints]:
+    """
+    Get the compiled constraints of a key, compiling them on first use.
+
+    Args
+    ----
+        - key (Dict[str, Any]): Expected key.
+
+    Returns
+    -------
+        - Optional[Constraints]: Compiled constraints, None if the key has none.
+
+    Raises
+    ------
+        - SchemaError: If the constraints are malformed.
+    """
+    if CONSTRAINT_FIELDS.isdisjoint(key):
+        return None
+    # the type is part of the cache key, 1 == 1.0 == True but they're compared apart
+    fields = tuple(
+        sorted(
+            (field, type(key[field]), key[field])
+            for field in CONSTRAINT_FIELDS & key.keys()
+        )
+    )
+    try:
+        return _compile(fields)
+    except (KeyError, TypeError, ValueError, re.error) as err:
+        raise SchemaError(
+            f"invalid constraints: {err}", (key.get("param_name"),)
+        ) from err
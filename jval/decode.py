@@ -0,0 +1,219 @@
+"""
+Validate while decoding: reject invalid documents before they are fully decoded.
+
+The top-level object is decoded member by member, driven by the compiled schema: keys are
+read with `json.decoder.scanstring` & looked up in the schema straight away, values are
+type checked from their first character before they are decoded, & only values the
+schema needs to look inside are descended into, everything else is decoded in one go by
+the C accelerated `raw_decode`. Decoding is aborted with a `ValidationError` at the
+first violation whose outcome can't be changed by the rest of the document, such as an
+unknown top-level key or an expected key of the wrong type.
+
+`json.loads`'s `object_pairs_hook` can't be used for this as it is called bottom-up,
+innermost objects first, without knowing where in the document (& so in the schema) an
+object sits.
+
+Functions:
+
+    - decode_validated: Decode a document, rejecting it at the first certain violation.
+"""
+
+import json
+from json.decoder import scanstring
+from typing import Any, Optional, Tuple
+
+from jval.errors import ValidationError
+from jval.schema import CompiledSchema
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# representative value of the JSON type a value starting with a character decodes to
+_FIRST_CHARACTER = {
+    "{": {},
+    "[": [],
+    '"': "",
+    "t": True,
+    "f": False,
+    "n": None,
+}
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    """
+    Advance past whitespace.
+
+    Args
+    ----
+        - text (str): Document.
+        - index (int): Position to start at.
+
+    Returns
+    -------
+        - int: Position of the next non whitespace character.
+    """
+    while index < len(text) and text[index] in _WHITESPACE:
+        index += 1
+    return index
+
+
+def _nested_schema(check: Any, obj: dict, path: list) -> Optional[CompiledSchema]:
+    """
+    Find the schema an object value of an expected key is checked against while it's
+    decoded.
+
+    Args
+    ----
+        - check (_DeepCheck): Deep checks of the key.
+        - obj (dict): Members of the enclosing object decoded so far.
+        - path (list): Keys leading to the value.
+
+    Returns
+    -------
+        - Optional[CompiledSchema]: Nested schema or selected branch, None if there's
+                                    none or the branch isn't known yet.
+
+    Raises
+    ------
+        - ValidationError: If the sibling key's value selects no branch.
+    """
+    if check.expected is not None:
+        return check.expected
+    if check.branches is None or check.depends_on not in obj:
+        return None
+    try:
+        # the branch is counted when the decoded document is validated
+        return check.branches.compile(obj[check.depends_on])
+    except (KeyError, TypeError) as err:
+        raise ValidationError("no dependence_info", path) from err
+
+
+def _decode_value(
+    text: str, index: int, schema: CompiledSchema, obj: dict, path: list
+) -> Tuple[Any, int]:
+    """
+    Decode the value of a key named in a schema that is certain to be checked,
+    rejecting it as early as possible.
+
+    Args
+    ----
+        - text (str): Document.
+        - index (int): Position of the value.
+        - schema (CompiledSchema): Schema of the object holding the key.
+        - obj (dict): Members of the object decoded so far.
+        - path (list): Keys leading to the value, ending with the key.
+
+    Returns
+    -------
+        - Tuple[Any, int]: Decoded value & the position right after it.
+    """
+    char = text[index : index + 1]
+    expected = [
+        (position, key)
+        for kind, position, key in schema.by_name[path[-1]]
+        if kind == "e"
+    ]
+    check = None
+    for position, key in expected:
+        if char in _FIRST_CHARACTER and not isinstance(
+            _FIRST_CHARACTER[char], key["param_type"]
+        ):
+            raise ValidationError("incorrect type", path)
+        check = schema.deep.by_index.get(position)
+    nested = None
+    if check is not None and char == "{":
+        nested = _nested_schema(check, obj, path)
+    if nested is not None:
+        value, index = _decode_object(text, index, nested, path)
+    else:
+        value, index = _DECODER.raw_decode(text, index)
+    for _, key in expected:
+        if not isinstance(value, key["param_type"]):
+            raise ValidationError("incorrect type", path)
+    if check is not None and check.restricted:
+        reason = check.reason(value)
+        if reason is not None:
+            raise ValidationError(reason, path)
+    return value, index
+
+
+def _decode_object(
+    text: str, index: int, schema: CompiledSchema, path: list
+) -> Tuple[dict, int]:
+    """
+    Decode an object whose schema is certain to be checked member by member.
+
+    Args
+    ----
+        - text (str): Document.
+        - index (int): Position of the opening brace.
+        - schema (CompiledSchema): Schema of the object.
+        - path (list): Keys leading to the object.
+
+    Returns
+    -------
+        - Tuple[dict, int]: Decoded object & the position right after it.
+    """
+    obj: dict = {}
+    index = _skip_whitespace(text, index + 1)
+    if text[index : index + 1] == "}":
+        return obj, index + 1
+    while True:
+        if text[index : index + 1] != '"':
+            raise json.JSONDecodeError(
+                "Expecting property name enclosed in double quotes", text, index
+            )
+        name, index = scanstring(text, index + 1)
+        index = _skip_whitespace(text, index)
+        if text[index : index + 1] != ":":
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, index)
+        index = _skip_whitespace(text, index + 1)
+        path.append(name)
+        if name not in schema.names:
+            if schema.mode == "validate":
+                raise ValidationError("unknown key", path)
+            value, index = _DECODER.raw_decode(text, index)
+        else:
+            value, index = _decode_value(text, index, schema, obj, path)
+        path.pop()
+        obj[name] = value
+        index = _skip_whitespace(text, index)
+        char = text[index : index + 1]
+        if char == "}":
+            return obj, index + 1
+        if char != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+        index = _skip_whitespace(text, index + 1)
+
+
+def decode_validated(text: str, schema: CompiledSchema) -> Any:
+    """
+    Decode a JSON document, rejecting it at the first violation of the schema that the
+    rest of the document can't make up for.
+
+    Checks that depend on the document as a whole (missing expected keys, optional
+    keys, conditional keys whose branch is only known later) are not performed, run
+    `schema.validate` on the result for those.
+
+    Args
+    ----
+        - text (str): JSON document.
+        - schema (CompiledSchema): Compiled schema of the top-level object.
+
+    Returns
+    -------
+        - Any: The decoded document.
+
+    Raises
+    ------
+        - ValidationError: At the first certain violation of the schema.
+        - json.JSONDecodeError: If the document is malformed.
+    """
+    index = _skip_whitespace(text, 0)
+    if text[index : index + 1] != "{" or not schema.names:
+        value, _ = _DECODER.raw_decode(text, index)
+        return value
+    value, index = _decode_object(text, index, schema, [])
+    index = _skip_whitespace(text, index)
+    if index != len(text):
+        raise json.JSONDecodeError("Extra data", text, index)
+    return value
@@ -0,0 +1,247 @@
+"""
+Validate outbound objects while serializing them, rejecting them at the first violation.
+
+`encode_validated` is a convenience over checking an object with its compiled schema &
+then calling `json.dumps` on it, that also tells where an invalid object breaks the
+schema. Valid objects, by far the most common, are checked by the compiled schema's
+tight loop & then encoded in one go by the C accelerated `json.JSONEncoder`: two passes,
+but both faster than walking the object member by member in Python. Objects the schema
+rejects (& Mappings the encoder can't handle) are walked instead, driven by the compiled
+schema: every member is checked as it is written, values the schema needs to look inside
+(nested expected, conditional & nested optional keys) are descended into, everything else
+is encoded by the C encoder. The walk is aborted with a `ValidationError` at the first
+violation. Checks that only need to know which keys are present (missing expected keys,
+the branch a conditional key selects, which optional keys are reached) are looked up
+before the members are walked, without traversing any values.
+
+The output is byte for byte identical to `json.dumps(obj).encode()`, & an object is
+rejected if & only if `JVal.validate` would return False for it.
+
+Functions:
+
+    - encode_validated: Encode an object to JSON, rejecting it if it breaks a schema.
+"""
+
+import json
+from collections.abc import Mapping
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, List
+
+from jval.adapters import check_type
+from jval.errors import ValidationError
+from jval.schema import CompiledSchema
+
+_ENCODER = json.JSONEncoder()
+# "key": prefixes of string keys, bounded so unknown keys can't grow it forever
+_KEYS: Dict[str, str] = {}
+
+
+def _encode_key(name: Any) -> str:
+    """
+    Encode an object key the way `json.dumps` does, including the separator.
+
+    Args
+    ----
+        - name (Any): str, int, float, bool or None key.
+
+    Returns
+    -------
+        - str: Encoded key followed by ": ".
+    """
+    if isinstance(name, str):
+        encoded = _KEYS.get(name)
+        if encoded is None:
+            encoded = encode_basestring_ascii(name) + ": "
+            if len(_KEYS) < 4096:
+                _KEYS[name] = encoded
+        return encoded
+    if name is None or isinstance(name, (bool, int, float)):
+        return f'"{_ENCODER.encode(name)}": '
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(name).__name__}"
+    )
+
+
+def _reached_optional(obj: Mapping, schema: CompiledSchema) -> int:
+    """
+    Find the optional keys the validator reaches: optional keys are checked in schema
+    order & checking stops after the first present key with a nested schema.
+
+    Args
+    ----
+        - obj (Mapping): Object being encoded.
+        - schema (CompiledSchema): Schema of the object.
+
+    Returns
+    -------
+        - int: Index of the last optional key that is checked, -1 if there's none.
+    """
+    if schema.mode == "expected":
+        return -1
+    for index, (name, _, nested) in enumerate(schema.optional_checks):
+        if nested is not None and name in obj:
+            return index
+    return len(schema.optional_checks) - 1
+
+
+def _deep_schemas(
+    value: Any, obj: Mapping, check: Any, path: list
+) -> List[CompiledSchema]:
+    """
+    Check the value of an expected key & collect its nested schema or selected branch.
+
+    Args
+    ----
+        - value (Any): Value of the member.
+        - obj (Mapping): Object holding the member.
+        - check (_DeepCheck): Deep checks of the key.
+        - path (list): Keys leading to the value.
+
+    Returns
+    -------
+        - List[CompiledSchema]: Schemas the value has to be validated against.
+    """
+    if check.restricted:
+        reason = check.reason(value)
+        if reason is not None:
+            raise ValidationError(reason, path)
+    nested = []
+    if check.expected is not None:
+        nested.append(check.expected)
+    if check.branches is not None:
+        try:
+            # the branch was counted when the object was validated
+            nested.append(check.branches.compile(obj[check.depends_on]))
+        except (KeyError, TypeError) as err:
+            raise ValidationError("no dependence_info", path) from err
+    return nested
+
+
+def _nested_schemas(
+    value: Any, obj: Mapping, schema: CompiledSchema, reached: int, path: list
+) -> List[CompiledSchema]:
+    """
+    Check a member named in a schema & collect the schemas its value must satisfy.
+
+    Args
+    ----
+        - value (Any): Value of the member.
+        - obj (Mapping): Object holding the member.
+        - schema (CompiledSchema): Schema of the object.
+        - reached (int): Index of the last optional key that is checked.
+        - path (list): Keys leading to the value, ending with the member's key.
+
+    Returns
+    -------
+        - List[CompiledSchema]: Schemas the value has to be validated against.
+    """
+    nested = []
+    for kind, index, _ in schema.by_name[path[-1]]:
+        if kind == "o":
+            if index > reached:
+                continue
+            _, param_type, optional = schema.optional_checks[index]
+            if not check_type(value, param_type):
+                raise ValidationError("incorrect type", path)
+            if optional is not None:
+                nested.append(optional)
+            continue
+        if schema.mode == "optional":
+            continue
+        if not check_type(value, schema.required[index][1]):
+            raise ValidationError("incorrect type", path)
+        check = schema.deep.by_index.get(index)
+        if check is not None:
+            nested.extend(_deep_schemas(value, obj, check, path))
+    return nested
+
+
+def _encode_value(
+    value: Any, nested: List[CompiledSchema], parts: List[str], path: list
+):
+    """
+    Encode a member's value, checking it against the schemas it must satisfy.
+
+    Args
+    ----
+        - value (Any): Value to encode.
+        - nested (List[CompiledSchema]): Schemas the value has to be validated against.
+        - parts (List[str]): Output the encoded value is appended to.
+        - path (list): Keys leading to the value.
+    """
+    if not nested:
+        parts.append(_ENCODER.encode(value))
+        return
+    # a value checked against several schemas is walked by the first one
+    for other in nested[1:]:
+        if not other.validate(value):
+            raise ValidationError("invalid nested object", path)
+    _encode_object(value, nested[0], parts, path)
+
+
+def _encode_object(obj: Any, schema: CompiledSchema, parts: List[str], path: list):
+    """
+    Encode an object whose schema is certain to be checked, member by member.
+
+    Args
+    ----
+        - obj (Any): Object to encode.
+        - schema (CompiledSchema): Schema of the object.
+        - parts (List[str]): Output the encoded object is appended to.
+        - path (list): Keys leading to the object.
+    """
+    if not isinstance(obj, Mapping):
+        raise ValidationError("incorrect type", path)
+    if schema.mode == "validate" and not schema.names:
+        raise ValidationError("no optional or expected specified", path)
+    if schema.mode != "optional":
+        for name, _ in schema.required:
+            if name not in obj:
+                raise ValidationError("missing expected", [*path, name])
+    reached = _reached_optional(obj, schema)
+    separator = "{"
+    for name, value in obj.items():
+        parts.append(separator)
+        parts.append(_encode_key(name))
+        separator = ", "
+        path.append(name)
+        if name in schema.by_name:
+            nested = _nested_schemas(value, obj, schema, reached, path)
+            _encode_value(value, nested, parts, path)
+        elif schema.mode == "validate":
+            raise ValidationError("unknown key", path)
+        else:
+            parts.append(_ENCODER.encode(value))
+        path.pop()
+    parts.append("{}" if separator == "{" else "}")
+
+
+def encode_validated(obj: Any, schema: CompiledSchema) -> bytes:
+    """
+    Encode an object to JSON, rejecting it if it doesn't satisfy a schema.
+
+    Args
+    ----
+        - obj (Any): Object (or any Mapping) to encode.
+        - schema (CompiledSchema): Compiled schema of the object.
+
+    Returns
+    -------
+        - bytes: The encoded object.
+
+    Raises
+    ------
+        - ValidationError: At the first violation of the schema.
+        - TypeError: If the object isn't JSON serializable.
+    """
+    try:
+        text = _ENCODER.encode(obj) if schema.validate(obj) else None
+    except TypeError:
+        # Mappings other than dict can only be encoded member by member
+        text = None
+    if text is None:
+        parts: List[str] = []
+        _encode_object(obj, schema, parts, [])
+        text = "".join(parts)
+    # ensure_ascii output, the encoded text is its own byte representation
+    return text.encode("ascii")
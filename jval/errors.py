@@ -0,0 +1,58 @@
+"""
+Exceptions raised by the validator.
+
+Classes:
+
+    - ValidationError: A JSON object violates its schema.
+    - SchemaError: A schema is malformed or has checks that can never run.
+"""
+
+from typing import Any, Sequence
+
+
+class ValidationError(ValueError):
+    """
+    A JSON object violates its schema.
+
+    Attributes
+    ----------
+        - reason (str): What is wrong, e.g. "unknown key" or "incorrect type".
+        - path (tuple): Keys leading from the top-level object to the offending value.
+    """
+
+    def __init__(self, reason: str, path: Sequence[Any] = ()):
+        """
+        Args
+        ----
+            - reason (str): What is wrong.
+            - path (Sequence[Any]): Keys leading to the offending value.
+        """
+        self.reason = reason
+        self.path = tuple(path)
+        super().__init__(f"{reason} at: {'/'.join(str(key) for key in self.path)}")
+
+
+class SchemaError(ValueError):
+    """
+    A schema is malformed or has checks that can never run.
+
+    Attributes
+    ----------
+        - reason (str): What is wrong, e.g. "unknown field: conditional_keys".
+        - path (tuple): Lists & keys leading from the top of the schema to the problem.
+        - fatal (bool): False for checks that can never run (e.g. unreachable branches),
+                        True if the schema can't be validated against.
+    """
+
+    def __init__(self, reason: str, path: Sequence[Any] = (), fatal: bool = True):
+        """
+        Args
+        ----
+            - reason (str): What is wrong.
+            - path (Sequence[Any]): Lists & keys leading to the problem.
+            - fatal (bool): If the schema can't be validated against.
+        """
+        self.reason = reason
+        self.path = tuple(path)
+        self.fatal = fatal
+        super().__init__(f"{reason} at: {'/'.join(str(key) for key in self.path)}")
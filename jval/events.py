@@ -0,0 +1,485 @@
+"""
+Event driven (SAX style) validation of a single JSON object in constant memory.
+
+The document is tokenized with `jval.stream.iter_events` & checked against the expected /
+optional / conditional schema as the events stream past, without decoding it into Python
+objects. Only scalars of keys named in the schema are looked at; every other subtree is
+skipped event by event without being materialized (or rejected straight away where
+unknown keys aren't allowed). Memory use therefore depends on the depth of the schema &
+the number of conditional branches, not on the size of the document.
+
+Results are identical to decoding the document & calling `JVal.validate`. Because keys
+may appear in any order, conditional subtrees that arrive before the key they depend on
+are checked against every branch at once & the matching branch is picked at the end of
+the enclosing object.
+
+Classes:
+
+    - EventValidator: Validate JSON documents against a schema from parse events.
+"""
+
+import logging
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from jval.common import STREAM_CHUNK_SIZE
+from jval.prewarm import compiled
+from jval.schema import CompiledSchema
+from jval.stream import iter_events
+
+logger = logging.getLogger(__name__)
+
+# representative values used to type check containers without building them
+_CONTAINERS = {"start_map": {}, "start_array": []}
+# key of the consumer that keeps skipping conditional subtrees no branch matches
+_SKIP = object()
+
+
+class _Skip:  # pylint: disable=too-few-public-methods
+    """
+    Consume the events of a subtree without building it.
+    """
+
+    def __init__(self):
+        """
+        Start skipping right after the subtree's opening event.
+        """
+        self.depth = 1
+
+    def feed(self, event: str, _value: Any) -> bool:
+        """
+        Consume one event.
+
+        Returns
+        -------
+            - bool: True once the subtree is complete.
+        """
+        if event in ("start_map", "start_array"):
+            self.depth += 1
+        elif event in ("end_map", "end_array"):
+            self.depth -= 1
+        return self.depth == 0
+
+
+class _Build:  # pylint: disable=too-few-public-methods
+    """
+    Build a subtree from its events, only used where a container value has to be
+    compared against `possible_values`.
+    """
+
+    def __init__(self, event: str):
+        """
+        Start building right after the subtree's opening event.
+
+        Args
+        ----
+            - event (str): The opening event of the subtree.
+        """
+        self.value = {} if event == "start_map" else []
+        self.stack: List[Any] = [self.value]
+        self.key: List[Optional[str]] = [None]
+
+    def _add(self, value: Any):
+        """
+        Add a value to the innermost open container.
+        """
+        if isinstance(self.stack[-1], dict):
+            self.stack[-1][self.key[-1]] = value
+        else:
+            self.stack[-1].append(value)
+
+    def feed(self, event: str, value: Any) -> bool:
+        """
+        Consume one event.
+
+        Returns
+        -------
+            - bool: True once the subtree is complete.
+        """
+        if event == "map_key":
+            self.key[-1] = value
+        elif event in _CONTAINERS:
+            container = {} if event == "start_map" else []
+            self._add(container)
+            self.stack.append(container)
+            self.key.append(None)
+        elif event in ("end_map", "end_array"):
+            self.stack.pop()
+            self.key.pop()
+        else:
+            self._add(value)
+        return not self.stack
+
+
+class _Fanout:  # pylint: disable=too-few-public-methods
+    """
+    Feed the events of one subtree to several consumers at once.
+    """
+
+    def __init__(self, consumers: Dict[Any, Any]):
+        """
+        Args
+        ----
+            - consumers (Dict[Any, Any]): Consumers keyed by what they check.
+        """
+        self.consumers = consumers
+
+    def feed(self, event: str, value: Any) -> bool:
+        """
+        Consume one event.
+
+        Returns
+        -------
+            - bool: True once the subtree is complete.
+        """
+        done = False
+        for consumer in self.consumers.values():
+            done = consumer.feed(event, value)
+        return done
+
+
+class _ObjectCheck:  # pylint: disable=too-few-public-methods
+    """
+    Validate one JSON object from its events.
+    """
+
+    def __init__(self, spec: CompiledSchema):
+        """
+        Start checking right after the object's "start_map" event.
+
+        Args
+        ----
+            - spec (CompiledSchema): Compiled schema the object is checked against.
+        """
+        self.spec = spec
+        self.key: Optional[str] = None
+        self.child: Any = None
+        # first key not named in the schema (only tracked in "validate" mode)
+        self.unknown: Optional[str] = None
+        # (kind, index, check) -> bool, or {branch value: bool} for conditional keys,
+        # check is "type", "possible_values", "expected", "optional" or "conditional"
+        self.checks: Dict[Tuple[str, int, str], Any] = {}
+        # values of sibling keys conditional keys depend on
+        self.values: Dict[str, Any] = {}
+        # set at the end of the object, or to False as soon as it's known to be invalid
+        self.result: Optional[bool] = None
+
+    def feed(self, event: str, value: Any) -> bool:
+        """
+        Consume one event.
+
+        Returns
+        -------
+            - bool: True once the object is complete & `result` is set.
+        """
+        if self.child is not None:
+            if self.child.feed(event, value):
+                self._collect(self.child)
+                self.child = None
+            return False
+        if event == "map_key":
+            self.key = value
+            return False
+        if event == "end_map":
+            self.result = self._result()
+            return True
+        self._value(event, value)
+        return False
+
+    def _value(self, event: str, value: Any):
+        """
+        Check the value of the current key, starting a consumer for containers.
+
+        Args
+        ----
+            - event (str): Event of the value.
+            - value (Any): Scalar value, None for containers.
+        """
+        name = self.key
+        entries = self.spec.by_name.get(name)
+        container = event in _CONTAINERS
+        if entries is None:
+            if self.spec.mode == "validate" and self.unknown is None:
+                self.unknown = name
+                self.result = False
+            if container:
+                self.child = _Skip()
+            return
+        actual = _CONTAINERS[event] if container else value
+        if name in self.spec.deep.depends_on:
+            if container:
+                self.values.pop(name, None)
+            else:
+                self.values[name] = value
+        consumers: Dict[Any, Any] = {}
+        for kind, index, key in entries:
+            type_ok = isinstance(actual, key["param_type"])
+            self.checks[(kind, index, "type")] = type_ok
+            if kind == "o":
+                nested = self.spec.optional_checks[index][2]
+                if nested is not None and event == "start_map" and type_ok:
+                    consumers[(kind, index, "optional")] = _ObjectCheck(nested)
+                continue
+            if not type_ok and self.spec.mode == "validate":
+                self.result = False
+            check = self.spec.deep.by_index.get(index)
+            if check is not None:
+                consumers.update(self._deep(check, event, value, type_ok))
+        if container:
+            self.child = _Fanout(consumers) if consumers else _Skip()
+
+    def _deep(
+        self, check: Any, event: str, value: Any, type_ok: bool
+    ) -> Dict[Tuple[str, int, str], Any]:
+        """
+        Check the value of an expected key against its possible values & sub-schemas.
+
+        Args
+        ----
+            - check (_DeepCheck): Compiled checks of the expected key.
+            - event (str): Event of the value.
+            - value (Any): Scalar value, None for containers.
+            - type_ok (bool): True if the value has the key's type.
+
+        Returns
+        -------
+            - Dict[Tuple[str, int, str], Any]: Consumers checking the container value.
+        """
+        consumers: Dict[Tuple[str, int, str], Any] = {}
+        if check.restricted:
+            if event in _CONTAINERS:
+                consumers[("e", check.index, "possible_values")] = _Build(event)
+            else:
+                self.checks[("e", check.index, "possible_values")] = check.allows(value)
+        if event != "start_map" or not type_ok:
+            return consumers
+        if check.expected is not None:
+            consumers[("e", check.index, "expected")] = _ObjectCheck(check.expected)
+        if check.branches is not None:
+            consumers[("e", check.index, "conditional")] = self._branches(check)
+        return consumers
+
+    def _branches(self, check: Any) -> _Fanout:
+        """
+        Start checking a conditional subtree against its candidate branches.
+
+        If the key it depends on was already seen only the matching branch is checked,
+        otherwise every branch is.
+
+        Args
+        ----
+            - check (_DeepCheck): Compiled checks of the conditional key.
+
+        Returns
+        -------
+            - _Fanout: Consumer checking each candidate branch, keyed by branch value.
+        """
+        if check.depends_on in self.values:
+            value = self.values[check.depends_on]
+            candidates = [value] if value in check.branches else []
+        else:
+            candidates = list(check.branches)
+        # branches are counted as selected once the result is known
+        branches: Dict[Any, Any] = {
+            candidate: _ObjectCheck(check.branches.compile(candidate))
+            for candidate in candidates
+        }
+        # always consume the subtree, even if no branch matches
+        branches[_SKIP] = _Skip()
+        return _Fanout(branches)
+
+    def _collect(self, consumer: Any):
+        """
+        Record the results of a completed container value.
+
+        Args
+        ----
+            - consumer (Any): Consumer that just completed.
+        """
+        if not isinstance(consumer, _Fanout):
+            return
+        for (kind, index, check), checker in consumer.consumers.items():
+            if check == "possible_values":
+                self.checks[(kind, index, check)] = self.spec.deep.by_index[
+                    index
+                ].allows(checker.value)
+            elif check == "conditional":
+                self.checks[(kind, index, check)] = {
+                    branch: result.result
+                    for branch, result in checker.consumers.items()
+                    if branch is not _SKIP
+                }
+            else:
+                self.checks[(kind, index, check)] = checker.result
+
+    def _result(self) -> bool:
+        """
+        Combine the recorded checks in the order `JVal.validate` performs them.
+
+        Returns
+        -------
+            - bool: True if the object satisfies the schema, False otherwise.
+        """
+        spec = self.spec
+        if spec.mode == "expected":
+            return self._expected_result()
+        if spec.mode == "optional":
+            return self._optional_result()
+        if not spec.names:
+            logger.error("no optional or expected specified")
+            return False
+        if self.unknown is not None:
+            return False
+        if spec.optional_checks and not self._optional_result():
+            return False
+        return self._expected_result()
+
+    def _expected_result(self) -> bool:
+        """
+        Combine the recorded checks of the expected keys.
+
+        Returns
+        -------
+            - bool: True if the expected keys are satisfied, False otherwise.
+        """
+        required = self.spec.required
+        missing = [
+            name
+            for index, (name, _) in enumerate(required)
+            if ("e", index, "type") not in self.checks
+        ]
+        if missing:
+            logger.error("missing expected: %s", missing)
+            return False
+        incorrect_type = [
+            name
+            for index, (name, _) in enumerate(required)
+            if not self.checks[("e", index, "type")]
+        ]
+        if incorrect_type:
+            logger.error("incorrect type for: %s", incorrect_type)
+            return False
+        return self._deep_result()
+
+    def _deep_result(self) -> bool:
+        """
+        Combine the recorded possible value, nested & conditional checks.
+
+        Returns
+        -------
+            - bool: True if the checks are satisfied, False otherwise.
+        """
+        for check in self.spec.deep:
+            index = check.index
+            if check.restricted and not self.checks[("e", index, "possible_values")]:
+                logger.error("incorrect possible value for param: %s", check.name)
+                return False
+            if check.expected is not None and not self.checks[("e", index, "expected")]:
+                return False
+            if check.branches is not None:
+                branches = self.checks[("e", index, "conditional")]
+                value = self.values.get(check.depends_on)
+                if check.depends_on not in self.values or value not in branches:
+                    logger.error(
+                        "no dependence_info for: %s, in param: %s", value, check.name
+                    )
+                    return False
+                check.branches.stats.incr(value)
+                return branches[value]
+        return True
+
+    def _optional_result(self) -> bool:
+        """
+        Combine the recorded checks of the optional keys.
+
+        Returns
+        -------
+            - bool: True if the optional keys are satisfied, False otherwise.
+        """
+        for index, (name, _, nested) in enumerate(self.spec.optional_checks):
+            if ("o", index, "type") not in self.checks:
+                continue
+            if not self.checks[("o", index, "type")]:
+                logger.error("invalid optional type for param: %s", name)
+                return False
+            if nested is not None:
+                return self.checks[("o", index, "optional")]
+        return True
+
+
+class EventValidator:
+    """
+    Validate JSON documents against a schema from parse events in constant memory.
+    """
+
+    def __init__(
+        self,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """
+        Instantiate the validator for a schema.
+
+        Args
+        ----
+            - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                         objects describing the required
+                                                         parameters of a JSON object
+            - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                         & names of each JSON parameter that
+                                                         may or may not be in the JSON object
+        """
+        self.schema = compiled(expected, optional)
+
+    def validate_events(self, events: Iterable[Tuple[str, Any]]) -> bool:
+        """
+        Validate a document given as parse events.
+
+        Reading stops as soon as the top-level object is known to be invalid, e.g. at the
+        first unknown key or expected key with the wrong type.
+
+        Args
+        ----
+            - events (Iterable[Tuple[str, Any]]): Parse events of the document.
+
+        Returns
+        -------
+            - bool: True if the document satisfies the schema, False otherwise.
+        """
+        root = _ObjectCheck(self.schema)
+        if not root.spec.names:
+            logger.error("no optional or expected specified")
+            return False
+        events = iter(events)
+        for event, _ in events:
+            if event != "start_map":
+                logger.error("document is not an object")
+                return False
+            break
+        else:
+            return False
+        for event, value in events:
+            if root.feed(event, value):
+                # make sure the rest of the document is well formed
+                for _ in events:
+                    pass
+                return bool(root.result)
+            if root.result is False:
+                if root.unknown is not None:
+                    logger.error("invalid key: %s", root.unknown)
+                return False
+        return False
+
+    def validate(self, jfile: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> bool:
+        """
+        Validate a JSON document read from a binary stream.
+
+        Args
+        ----
+            - jfile (BinaryIO): UTF-8 encoded binary stream containing the document.
+            - chunk_size (int): Number of bytes read at a time.
+
+        Returns
+        -------
+            - bool: True if the document satisfies the schema, False otherwise.
+        """
+        return self.validate_events(iter_events(jfile, chunk_size=chunk_size))
@@ -0,0 +1,281 @@
+"""
+Validate plain, compressed & archived JSON files.
+
+Files are opened with `jval.sources`, so gzip / bz2 / xz (& zstd) files are decompressed
+as they're read, & results are looked up in & stored to the validator's result cache.
+Many files are read (& result cache lookups done) by the shared reader pool of
+`jval.prefetch`, while the calling thread decodes & validates each file as soon as it
+has been read. Archives are validated member by member. Files that can't be read or
+decoded & documents that aren't objects are invalid.
+
+Functions:
+
+    - validate_file: Validate a JSON file against a schema.
+    - validate_lines: Validate every line of an open NDJSON file.
+    - validate_many: Validate many JSON files, reading them ahead in a thread pool.
+"""
+
+import functools
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jval.archive import ARCHIVE_ERRORS, is_archive, validate_archive
+from jval.common import FETCH_THREADS
+from jval.decode import decode_validated
+from jval.errors import ValidationError
+from jval.prefetch import prefetch
+from jval.prewarm import compiled
+from jval.router import Router
+from jval.schema import fingerprint
+from jval.sources import READ_ERRORS, open_source, read_source
+
+logger = logging.getLogger(__name__)
+
+
+def _decode_file(
+    validator: Any,
+    jpath: str,
+    expected: Optional[List[Dict[str, Any]]],
+    optional: Optional[List[Dict[str, Any]]],
+    early_reject: bool,
+) -> bool:
+    """
+    Decode & validate a plain or compressed JSON file, bypassing the result cache.
+
+    Args
+    ----
+        - validator (JVal): Validator used to validate the decoded document.
+        - jpath (str): Path to the file.
+        - expected (Optional[List[Dict[str, Any]]]): Expected keys of the schema.
+        - optional (Optional[List[Dict[str, Any]]]): Optional keys of the schema.
+        - early_reject (bool): Validate while decoding & stop at the first violation.
+
+    Returns
+    -------
+        - bool: True if the document is an object satisfying the schema, False otherwise.
+    """
+    if early_reject:
+        with open_source(jpath) as jfile:
+            text = jfile.read().decode("utf-8-sig")
+        schema = compiled(expected, optional)
+        try:
+            jobj = decode_validated(text, schema)
+        except ValidationError as err:
+            logger.error("rejected while decoding: %s", err)
+            return False
+        return isinstance(jobj, dict) and schema.validate(jobj)
+    with open_source(jpath) as jfile:
+        jobj = json.load(jfile)
+    if not isinstance(jobj, dict):
+        logger.error("document is not an object: %s", jpath)
+        return False
+    return validator.validate(jobj, expected=expected, optional=optional)
+
+
+def validate_file(
+    validator: Any,
+    jpath: str,
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+    early_reject: bool = False,
+) -> bool:
+    """
+    Validate a plain, compressed or archived JSON file against a schema.
+
+    Args
+    ----
+        - validator (JVal): Validator used to validate the decoded document, its
+                            result cache (if any) is used too.
+        - jpath (str): Path to the file.
+        - expected (Optional[List[Dict[str, Any]]]): Expected keys of the schema.
+        - optional (Optional[List[Dict[str, Any]]]): Optional keys of the schema.
+        - early_reject (bool): Validate while decoding & stop at the first violation.
+
+    Returns
+    -------
+        - bool: True if the file satisfies the schema, False otherwise.
+    """
+    cache = validator.cache
+    if cache is not None:
+        schema_fingerprint = fingerprint(expected, optional)
+        file_key = cache.file_key(jpath)
+        cached = cache.get(schema_fingerprint, file_key)
+        if cached is not None:
+            return cached
+    if is_archive(jpath):
+        members = validate_archive(validator, jpath, expected, optional)
+        validated = all(members.values())
+    else:
+        validated = _decode_file(validator, jpath, expected, optional, early_reject)
+    if cache is not None:
+        cache.put(schema_fingerprint, file_key, validated)
+    return validated
+
+
+def validate_lines(
+    validator: Any,
+    jfile: Iterable[bytes],
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+    router: Optional[Router] = None,
+) -> Iterator[Tuple[int, bool]]:
+    """
+    Validate every line of an open line-delimited JSON (NDJSON) file.
+
+    Args
+    ----
+        - validator (JVal): Validator used to validate each decoded line.
+        - jfile (Iterable[bytes]): Binary stream of the (decompressed) file.
+        - expected (Optional[List[Dict[str, Any]]]): Expected keys of the schema.
+        - optional (Optional[List[Dict[str, Any]]]): Optional keys of the schema.
+        - router (Optional[Router]): Validate each object against the schema its
+                                     discriminator selects instead.
+
+    Returns
+    -------
+        - Iterator[Tuple[int, bool]]: (line number, result) for every non blank line,
+                                      line numbers start at 1.
+    """
+    for line_number, line in enumerate(jfile, start=1):
+        if not line.strip():
+            continue
+        try:
+            jobj = json.loads(line)
+        except ValueError as err:
+            logger.error("invalid JSON on line: %s, %s", line_number, err)
+            yield line_number, False
+            continue
+        if not isinstance(jobj, dict):
+            logger.error("line is not an object: %s", line_number)
+            yield line_number, False
+            continue
+        if router is not None:
+            yield line_number, router.validate(jobj)
+        else:
+            yield line_number, validator.validate(jobj, expected, optional)
+
+
+def _read(
+    validator: Any, schema: Any, schema_fingerprint: Optional[str], jpath: str
+) -> Tuple[Optional[str], Any]:
+    """
+    Read a file, or look its result up in the validator's cache, in a reader thread.
+
+    Archives are validated right away, their members are read one at a time.
+
+    Args
+    ----
+        - validator (JVal): Validator whose result cache is looked up.
+        - schema (Any): (expected, optional) pair or a `Router`.
+        - schema_fingerprint (Optional[str]): Fingerprint results are cached under.
+        - jpath (str): Path to the file.
+
+    Returns
+    -------
+        - Tuple[Optional[str], Any]: Cache key to store the result under (None if
+                                     there's no cache or the result came from it) &
+                                     the file contents or result.
+    """
+    if validator.cache is None:
+        file_key = None
+    else:
+        file_key = validator.cache.file_key(jpath)
+        cached = validator.cache.get(schema_fingerprint, file_key)
+        if cached is not None:
+            return None, cached
+    if is_archive(jpath):
+        if isinstance(schema, Router):
+            members = validate_archive(validator, jpath, router=schema)
+        else:
+            members = validate_archive(validator, jpath, *schema)
+        return file_key, all(members.values())
+    return file_key, read_source(jpath)
+
+
+def _validate_contents(
+    validator: Any, schema: Any, jpath: str, contents: bytes
+) -> bool:
+    """
+    Decode & validate the contents of a file.
+
+    Args
+    ----
+        - validator (JVal): Validator used to validate the decoded document.
+        - schema (Any): (expected, optional) pair or a `Router`.
+        - jpath (str): Path to the file, for logging.
+        - contents (bytes): Contents of the file.
+
+    Returns
+    -------
+        - bool: True if the document is an object satisfying the schema, False otherwise.
+    """
+    try:
+        jobj = json.loads(contents)
+    except ValueError as err:
+        logger.error("invalid JSON in: %s, %s", jpath, err)
+        return False
+    if not isinstance(jobj, dict):
+        logger.error("document is not an object: %s", jpath)
+        return False
+    if isinstance(schema, Router):
+        return schema.validate(jobj)
+    return validator.validate(jobj, *schema)
+
+
+def validate_many(  # pylint: disable=too-many-arguments
+    validator: Any,
+    jpaths: Iterable[str],
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+    threads: int = FETCH_THREADS,
+    read_ahead: Optional[int] = None,
+    router: Optional[Router] = None,
+) -> Iterator[Tuple[str, bool]]:
+    """
+    Validate many JSON files, reading them ahead in a thread pool.
+
+    Args
+    ----
+        - validator (JVal): Validator used to validate each decoded document, its
+                            result cache (if any) is used too.
+        - jpaths (Iterable[str]): Paths to the JSON files, consumed lazily.
+        - expected (Optional[List[Dict[str, Any]]]): Expected keys of the schema.
+        - optional (Optional[List[Dict[str, Any]]]): Optional keys of the schema.
+        - threads (int): Number of reader threads.
+        - read_ahead (Optional[int]): Maximum number of files read ahead, defaults
+                                      to twice the number of threads.
+        - router (Optional[Router]): Validate each document against the schema its
+                                     discriminator selects instead.
+
+    Returns
+    -------
+        - Iterator[Tuple[str, bool]]: (path, result) in the order reads complete.
+    """
+    schema = router if router is not None else (expected, optional)
+    schema_fingerprint = None
+    if validator.cache is not None:
+        schema_fingerprint = (
+            router.fingerprint
+            if router is not None
+            else fingerprint(expected, optional)
+        )
+    for jpath, future in prefetch(
+        jpaths,
+        functools.partial(_read, validator, schema, schema_fingerprint),
+        threads,
+        read_ahead,
+    ):
+        try:
+            file_key, contents = future.result()
+        except (*READ_ERRORS, *ARCHIVE_ERRORS) as err:
+            logger.error("could not read: %s, %s", jpath, err)
+            yield jpath, False
+            continue
+        if isinstance(contents, bool):
+            validated = contents
+        else:
+            validated = _validate_contents(validator, schema, jpath, contents)
+        if file_key is not None:
+            validator.cache.put(schema_fingerprint, file_key, validated)
+        yield jpath, validated
@@ -0,0 +1,522 @@
+"""
+One-time checks of a schema's own structure, run when it's compiled or registered.
+
+Schemas are plain lists of dicts, so a typo (`conditional_keys` for `conditional`) or a
+missing field (a `dependence_info` entry without `optional`) would otherwise only show
+up as a `KeyError` deep inside a validation, or as a check that silently never runs.
+Checking the schema once up front lets the compiled validators trust its structure.
+
+Problems are either fatal (the schema can't be validated against: keys that aren't
+dicts, missing or mistyped `param_name` / `param_type`, unknown fields, malformed
+`conditional` blocks, invalid patterns, lengths, formats or numeric bounds) or
+unreachable checks (fields the validator never looks at for that kind of key, possible
+values of the wrong type, string or numeric constraints on keys that can't be strings or
+numbers, conditional branches no value of the key they depend on can select, deep checks
+after the first conditional key). The latter are logged as warnings unless checking is
+strict.
+
+Functions:
+
+    - schema_problems: List the problems of a schema.
+    - check_schema: Raise on the first fatal problem of a schema.
+"""
+
+import logging
+import math
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from jval import constraints
+from jval.errors import SchemaError
+
+logger = logging.getLogger(__name__)
+
+# fields of a key & the kind of key ("e" expected, "o" optional) they're checked for
+_FIELDS = {
+    "param_name": "eo",
+    "param_type": "eo",
+    "possible_values": "e",
+    "pattern": "e",
+    "min_length": "e",
+    "max_length": "e",
+    "format": "e",
+    "minimum": "e",
+    "maximum": "e",
+    "multiple_of": "e",
+    "expected": "e",
+    "conditional": "e",
+    "optional": "o",
+}
+# fields only checked when the key's param_type is dict
+_NESTED = ("expected", "conditional", "optional")
+
+
+def _is_type(param_type: Any) -> bool:
+    """
+    Check if a `param_type` is a type or a non empty tuple of types.
+
+    Args
+    ----
+        - param_type (Any): `param_type` from the schema.
+
+    Returns
+    -------
+        - bool: True if it can be passed to isinstance, False otherwise.
+    """
+    if isinstance(param_type, tuple):
+        return bool(param_type) and all(isinstance(kind, type) for kind in param_type)
+    return isinstance(param_type, type)
+
+
+def _is_number(value: Any) -> bool:
+    """
+    Check if a constraint is a finite int or float, bools excluded.
+
+    Args
+    ----
+        - value (Any): Constraint from the schema.
+
+    Returns
+    -------
+        - bool: True if it's a finite number, False otherwise.
+    """
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        # ints are finite, however large (too large for math.isfinite)
+        and (isinstance(value, int) or math.isfinite(value))
+    )
+
+
+def _allows_type(value: Any, param_type: Any) -> bool:
+    """
+    Check if a value has a `param_type`, accepting any mapping where a dict is expected.
+
+    Args
+    ----
+        - value (Any): Value.
+        - param_type (Any): Type or tuple of types.
+
+    Returns
+    -------
+        - bool: True if the value has the type, False otherwise.
+    """
+    kinds = param_type if isinstance(param_type, tuple) else (param_type,)
+    if dict in kinds:
+        kinds = kinds + (Mapping,)
+    return isinstance(value, kinds)
+
+
+class _Checker:
+    """
+    Walks a schema, collecting its problems.
+    """
+
+    def __init__(self):
+        """
+        Start with no problems.
+        """
+        self.problems: List[SchemaError] = []
+
+    def problem(self, reason: str, path: Sequence[Any], fatal: bool = True):
+        """
+        Record a problem.
+
+        Args
+        ----
+            - reason (str): What is wrong.
+            - path (Sequence[Any]): Lists & keys leading to the problem.
+            - fatal (bool): If the schema can't be validated against.
+        """
+        self.problems.append(SchemaError(reason, path, fatal))
+
+    def schema(self, expected: Any, optional: Any, path: Tuple[Any, ...] = ()):
+        """
+        Check the expected & optional keys of a (nested) schema.
+
+        Args
+        ----
+            - expected (Any): Expected keys.
+            - optional (Any): Optional keys.
+            - path (Tuple[Any, ...]): Path of the schema.
+        """
+        keys: Dict[str, Dict[str, Any]] = {}
+        for kind, name, value in (
+            ("e", "expected", expected),
+            ("o", "optional", optional),
+        ):
+            if value is None:
+                continue
+            if not isinstance(value, (list, tuple)):
+                self.problem(f"{name} is not a list of keys", path + (name,))
+                continue
+            for index, key in enumerate(value):
+                checked = self.key(key, kind, path + (name,), index)
+                if checked is None:
+                    continue
+                if checked["param_name"] in keys:
+                    self.problem(
+                        f"duplicate key: {checked['param_name']}",
+                        path + (name, checked["param_name"]),
+                        False,
+                    )
+                if kind == "e":
+                    keys[checked["param_name"]] = checked
+                else:
+                    keys.setdefault(checked["param_name"], {})
+        if isinstance(expected, (list, tuple)):
+            self.conditionals(expected, keys, path + ("expected",))
+
+    def key(
+        self, key: Any, kind: str, path: Tuple[Any, ...], index: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Check a key & its nested schemas.
+
+        Args
+        ----
+            - key (Any): Key.
+            - kind (str): "e" for expected keys, "o" for optional keys.
+            - path (Tuple[Any, ...]): Path of the list holding the key.
+            - index (int): Position of the key in the list.
+
+        Returns
+        -------
+            - Optional[Dict[str, Any]]: The key if it's well formed enough to be named,
+                                        None otherwise.
+        """
+        if not isinstance(key, dict):
+            self.problem("key is not a dict", path + (index,))
+            return None
+        name = key.get("param_name")
+        if not isinstance(name, str):
+            reason = "missing" if "param_name" not in key else "non string"
+            self.problem(f"{reason} param_name", path + (index,))
+            return None
+        path = path + (name,)
+        if "param_type" not in key:
+            self.problem("missing param_type", path)
+            return None
+        param_type = key["param_type"]
+        if not _is_type(param_type):
+            self.problem(f"param_type is not a type: {param_type!r}", path)
+            return None
+        self.fields(key, kind, path)
+        if "possible_values" in key and kind == "e":
+            self.possible_values(key["possible_values"], param_type, path)
+        if kind == "e" and not constraints.CONSTRAINT_FIELDS.isdisjoint(key):
+            self.constraints(key, param_type, path)
+        if param_type == dict:
+            self.nested(key, kind, path)
+        return key
+
+    def fields(self, key: Dict[str, Any], kind: str, path: Tuple[Any, ...]):
+        """
+        Check the fields of a key are known & checked for its kind & type.
+
+        Args
+        ----
+            - key (Dict[str, Any]): Key with a valid name & type.
+            - kind (str): "e" for expected keys, "o" for optional keys.
+            - path (Tuple[Any, ...]): Path of the key.
+        """
+        for field in key:
+            if field not in _FIELDS:
+                self.problem(f"unknown field: {field}", path)
+            elif kind not in _FIELDS[field]:
+                kinds = "an expected" if kind == "e" else "an optional"
+                self.problem(f"{field} is never checked on {kinds} key", path, False)
+            elif field in _NESTED and key["param_type"] != dict:
+                self.problem(
+                    f"{field} is only checked if param_type is dict", path, False
+                )
+
+    def nested(self, key: Dict[str, Any], kind: str, path: Tuple[Any, ...]):
+        """
+        Check the nested & conditional schemas of a dict key.
+
+        Args
+        ----
+            - key (Dict[str, Any]): Key of type dict.
+            - kind (str): "e" for expected keys, "o" for optional keys.
+            - path (Tuple[Any, ...]): Path of the key.
+        """
+        if "expected" in key and kind == "e":
+            # nested expected keys never have nested optional keys checked
+            self.schema(key["expected"], None, path)
+        if "optional" in key and kind == "o":
+            self.schema(None, key["optional"], path)
+        if "conditional" in key and kind == "e":
+            self.conditional(key["conditional"], path + ("conditional",))
+
+    def possible_values(self, values: Any, param_type: Any, path: Tuple[Any, ...]):
+        """
+        Check the possible values of a key.
+
+        Args
+        ----
+            - values (Any): Possible values.
+            - param_type (Any): Type of the key.
+            - path (Tuple[Any, ...]): Path of the key.
+        """
+        if not isinstance(values, (list, tuple, set, frozenset)):
+            self.problem("possible_values is not a list", path)
+            return
+        for value in values:
+            if not _allows_type(value, param_type):
+                self.problem(
+                    f"possible value of the wrong type: {value!r}", path, False
+                )
+
+    def constraints(self, key: Dict[str, Any], param_type: Any, path: Tuple[Any, ...]):
+        """
+        Check the string & numeric constraints of a key.
+
+        Args
+        ----
+            - key (Dict[str, Any]): Key.
+            - param_type (Any): Type of the key.
+            - path (Tuple[Any, ...]): Path of the key.
+        """
+        if not constraints.STRING_FIELDS.isdisjoint(key):
+            self.string_constraints(key, param_type, path)
+        if not constraints.NUMERIC_FIELDS.isdisjoint(key):
+            self.numeric_constraints(key, param_type, path)
+
+    def string_constraints(
+        self, key: Dict[str, Any], param_type: Any, path: Tuple[Any, ...]
+    ):
+        """
+        Check the string constraints of a key.
+
+        Args
+        ----
+            - key (Dict[str, Any]): Key.
+            - param_type (Any): Type of the key.
+            - path (Tuple[Any, ...]): Path of the key.
+        """
+        if "pattern" in key:
+            try:
+                re.compile(key["pattern"])
+            except (re.error, TypeError):
+                self.problem(f"invalid pattern: {key['pattern']!r}", path)
+        lengths = []
+        for field in ("min_length", "max_length"):
+            if field not in key:
+                continue
+            value = key[field]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                self.problem(f"{field} is not a non negative int: {value!r}", path)
+            else:
+                lengths.append(value)
+        if len(lengths) == 2 and lengths[0] > lengths[1]:
+            self.problem("min_length is greater than max_length", path, False)
+        if "format" in key and not (
+            isinstance(key["format"], str) and key["format"] in constraints.FORMATS
+        ):
+            self.problem(f"unknown format: {key['format']!r}", path)
+        if not _allows_type("", param_type):
+            self.problem(
+                "string constraints on a key that can't be a string", path, False
+            )
+
+    def numeric_constraints(
+        self, key: Dict[str, Any], param_type: Any, path: Tuple[Any, ...]
+    ):
+        """
+        Check the numeric constraints of a key.
+
+        Args
+        ----
+            - key (Dict[str, Any]): Key.
+            - param_type (Any): Type of the key.
+            - path (Tuple[Any, ...]): Path of the key.
+        """
+        bounds = []
+        for field in ("minimum", "maximum", "multiple_of"):
+            if field not in key:
+                continue
+            value = key[field]
+            if not _is_number(value):
+                self.problem(f"{field} is not a finite number: {value!r}", path)
+            elif field == "multiple_of" and value <= 0:
+                self.problem(f"multiple_of is not positive: {value!r}", path)
+            elif field != "multiple_of":
+                bounds.append(value)
+        if len(bounds) == 2 and bounds[0] > bounds[1]:
+            self.problem("minimum is greater than maximum", path, False)
+        if not (_allows_type(0, param_type) or _allows_type(0.0, param_type)):
+            self.problem(
+                "numeric constraints on a key that can't be a number", path, False
+            )
+
+    def conditional(self, conditional: Any, path: Tuple[Any, ...]):
+        """
+        Check the structure of a conditional block.
+
+        Args
+        ----
+            - conditional (Any): Conditional block of a key.
+            - path (Tuple[Any, ...]): Path of the block.
+        """
+        if not isinstance(conditional, dict):
+            self.problem("conditional is not a dict", path)
+            return
+        for field in conditional:
+            if field not in ("depends_on", "dependence_info"):
+                self.problem(f"unknown field: {field}", path)
+        if not isinstance(conditional.get("depends_on"), str):
+            self.problem("missing or non string depends_on", path)
+        info = conditional.get("dependence_info")
+        if not isinstance(info, dict):
+            self.problem("missing or non dict dependence_info", path)
+            return
+        for value, branch in info.items():
+            branch_path = path + ("dependence_info", value)
+            if not isinstance(branch, dict):
+                self.problem("branch is not a dict", branch_path)
+                continue
+            for field in branch:
+                if field not in ("expected", "optional"):
+                    self.problem(f"unknown field: {field}", branch_path)
+            missing = [
+                field for field in ("expected", "optional") if field not in branch
+            ]
+            if missing:
+                self.problem(f"missing {' & '.join(missing)}", branch_path)
+                continue
+            self.schema(branch["expected"], branch["optional"], branch_path)
+
+    def conditionals(
+        self,
+        expected: Sequence[Any],
+        keys: Dict[str, Dict[str, Any]],
+        path: Tuple[Any, ...],
+    ):
+        """
+        Check what conditional keys depend on & what can't be reached after them.
+
+        Args
+        ----
+            - expected (Sequence[Any]): Expected keys.
+            - keys (Dict[str, Dict[str, Any]]): Well formed keys by name, expected keys
+                                                with their definition.
+            - path (Tuple[Any, ...]): Path of the expected keys.
+        """
+        after = None
+        for key in expected:
+            if not isinstance(key, dict) or not isinstance(key.get("param_name"), str):
+                continue
+            deep = (
+                "possible_values" in key
+                or not constraints.CONSTRAINT_FIELDS.isdisjoint(key)
+                or (
+                    key.get("param_type") == dict
+                    and ("expected" in key or "conditional" in key)
+                )
+            )
+            if after is not None and deep:
+                self.problem(
+                    f"checks after conditional key {after} are never run",
+                    path + (key["param_name"],),
+                    False,
+                )
+            conditional = key.get("conditional")
+            if key.get("param_type") != dict or not isinstance(conditional, dict):
+                continue
+            if after is None:
+                after = key["param_name"]
+            self.depends_on(
+                conditional, keys, path + (key["param_name"], "conditional")
+            )
+
+    def depends_on(
+        self,
+        conditional: Dict[str, Any],
+        keys: Dict[str, Dict[str, Any]],
+        path: Tuple[Any, ...],
+    ):
+        """
+        Check the key a conditional block depends on & the branches it can select.
+
+        Args
+        ----
+            - conditional (Dict[str, Any]): Conditional block.
+            - keys (Dict[str, Dict[str, Any]]): Well formed sibling keys by name.
+            - path (Tuple[Any, ...]): Path of the block.
+        """
+        depends_on = conditional.get("depends_on")
+        info = conditional.get("dependence_info")
+        if not isinstance(depends_on, str) or not isinstance(info, dict):
+            return
+        sibling = keys.get(depends_on)
+        if not sibling:
+            # missing or optional, objects without it would select no branch
+            self.problem(f"depends_on is not an expected key: {depends_on}", path)
+            return
+        possible = sibling.get("possible_values")
+        if not isinstance(possible, (list, tuple, set, frozenset)):
+            possible = None
+        for value in info:
+            if not _allows_type(value, sibling["param_type"]) or (
+                possible is not None and value not in possible
+            ):
+                self.problem(
+                    f"unreachable branch, {depends_on} can't be: {value!r}",
+                    path + ("dependence_info", value),
+                    False,
+                )
+
+
+def schema_problems(
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+) -> List[SchemaError]:
+    """
+    List the problems of a schema, fatal or not.
+
+    Args
+    ----
+        - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                     objects describing the required
+                                                     parameters of a JSON object
+        - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                     & names of each JSON parameter that
+                                                     may or may not be in the JSON object
+
+    Returns
+    -------
+        - List[SchemaError]: Problems, in schema order.
+    """
+    checker = _Checker()
+    checker.schema(expected, optional)
+    return checker.problems
+
+
+def check_schema(
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+    strict: bool = False,
+):
+    """
+    Check a schema, logging checks that can never run & raising on fatal problems.
+
+    Args
+    ----
+        - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                     objects describing the required
+                                                     parameters of a JSON object
+        - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                     & names of each JSON parameter that
+                                                     may or may not be in the JSON object
+        - strict (bool): Raise on checks that can never run too.
+
+    Raises
+    ------
+        - SchemaError: The first fatal (or with `strict` any) problem of the schema.
+    """
+    for problem in schema_problems(expected, optional):
+        if problem.fatal or strict:
+            raise problem
+        logger.warning("schema problem: %s", problem)
@@ -0,0 +1,315 @@
+"""
+Validate line-delimited JSON in parallel processes over shared memory.
+
+The raw NDJSON bytes are copied into a `multiprocessing.shared_memory` block once. The
+block is split into line aligned slices & each worker process attaches to it by name,
+decodes & validates (column by column, see `jval.batch`) the lines of its slice straight
+from shared memory & writes one result byte per line into a second shared block. Only
+the block names, slice bounds & schema are sent to the workers & nothing but the slice
+sizes comes back, so no objects are pickled in either direction.
+
+Workers can also be threads, which validate slices of the buffer directly (only worth
+it on free-threaded builds), or subinterpreters (Python 3.14+), which like processes
+attach to the shared memory & hold their own compiled copy of the schema, without the
+cost of starting processes.
+
+Functions:
+
+    - available_backends: List the parallel backends the interpreter supports.
+    - validate_ndjson: Validate every line of an NDJSON buffer, optionally in parallel.
+"""
+
+import codecs
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+from jval.batch import validate_batch
+from jval.common import SLICES_PER_PROCESS, STREAM_CHUNK_SIZE
+from jval.prewarm import compiled
+from jval.router import Router
+
+try:  # pragma: no cover - depends on the interpreter
+    # pylint: disable-next=ungrouped-imports
+    from concurrent.futures import InterpreterPoolExecutor  # type: ignore
+except ImportError:  # pragma: no cover
+    InterpreterPoolExecutor = None
+
+logger = logging.getLogger(__name__)
+
+# workers the lines can be validated in
+BACKENDS = ("thread", "process", "interpreter")
+# result bytes
+_INVALID, _VALID, _BLANK = 0, 1, 2
+
+
+def _validate_lines(
+    view: memoryview, results: memoryview, first_line: int, schema: Any
+) -> int:
+    """
+    Validate the lines of a line aligned slice, writing one result byte per line.
+
+    Args
+    ----
+        - view (memoryview): UTF-8 encoded lines.
+        - results (memoryview): Result bytes of the whole buffer.
+        - first_line (int): Index of the slice's first line in the whole buffer.
+        - schema (Any): (expected, optional) pair, or Router selecting the schema of
+                        each line.
+
+    Returns
+    -------
+        - int: Number of lines in the slice.
+    """
+    text, _ = codecs.utf_8_decode(view, "strict", True)
+    lines = text.split("\n")
+    if lines and not lines[-1]:
+        # the slice ends with a newline
+        lines.pop()
+    jobjs = []
+    positions = []
+    for index, line in enumerate(lines):
+        position = first_line + index
+        if not line.strip():
+            results[position] = _BLANK
+            continue
+        try:
+            jobjs.append(json.loads(line))
+        except ValueError as err:
+            logger.error("invalid JSON on line: %s, %s", position + 1, err)
+            results[position] = _INVALID
+            continue
+        positions.append(position)
+    if isinstance(schema, Router):
+        validated = schema.validate_batch(jobjs)
+    else:
+        validated = validate_batch(jobjs, compiled(*schema))
+    for position, result in zip(positions, validated):
+        results[position] = _VALID if result else _INVALID
+    return len(lines)
+
+
+def _validate_slice(
+    data_name: str, results_name: str, bounds: Tuple[int, int, int], schema: Any
+) -> int:
+    """
+    Validate one slice of the shared buffer in a worker process.
+
+    Args
+    ----
+        - data_name (str): Name of the shared block holding the NDJSON bytes.
+        - results_name (str): Name of the shared block holding the result bytes.
+        - bounds (Tuple[int, int, int]): Offset of the slice, offset right after it &
+                                         index of its first line.
+        - schema (Any): (expected, optional) pair, or Router selecting the schema of
+                        each line.
+
+    Returns
+    -------
+        - int: Number of lines in the slice.
+    """
+    start, end, first_line = bounds
+    data = SharedMemory(data_name)
+    results = SharedMemory(results_name)
+    try:
+        with data.buf[start:end] as view:
+            return _validate_lines(view, results.buf, first_line, schema)
+    finally:
+        data.close()
+        results.close()
+
+
+def _line_end(view: memoryview, position: int) -> int:
+    """
+    Find the end of the line a position falls into.
+
+    Args
+    ----
+        - view (memoryview): UTF-8 encoded lines.
+        - position (int): Offset to start looking at.
+
+    Returns
+    -------
+        - int: Offset right after the next newline, the size of the buffer if none.
+    """
+    while position < len(view):
+        window = bytes(view[position : position + STREAM_CHUNK_SIZE])
+        newline = window.find(b"\n")
+        if newline >= 0:
+            return position + newline + 1
+        position += len(window)
+    return len(view)
+
+
+def _count_lines(view: memoryview, start: int, end: int) -> int:
+    """
+    Count the newlines in a range of a buffer.
+
+    Args
+    ----
+        - view (memoryview): UTF-8 encoded lines.
+        - start (int): Offset of the range.
+        - end (int): Offset right after the range.
+
+    Returns
+    -------
+        - int: Number of newlines.
+    """
+    return sum(
+        bytes(view[position : min(end, position + STREAM_CHUNK_SIZE)]).count(b"\n")
+        for position in range(start, end, STREAM_CHUNK_SIZE)
+    )
+
+
+def _slices(view: memoryview, count: int) -> List[Tuple[int, int, int]]:
+    """
+    Split a buffer into line aligned slices of about the same size.
+
+    Args
+    ----
+        - view (memoryview): UTF-8 encoded lines.
+        - count (int): Number of slices wanted.
+
+    Returns
+    -------
+        - List[Tuple[int, int, int]]: (start, end, first line) of each non empty slice.
+    """
+    slices = []
+    start = 0
+    first_line = 0
+    for index in range(1, count + 1):
+        end = len(view)
+        if index < count:
+            end = _line_end(view, len(view) * index // count)
+        if end <= start:
+            continue
+        slices.append((start, end, first_line))
+        first_line += _count_lines(view, start, end)
+        start = end
+    return slices
+
+
+def available_backends() -> Tuple[str, ...]:
+    """
+    List the parallel backends the running interpreter supports.
+
+    Returns
+    -------
+        - Tuple[str, ...]: Some of "thread", "process" & "interpreter".
+    """
+    if InterpreterPoolExecutor is None:
+        return BACKENDS[:2]
+    return BACKENDS
+
+
+def _validate_shared(
+    view: memoryview, lines: int, schema: Any, workers: int, executor: Any
+) -> bytearray:
+    """
+    Validate the lines of a buffer in workers that share it through shared memory.
+
+    Args
+    ----
+        - view (memoryview): UTF-8 encoded lines.
+        - lines (int): Number of lines.
+        - schema (Any): (expected, optional) pair, or Router selecting the schema of
+                        each line.
+        - workers (int): Number of worker processes / interpreters.
+        - executor (Any): Executor class running the workers.
+
+    Returns
+    -------
+        - bytearray: One result byte per line.
+    """
+    size = len(view)
+    data = SharedMemory(create=True, size=max(size, 1))
+    shared = SharedMemory(create=True, size=max(lines, 1))
+    try:
+        data.buf[:size] = view
+        with executor(workers) as pool:
+            futures = [
+                pool.submit(_validate_slice, data.name, shared.name, bounds, schema)
+                for bounds in _slices(view, workers * SLICES_PER_PROCESS)
+            ]
+            for future in futures:
+                future.result()
+        return bytearray(shared.buf[:lines])
+    finally:
+        data.close()
+        data.unlink()
+        shared.close()
+        shared.unlink()
+
+
+def validate_ndjson(  # pylint: disable=too-many-arguments
+    buffer: Any,
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+    processes: Optional[int] = None,
+    backend: str = "process",
+    router: Optional[Router] = None,
+) -> List[Tuple[int, bool]]:
+    """
+    Validate every line of a line-delimited JSON buffer against a schema.
+
+    Args
+    ----
+        - buffer (Any): bytes, bytearray, memoryview or mmap holding UTF-8 encoded NDJSON.
+        - expected (Optional[List[Dict[str, Any]]]): Expected keys of the schema.
+        - optional (Optional[List[Dict[str, Any]]]): Optional keys of the schema.
+        - processes (Optional[int]): Number of workers, lines are validated in the
+                                     calling thread if not greater than 1.
+        - backend (str): What the workers are, "thread", "process" or "interpreter"
+                         (subinterpreters, Python 3.14+).
+        - router (Optional[Router]): Validate each line against the schema its
+                                     discriminator selects instead, sent to process
+                                     & interpreter workers along with its schemas.
+
+    Returns
+    -------
+        - List[Tuple[int, bool]]: (line number, result) for every non blank line, line
+                                  numbers start at 1.
+    """
+    if backend not in available_backends():
+        raise ValueError(
+            f"unsupported backend: {backend}, available: {available_backends()}"
+        )
+    schema = router if router is not None else (expected, optional)
+    view = memoryview(buffer).cast("B")
+    size = len(view)
+    lines = _count_lines(view, 0, size) + (1 if size and view[-1] != ord("\n") else 0)
+    results = bytearray(lines)
+    if not processes or processes <= 1:
+        _validate_lines(view, memoryview(results), 0, schema)
+    elif backend == "thread":
+        # threads validate slices of the buffer itself, nothing has to be shared
+        with ThreadPoolExecutor(processes) as pool:
+            futures = [
+                pool.submit(
+                    _validate_lines,
+                    view[start:end],
+                    memoryview(results),
+                    first_line,
+                    schema,
+                )
+                for start, end, first_line in _slices(
+                    view, processes * SLICES_PER_PROCESS
+                )
+            ]
+            for future in futures:
+                future.result()
+    else:
+        results = _validate_shared(
+            view,
+            lines,
+            schema,
+            processes,
+            ProcessPoolExecutor if backend == "process" else InterpreterPoolExecutor,
+        )
+    return [
+        (index, result == _VALID)
+        for index, result in enumerate(results, start=1)
+        if result != _BLANK
+    ]
@@ -0,0 +1,108 @@
+"""
+Overlap file reads with validation.
+
+Files are read by a pool of threads (reads release the GIL, so on network filesystems
+many can wait on I/O at once) while the calling thread decodes & validates whatever has
+already arrived. The number of reads in flight is bounded, so at most that many file
+contents are held in memory no matter how many paths are given. Every call shares one
+lazily created pool, which only grows when a call asks for more threads than it has.
+
+Functions:
+
+    - prefetch: Read files ahead in a thread pool, yielding them as they arrive.
+"""
+
+import os
+import threading
+from concurrent import futures
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from jval.common import FETCH_THREADS
+
+# pool shared by every call & its number of threads
+_POOL: Optional[Tuple[futures.ThreadPoolExecutor, int]] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool(threads: int) -> futures.ThreadPoolExecutor:
+    """
+    Get the shared reader pool, creating it (or a larger one) on demand.
+
+    A replaced pool is only dropped, calls still using it keep it alive & its threads
+    exit once it's collected.
+
+    Args
+    ----
+        - threads (int): Number of threads the pool needs at least.
+
+    Returns
+    -------
+        - ThreadPoolExecutor: The shared pool.
+    """
+    global _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        if _POOL is None or _POOL[1] < threads:
+            _POOL = (
+                futures.ThreadPoolExecutor(threads, thread_name_prefix="jval-prefetch"),
+                threads,
+            )
+        return _POOL[0]
+
+
+def _forget_pool():
+    """
+    Forget the shared pool in a forked child, its threads don't survive the fork.
+    """
+    global _POOL  # pylint: disable=global-statement
+    _POOL = None
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no cover - depends on the platform
+    os.register_at_fork(after_in_child=_forget_pool)
+
+
+def prefetch(
+    paths: Iterable[str],
+    read: Callable[[str], Any],
+    threads: int = FETCH_THREADS,
+    read_ahead: Optional[int] = None,
+) -> Iterator[Tuple[str, "futures.Future[Any]"]]:
+    """
+    Read files ahead in a thread pool, yielding them in the order reads complete.
+
+    Args
+    ----
+        - paths (Iterable[str]): Paths of the files, consumed lazily.
+        - read (Callable[[str], Any]): Reads a file, called in the pool's threads.
+        - threads (int): Number of reader threads.
+        - read_ahead (Optional[int]): Maximum number of reads in flight or completed &
+                                      not yet consumed, defaults to twice the threads.
+
+    Returns
+    -------
+        - Iterator[Tuple[str, Future[Any]]]: (path, completed read) as reads complete,
+                                             `result()` raises if the read failed.
+    """
+    read_ahead = read_ahead or 2 * threads
+    paths = iter(paths)
+    pending: Dict["futures.Future[Any]", str] = {}
+    pool = _pool(threads)
+    try:
+        while True:
+            # the pool is shared, so this call keeps at most `threads` reads running
+            running = sum(not future.done() for future in pending)
+            if len(pending) < read_ahead and running < threads:
+                for path in paths:
+                    pending[pool.submit(read, path)] = path
+                    running += 1
+                    if len(pending) >= read_ahead or running >= threads:
+                        break
+            if not pending:
+                return
+            done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future
+    finally:
+        # stop reading ahead if the consumer stops early
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,168 @@
+"""
+Process-wide cache of compiled schemas & fork-friendly prewarming.
+
+Every API that works from a compiled schema looks it up here by the schema's fingerprint,
+so a schema is compiled once per process rather than once per call. Schemas can be
+prewarmed: compiled in a parent process (e.g. a gunicorn / celery master), conditional
+branches included, before it forks its workers & then moved out of the garbage
+collector's reach with `gc.freeze()`. GC passes in the workers then never touch (& so
+never write to) the compiled schemas, which stay shared copy-on-write with the parent at
+no per-worker cost.
+
+Lookups are keyed by the fingerprint of the schema's contents, never by the identity of
+its lists, so a schema modified in place is compiled anew rather than answered with the
+compiled form of what it used to be, & the cache holds no reference to callers' lists.
+
+Lookups take no lock: compiled schemas are never modified once built (lazily compiled
+conditional branches are only ever added), so any number of threads can share them, &
+threads racing to compile the same schema or branch agree on one copy.
+
+Schemas are prewarmed at import when the `JVAL_PREWARM` environment variable names them
+as a comma separated list of `module:attribute` references. Each attribute is a mapping
+of names to (expected, optional) pairs, an iterable of such pairs, or a callable
+returning either. References that can't be imported & malformed schemas are logged &
+skipped, so a bad entry never makes importing jval fail.
+
+Functions:
+
+    - compiled: Get the compiled form of a schema, compiling it on first use.
+    - prewarm: Compile schemas & freeze them out of the garbage collector.
+    - prewarm_from_env: Prewarm the schemas named by the JVAL_PREWARM variable.
+"""
+
+import gc
+import importlib
+import logging
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional
+
+from jval.common import COMPILED_MAX_ENTRIES, PREWARM_ENV
+from jval.schema import CompiledSchema, compile_schema, fingerprint
+from jval.stats import STATS
+
+logger = logging.getLogger(__name__)
+
+# fingerprint -> compiled schema, prewarmed schemas are never evicted
+_PREWARMED: Dict[str, CompiledSchema] = {}
+_COMPILED: Dict[str, CompiledSchema] = {}
+
+
+def _evict(cache: Dict[Any, Any]):
+    """
+    Drop the oldest entry of a full cache, another thread may be doing the same.
+
+    Args
+    ----
+        - cache (Dict[Any, Any]): Cache to make room in.
+    """
+    if len(cache) >= COMPILED_MAX_ENTRIES:
+        try:
+            cache.pop(next(iter(cache)), None)
+        except (StopIteration, RuntimeError):
+            pass
+
+
+def compiled(
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+) -> CompiledSchema:
+    """
+    Get the compiled form of a schema, compiling it on first use.
+
+    Args
+    ----
+        - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                     objects describing the required
+                                                     parameters of a JSON object
+        - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                     & names of each JSON parameter that
+                                                     may or may not be in the JSON object
+
+    Returns
+    -------
+        - CompiledSchema: Compiled schema, shared by every caller in the process.
+    """
+    key = fingerprint(expected, optional)
+    schema = _PREWARMED.get(key) or _COMPILED.get(key)
+    if schema is not None:
+        STATS.incr("compiled_hits")
+        return schema
+    STATS.incr("compiled_misses")
+    _evict(_COMPILED)
+    # threads compiling the same schema concurrently all get the first one stored
+    return _COMPILED.setdefault(key, compile_schema(expected, optional))
+
+
+def prewarm(schemas: Any, freeze: bool = True) -> int:
+    """
+    Compile schemas ahead of time, typically in a parent process before forking.
+
+    Args
+    ----
+        - schemas (Any): Mapping of names to (expected, optional) pairs or an iterable of
+                         (expected, optional) pairs.
+        - freeze (bool): Move every object tracked by the garbage collector, compiled
+                         schemas included, into its permanent generation with
+                         `gc.freeze()`.
+
+    Returns
+    -------
+        - int: Number of schemas compiled.
+    """
+    pairs: Iterable[Any] = schemas.values() if isinstance(schemas, Mapping) else schemas
+    count = 0
+    for expected, optional in pairs:
+        key = fingerprint(expected, optional)
+        if key not in _PREWARMED:
+            schema = _COMPILED.pop(key, None) or compile_schema(expected, optional)
+            # branches are otherwise compiled lazily, after the fork
+            _PREWARMED[key] = schema.expand()
+            count += 1
+    if freeze:
+        # collect first so garbage isn't frozen along with the schemas
+        gc.collect()
+        gc.freeze()
+    return count
+
+
+def prewarm_from_env(variable: str = PREWARM_ENV) -> int:
+    """
+    Prewarm the schemas named by an environment variable, skipping (& logging)
+    references that can't be imported & malformed schemas.
+
+    Args
+    ----
+        - variable (str): Name of the variable holding comma separated `module:attribute`
+                          references.
+
+    Returns
+    -------
+        - int: Number of schemas compiled.
+    """
+    references = [
+        reference.strip()
+        for reference in os.environ.get(variable, "").split(",")
+        if reference.strip()
+    ]
+    count = 0
+    for reference in references:
+        module_name, _, attribute = reference.partition(":")
+        try:
+            schemas = getattr(importlib.import_module(module_name), attribute)
+        except (ImportError, AttributeError, ValueError) as err:
+            logger.error("invalid schema reference: %s, %s", reference, err)
+            continue
+        if callable(schemas):
+            schemas = schemas()
+        pairs = schemas.values() if isinstance(schemas, Mapping) else schemas
+        for pair in pairs:
+            try:
+                count += prewarm([pair], freeze=False)
+            except (TypeError, ValueError) as err:
+                # malformed schemas (SchemaError is a ValueError) or non pairs
+                logger.error("invalid schema in: %s, %s", reference, err)
+    if count:
+        gc.collect()
+        gc.freeze()
+    return count
@@ -0,0 +1,516 @@
+"""
+Named, versioned schemas compiled on first use.
+
+A `SchemaRegistry` stores schema definitions by (name, version) so call sites only need
+a name. Definitions are compiled lazily, the first time they're used, & compiled schemas
+are kept within an entry and / or memory budget by evicting the least recently used.
+Definitions can be loaded & hot-reloaded from a directory of JSON files named
+`<name>@<version>.json`, holding `{"expected": [...], "optional": [...]}` with
+`param_type`s spelled as names ("str", "int", "float", "bool", "dict", "list", "null"
+or a list of those). Definitions are checked (see `jval.metaschema`) as they're
+registered or loaded, malformed ones are rejected.
+
+Lookups take no lock. Reloads build a new table of definitions & swap it in, so
+validations in flight keep the compiled schema they already hold & never wait on a
+reload.
+
+Functions:
+
+    - load_definition: Load a schema definition from a JSON file.
+
+Classes:
+
+    - SchemaRegistry: Versioned schema store with lazy compilation & LRU eviction.
+"""
+
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jval.common import EVICT_TO, TYPE_NAMES
+from jval.metaschema import check_schema
+from jval.schema import CompiledSchema, compile_schema, memory_size
+from jval.stats import Counters
+
+logger = logging.getLogger(__name__)
+
+# (expected, optional)
+Definition = Tuple[Optional[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]
+
+
+def _version_key(version: str) -> Tuple[Any, ...]:
+    """
+    Sort key ordering versions naturally, e.g. "2" before "10".
+
+    Args
+    ----
+        - version (str): Version.
+
+    Returns
+    -------
+        - Tuple[Any, ...]: Sort key.
+    """
+    return tuple(
+        (0, int(part)) if part.isdigit() else (1, part)
+        for part in re.split(r"(\d+)", version)
+        if part
+    )
+
+
+def _resolve_types(
+    keys: Optional[List[Dict[str, Any]]]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Replace the type names of a schema loaded from JSON by the types they name.
+
+    Args
+    ----
+        - keys (Optional[List[Dict[str, Any]]]): Keys of a schema.
+
+    Returns
+    -------
+        - Optional[List[Dict[str, Any]]]: Keys with `param_type`s resolved.
+    """
+    if keys is None:
+        return None
+    resolved = []
+    for key in keys:
+        key = dict(key)
+        param_type = key["param_type"]
+        if isinstance(param_type, list):
+            key["param_type"] = tuple(TYPE_NAMES[name] for name in param_type)
+        else:
+            key["param_type"] = TYPE_NAMES[param_type]
+        for nested in ("expected", "optional"):
+            if nested in key:
+                key[nested] = _resolve_types(key[nested])
+        if "conditional" in key:
+            conditional = dict(key["conditional"])
+            conditional["dependence_info"] = {
+                value: {
+                    "expected": _resolve_types(info.get("expected")),
+                    "optional": _resolve_types(info.get("optional")),
+                }
+                for value, info in conditional["dependence_info"].items()
+            }
+            key["conditional"] = conditional
+        resolved.append(key)
+    return resolved
+
+
+def load_definition(path: str) -> Definition:
+    """
+    Load a schema definition from a JSON file.
+
+    Args
+    ----
+        - path (str): Path to the file.
+
+    Returns
+    -------
+        - Definition: (expected, optional) keys of the schema.
+
+    Raises
+    ------
+        - ValueError: If the file isn't a valid definition.
+    """
+    with open(path, encoding="utf-8") as sfile:
+        definition = json.load(sfile)
+    try:
+        return (
+            _resolve_types(definition.get("expected")),
+            _resolve_types(definition.get("optional")),
+        )
+    except (AttributeError, KeyError, TypeError) as err:
+        raise ValueError(f"invalid schema definition: {path}, {err!r}") from err
+
+
+def _scan(directory: str) -> Dict[str, Tuple[int, int, Tuple[str, str]]]:
+    """
+    List the definition files of a directory.
+
+    Args
+    ----
+        - directory (str): Directory of `<name>@<version>.json` files.
+
+    Returns
+    -------
+        - Dict[str, Tuple[int, int, Tuple[str, str]]]: Map of path to (mtime_ns, size,
+                                                       (name, version)).
+    """
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            stem, _, suffix = entry.name.rpartition(".")
+            name, _, version = stem.rpartition("@")
+            if suffix != "json" or not name or not entry.is_file():
+                continue
+            stat = entry.stat()
+            files[entry.path] = (stat.st_mtime_ns, stat.st_size, (name, version))
+    return files
+
+
+class _CompiledCache:
+    """
+    Compiled schemas kept within an entry and / or memory budget, evicting the least
+    recently used.
+    """
+
+    def __init__(
+        self, max_entries: Optional[int], max_bytes: Optional[int], stats: Counters
+    ):
+        """
+        Create an empty cache.
+
+        Args
+        ----
+            - max_entries (Optional[int]): Maximum number of compiled schemas kept.
+            - max_bytes (Optional[int]): Maximum (estimated) memory of the compiled
+                                         schemas kept.
+            - stats (Counters): Counters evictions are counted in.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = stats
+        # (name, version) -> [compiled schema, size, last use]
+        self.entries: Dict[Tuple[str, str], List[Any]] = {}
+        self.bytes = 0
+        self.clock = itertools.count()
+
+    def get(self, key: Tuple[str, str]) -> Optional[CompiledSchema]:
+        """
+        Get a compiled schema, marking it as used.
+
+        Args
+        ----
+            - key (Tuple[str, str]): (name, version) of the schema.
+
+        Returns
+        -------
+            - Optional[CompiledSchema]: Compiled schema, None if it isn't cached.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        entry[2] = next(self.clock)
+        return entry[0]
+
+    def size(self, schema: CompiledSchema) -> int:
+        """
+        Estimate the memory a compiled schema counts against the budget.
+
+        Args
+        ----
+            - schema (CompiledSchema): Compiled schema.
+
+        Returns
+        -------
+            - int: Size in bytes, 0 if there's no memory budget.
+        """
+        return memory_size([schema]) if self.max_bytes is not None else 0
+
+    def put(self, key: Tuple[str, str], schema: CompiledSchema, size: int):
+        """
+        Cache a compiled schema, evicting others if the budget is exceeded.
+
+        Args
+        ----
+            - key (Tuple[str, str]): (name, version) of the schema.
+            - schema (CompiledSchema): Compiled schema.
+            - size (int): Size of the schema (see `size`).
+        """
+        self.entries[key] = [schema, size, next(self.clock)]
+        self.bytes += size
+        self._evict()
+
+    def discard(self, key: Tuple[str, str]):
+        """
+        Drop a compiled schema if it's cached.
+
+        Args
+        ----
+            - key (Tuple[str, str]): (name, version) of the schema.
+        """
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _over_budget(self, fraction: float = 1.0) -> bool:
+        """
+        Check if the compiled schemas exceed a fraction of the budget.
+
+        Args
+        ----
+            - fraction (float): Fraction of the budget.
+
+        Returns
+        -------
+            - bool: True if over the budget, False otherwise.
+        """
+        return (
+            self.max_entries is not None
+            and len(self.entries) > self.max_entries * fraction
+        ) or (self.max_bytes is not None and self.bytes > self.max_bytes * fraction)
+
+    def _evict(self):
+        """
+        Evict least recently used compiled schemas down to `EVICT_TO` of the budget once
+        the budget is exceeded, so evictions are batched.
+        """
+        if not self._over_budget():
+            return
+        for key in sorted(self.entries, key=lambda key: self.entries[key][2]):
+            if not self._over_budget(EVICT_TO):
+                break
+            self.discard(key)
+            self.stats.incr("evictions")
+
+
+class SchemaRegistry:
+    """
+    Versioned schema store with lazy compilation & least recently used eviction.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Create a registry, loading the definitions of a directory if one is given.
+
+        Args
+        ----
+            - directory (Optional[str]): Directory of `<name>@<version>.json` files.
+            - max_entries (Optional[int]): Maximum number of compiled schemas kept.
+            - max_bytes (Optional[int]): Maximum (estimated) memory of the compiled
+                                         schemas kept.
+        """
+        self.directory = directory
+        self.stats = Counters()
+        # (name, version) -> definition, replaced as a whole on every change
+        self._definitions: Dict[Tuple[str, str], Definition] = {}
+        # name -> versions, oldest first
+        self._versions: Dict[str, List[str]] = {}
+        self._compiled = _CompiledCache(max_entries, max_bytes, self.stats)
+        self._lock = threading.Lock()
+        # path -> (mtime_ns, size, (name, version)) of the loaded files
+        self._files: Dict[str, Tuple[int, int, Tuple[str, str]]] = {}
+        if directory is not None:
+            self.reload()
+
+    def _publish(self, definitions: Dict[Tuple[str, str], Definition]):
+        """
+        Swap in a new table of definitions, dropping stale compiled schemas.
+
+        Args
+        ----
+            - definitions (Dict[Tuple[str, str], Definition]): All definitions.
+        """
+        versions: Dict[str, List[str]] = {}
+        for name, version in definitions:
+            versions.setdefault(name, []).append(version)
+        for names in versions.values():
+            names.sort(key=_version_key)
+        stale = [
+            key
+            for key in self._compiled.entries
+            if self._definitions.get(key) is not definitions.get(key)
+        ]
+        self._definitions = definitions
+        self._versions = versions
+        for key in stale:
+            self._compiled.discard(key)
+
+    def register(
+        self,
+        name: str,
+        version: str,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """
+        Add or replace a schema definition.
+
+        Args
+        ----
+            - name (str): Schema name.
+            - version (str): Schema version.
+            - expected (Optional[List[Dict[str, Any]]]): Expected keys.
+            - optional (Optional[List[Dict[str, Any]]]): Optional keys.
+
+        Raises
+        ------
+            - SchemaError: If the schema is malformed.
+        """
+        check_schema(expected, optional)
+        with self._lock:
+            definitions = dict(self._definitions)
+            definitions[(name, str(version))] = (expected, optional)
+            self._publish(definitions)
+
+    def unregister(self, name: str, version: str):
+        """
+        Remove a schema definition.
+
+        Args
+        ----
+            - name (str): Schema name.
+            - version (str): Schema version.
+        """
+        with self._lock:
+            definitions = dict(self._definitions)
+            definitions.pop((name, str(version)), None)
+            self._publish(definitions)
+
+    def versions(self, name: str) -> List[str]:
+        """
+        List the versions of a schema.
+
+        Args
+        ----
+            - name (str): Schema name.
+
+        Returns
+        -------
+            - List[str]: Versions, oldest first.
+        """
+        return list(self._versions.get(name, ()))
+
+    def get(self, name: str, version: Optional[str] = None) -> CompiledSchema:
+        """
+        Get a compiled schema, compiling it on first use.
+
+        Args
+        ----
+            - name (str): Schema name.
+            - version (Optional[str]): Schema version, defaults to the latest.
+
+        Returns
+        -------
+            - CompiledSchema: Compiled schema.
+
+        Raises
+        ------
+            - KeyError: If there's no such schema.
+        """
+        if version is None:
+            versions = self._versions.get(name)
+            if not versions:
+                raise KeyError(name)
+            version = versions[-1]
+        key = (name, str(version))
+        cached = self._compiled.get(key)
+        if cached is not None:
+            self.stats.incr("hits")
+            return cached
+        definition = self._definitions[key]
+        self.stats.incr("misses")
+        schema = compile_schema(*definition)
+        size = self._compiled.size(schema)
+        with self._lock:
+            if self._definitions.get(key) is not definition:
+                # replaced while compiling, don't cache the stale schema
+                return schema
+            cached = self._compiled.get(key)
+            if cached is not None:
+                return cached
+            self._compiled.put(key, schema, size)
+        return schema
+
+    def validate(
+        self, jobj: Dict[str, Any], name: str, version: Optional[str] = None
+    ) -> bool:
+        """
+        Validate a JSON object against a registered schema.
+
+        Args
+        ----
+            - jobj (Dict[str, Any]): JSON object to validate.
+            - name (str): Schema name.
+            - version (Optional[str]): Schema version, defaults to the latest.
+
+        Returns
+        -------
+            - bool: True if the JSON object satisfies the schema, False otherwise.
+        """
+        return self.get(name, version).validate(jobj)
+
+    def reload(self) -> int:
+        """
+        Reload the definitions of the directory whose files changed since the last load.
+
+        Definitions whose file can't be loaded keep their previous version.
+
+        Returns
+        -------
+            - int: Number of definitions added, changed or removed.
+        """
+        if self.directory is None:
+            return 0
+        with self._lock:
+            definitions = dict(self._definitions)
+            files = _scan(self.directory)
+            changed = 0
+            for path, state in files.items():
+                if self._files.get(path) == state:
+                    continue
+                try:
+                    definition = load_definition(path)
+                    check_schema(*definition)
+                except (OSError, ValueError) as err:
+                    logger.error("could not load schema: %s, %s", path, err)
+                    continue
+                definitions[state[2]] = definition
+                changed += 1
+            for path, (_, _, key) in self._files.items():
+                if path not in files:
+                    definitions.pop(key, None)
+                    changed += 1
+            self._files = files
+            if changed:
+                self._publish(definitions)
+        return changed
+
+    def watch(
+        self,
+        interval: float = 1.0,
+        callback: Optional[Callable[[int], Any]] = None,
+        stop: Optional[threading.Event] = None,
+    ):
+        """
+        Reload the directory until stopped, e.g. from a background thread.
+
+        Args
+        ----
+            - interval (float): Seconds to sleep between reloads.
+            - callback (Optional[Callable[[int], Any]]): Called with the number of
+                                                         changed definitions after
+                                                         every reload that changed any.
+            - stop (Optional[threading.Event]): Event that ends the loop once set.
+        """
+        stop = stop if stop is not None else threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            changed = self.reload()
+            if changed and callback is not None:
+                callback(changed)
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def __contains__(self, name: object) -> bool:
+        """
+        Check if a schema has any version registered.
+        """
+        return name in self._versions
+
+    def __len__(self) -> int:
+        """
+        Number of registered definitions.
+        """
+        return len(self._definitions)
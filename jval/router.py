@@ -0,0 +1,125 @@
+"""
+Validate mixed streams of objects, each against the schema its discriminator selects.
+
+A `Router` is the top-level counterpart of a conditional key: the value of one key of
+each object (the discriminator, e.g. "type") selects the schema the whole object is
+validated against. Schemas are compiled up front into a table keyed by discriminator
+value, so dispatching an object is a single dict lookup however many schemas there are.
+Selected schemas validate the whole object, the discriminator included, so they should
+list it like any other key (e.g. with its value as the only possible value).
+
+Batches are split into one sub-batch per discriminator value, each validated column by
+column (see `jval.batch`). Routers work with every API validating many objects: batches,
+buffers, NDJSON (in parallel workers too), arrays, archives & `fvalidate_many`.
+
+Classes:
+
+    - Router: Discriminator to schema dispatch table.
+"""
+
+import logging
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from jval.batch import validate_batch
+from jval.prewarm import compiled
+from jval.schema import CompiledSchema, fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class Router:
+    """
+    Dispatch table selecting a schema by the value of a discriminator key.
+    """
+
+    def __init__(self, discriminator: str, schemas: Mapping):
+        """
+        Compile the schema of every discriminator value.
+
+        Args
+        ----
+            - discriminator (str): Name of the key selecting the schema.
+            - schemas (Mapping): Map of discriminator value to (expected, optional)
+                                 pair or compiled schema.
+        """
+        self.discriminator = discriminator
+        self.table: Dict[Any, CompiledSchema] = {
+            value: schema if isinstance(schema, CompiledSchema) else compiled(*schema)
+            for value, schema in schemas.items()
+        }
+        # identifies the routing like a schema's fingerprint, e.g. in result caches
+        self.fingerprint = fingerprint(
+            [
+                {
+                    "discriminator": discriminator,
+                    "schemas": {
+                        value: list(schema.source)
+                        for value, schema in self.table.items()
+                    },
+                }
+            ]
+        )
+
+    def schema_for(self, jobj: Any) -> Optional[CompiledSchema]:
+        """
+        Get the schema an object is validated against.
+
+        Args
+        ----
+            - jobj (Any): JSON object.
+
+        Returns
+        -------
+            - Optional[CompiledSchema]: Selected schema, None if the object isn't a
+                                        Mapping or its discriminator selects none.
+        """
+        if not isinstance(jobj, Mapping):
+            logger.error("not an object: %s", type(jobj).__name__)
+            return None
+        value = jobj.get(self.discriminator)
+        try:
+            return self.table[value]
+        except (KeyError, TypeError):
+            logger.error("no schema for: %s, in param: %s", value, self.discriminator)
+            return None
+
+    def validate(self, jobj: Any) -> bool:
+        """
+        Validate an object against the schema its discriminator selects.
+
+        Args
+        ----
+            - jobj (Any): JSON object to validate.
+
+        Returns
+        -------
+            - bool: True if the object satisfies the selected schema, False if it
+                    doesn't or no schema is selected.
+        """
+        schema = self.schema_for(jobj)
+        return schema is not None and schema.validate(jobj)
+
+    def validate_batch(self, jobjs: Sequence[Any]) -> List[bool]:
+        """
+        Validate a batch of objects, one columnar sub-batch per selected schema.
+
+        Args
+        ----
+            - jobjs (Sequence[Any]): JSON objects to validate.
+
+        Returns
+        -------
+            - List[bool]: Result for each object, in batch order.
+        """
+        valid = [False] * len(jobjs)
+        groups: Dict[int, Tuple[CompiledSchema, List[int]]] = {}
+        for index, jobj in enumerate(jobjs):
+            schema = self.schema_for(jobj)
+            if schema is not None:
+                groups.setdefault(id(schema), (schema, []))[1].append(index)
+        for schema, indexes in groups.values():
+            results = validate_batch([jobjs[index] for index in indexes], schema)
+            for index, result in zip(indexes, results):
+                valid[index] = result
+        return valid
@@ -0,0 +1,742 @@
+"""
+Schema helpers shared by the validator and its caches.
+
+A schema can be compiled once into a tree of `CompiledSchema` nodes holding precomputed
+lookup tables (valid names, required names & types, possible value sets, nested &
+conditional sub-schemas). Compiled schemas give the same results as `JVal.validate`,
+including the order checks are performed in, and are what the streaming & early-reject
+engines walk.
+
+Conditional branches are compiled lazily, the first time an object selects them, so
+`dependence_info` tables with hundreds of rarely used branches cost next to nothing
+until they're used. Each conditional key counts how often each of its branches is
+selected (see `CompiledSchema.branch_stats`).
+
+Nested schemas are hash-consed: identical nested `expected` / `optional` lists &
+conditional branches, within a schema or across schemas, compile to one shared node.
+The number of nodes shared & the memory that saved (estimated with `memory_size`) are
+counted in `jval.stats.STATS` as "interned_nodes" & "interned_bytes".
+Branch counts live on the node, so the counts of a shared node are the total over
+every schema & parent key sharing it, not per path.
+
+Functions:
+
+    - fingerprint: Compute a stable fingerprint of an expected / optional schema.
+    - compile_schema: Compile an expected / optional schema.
+    - memory_size: Estimate the memory held by compiled schemas.
+
+Classes:
+
+    - CompiledSchema: Compiled (nested) schema.
+"""
+
+import hashlib
+import json
+import logging
+import sys
+import threading
+import weakref
+from collections.abc import Iterator, Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from jval.constraints import Constraints, compile_constraints
+from jval.metaschema import check_schema
+from jval.stats import STATS, Counters
+
+logger = logging.getLogger(__name__)
+
+# hashable form of a nested schema -> its compiled node, while any schema uses it
+_NODES: "weakref.WeakValueDictionary[Any, CompiledSchema]" = (
+    weakref.WeakValueDictionary()
+)
+_NODES_LOCK = threading.Lock()
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Convert a schema (or part of one) into a JSON serialisable canonical form.
+
+    Types are replaced by their qualified names & mapping keys by their repr so that
+    non-string `dependence_info` values sort deterministically.
+
+    Args
+    ----
+        - value (Any): Schema, key or value to convert.
+
+    Returns
+    -------
+        - Any: JSON serialisable representation of the value.
+    """
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, dict):
+        return {repr(key): _canonical(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(val) for val in value]
+    return value
+
+
+def _widen(param_type: Any) -> Any:
+    """
+    Widen a `param_type` so that any mapping is accepted where a dict is expected.
+
+    Args
+    ----
+        - param_type (Any): Type or tuple of types from the schema.
+
+    Returns
+    -------
+        - Any: The type (tuple) to check values against.
+    """
+    if param_type is dict:
+        return (dict, Mapping)
+    if isinstance(param_type, tuple) and dict in param_type:
+        return param_type + (Mapping,)
+    return param_type
+
+
+def fingerprint(
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """
+    Compute a stable fingerprint of a schema.
+
+    Two schemas have the same fingerprint if and only if they describe the same keys,
+    types, possible values & nested schemas, so it can be used to key cached results.
+
+    Args
+    ----
+        - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                     objects describing the required
+                                                     parameters of a JSON object
+        - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                     & names of each JSON parameter that
+                                                     may or may not be in the JSON object
+
+    Returns
+    -------
+        - str: Hex digest identifying the schema.
+    """
+    canonical = json.dumps(
+        [_canonical(expected), _canonical(optional)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=repr,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _frozen(value: Any) -> Any:
+    """
+    Convert a schema (or part of one) into a hashable form, equal for equal schemas.
+
+    Unlike `_canonical`, types are kept as they are so that distinct types with the same
+    name never compare equal.
+
+    Args
+    ----
+        - value (Any): Schema, key or value to convert.
+
+    Returns
+    -------
+        - Any: Hashable representation of the value.
+    """
+    if isinstance(value, dict):
+        return (dict, frozenset((key, _frozen(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_frozen(val) for val in value))
+    try:
+        hash(value)
+    except TypeError:
+        # only ever equal to itself
+        return (id, id(value))
+    return value
+
+
+def _node(
+    mode: str,
+    expected: Optional[List[Dict[str, Any]]],
+    optional: Optional[List[Dict[str, Any]]],
+) -> "CompiledSchema":
+    """
+    Compile a nested schema, sharing the node of an identical one if there is one.
+
+    Args
+    ----
+        - mode (str): One of "validate", "expected" or "optional".
+        - expected (Optional[List[Dict[str, Any]]]): Expected keys.
+        - optional (Optional[List[Dict[str, Any]]]): Optional keys.
+
+    Returns
+    -------
+        - CompiledSchema: Compiled node.
+    """
+    key = (mode, _frozen(expected), _frozen(optional))
+    with _NODES_LOCK:
+        node = _NODES.get(key)
+    if node is not None:
+        STATS.incr("interned_nodes")
+        STATS.incr("interned_bytes", memory_size([node]))
+        return node
+    node = CompiledSchema(mode, expected, optional)
+    with _NODES_LOCK:
+        # another thread may have compiled the same node meanwhile
+        return _NODES.setdefault(key, node)
+
+
+class _Branches(Mapping):
+    """
+    Branches of a conditional key, compiled on first use.
+
+    Selecting a branch that was already compiled is a single dict lookup.
+    """
+
+    __slots__ = ("depends_on", "dependence_info", "compiled", "stats")
+
+    def __init__(self, conditional: Dict[str, Any]):
+        """
+        Wrap the `conditional` block of a conditional key.
+
+        Args
+        ----
+            - conditional (Dict[str, Any]): Name of the sibling key selecting the branch
+                                            (`depends_on`) & map of its values to
+                                            expected & optional keys
+                                            (`dependence_info`).
+        """
+        self.depends_on: str = conditional["depends_on"]
+        self.dependence_info: Dict[Any, Dict[str, Any]] = conditional["dependence_info"]
+        # value -> compiled branch
+        self.compiled: Dict[Any, CompiledSchema] = {}
+        # value -> number of times the branch was selected
+        self.stats = Counters()
+
+    def compile(self, value: Any) -> "CompiledSchema":
+        """
+        Get a branch, compiling it on first use, without counting it as selected.
+
+        Args
+        ----
+            - value (Any): Sibling value selecting the branch.
+
+        Returns
+        -------
+            - CompiledSchema: Compiled branch.
+
+        Raises
+        ------
+            - KeyError: If no branch is selected by the value.
+            - TypeError: If the value is unhashable.
+        """
+        try:
+            return self.compiled[value]
+        except KeyError:
+            info = self.dependence_info[value]
+        # threads compiling the same branch concurrently all get the first one stored
+        return self.compiled.setdefault(
+            value, _node("validate", info["expected"], info["optional"])
+        )
+
+    def __getitem__(self, value: Any) -> "CompiledSchema":
+        """
+        Select a branch, compiling it on first use.
+        """
+        try:
+            branch = self.compiled[value]
+        except KeyError:
+            branch = self.compile(value)
+        self.stats.incr(value)
+        return branch
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Check if a value selects a branch, without compiling it.
+        """
+        return value in self.dependence_info
+
+    def __iter__(self) -> Iterator:
+        """
+        Iterate over the values selecting a branch.
+        """
+        return iter(self.dependence_info)
+
+    def __len__(self) -> int:
+        """
+        Number of branches.
+        """
+        return len(self.dependence_info)
+
+
+class _DeepCheck:
+    """
+    Checks of an expected key that run after all presence & type checks passed:
+    possible values & constraints, nested expected keys & conditional keys.
+    """
+
+    __slots__ = (
+        "index",
+        "name",
+        "possible_values",
+        "possible_set",
+        "constraints",
+        "expected",
+        "branches",
+    )
+
+    def __init__(self, index: int, key: Dict[str, Any]):
+        """
+        Compile the deep checks of an expected key.
+
+        Args
+        ----
+            - index (int): Position of the key in the expected keys.
+            - key (Dict[str, Any]): Expected key.
+        """
+        self.index = index
+        self.name = key["param_name"]
+        self.possible_values: Optional[Tuple[Any, ...]] = None
+        self.possible_set: Optional[frozenset] = None
+        if "possible_values" in key:
+            self.possible_values = tuple(key["possible_values"])
+            try:
+                self.possible_set = frozenset(self.possible_values)
+            except TypeError:
+                # unhashable possible values, fall back to a linear search
+                pass
+        self.constraints: Optional[Constraints] = compile_constraints(key)
+        self.expected: Optional[CompiledSchema] = None
+        self.branches: Optional[_Branches] = None
+        if key["param_type"] == dict:
+            if "expected" in key:
+                self.expected = _node("expected", key["expected"], None)
+            if "conditional" in key:
+                self.branches = _Branches(key["conditional"])
+
+    @property
+    def restricted(self) -> bool:
+        """
+        Whether values are checked at all.
+        """
+        return self.possible_values is not None or self.constraints is not None
+
+    @property
+    def depends_on(self) -> Optional[str]:
+        """
+        Name of the sibling key selecting the conditional branch, if any.
+        """
+        return None if self.branches is None else self.branches.depends_on
+
+    @property
+    def checker(self) -> Callable[[Any], Optional[str]]:
+        """
+        Fastest function finding why a value is rejected (see `reason`).
+        """
+        if self.possible_values is None and self.constraints is not None:
+            # skip the possible values lookup
+            return self.constraints.reason
+        return self.reason
+
+    @property
+    def empty(self) -> bool:
+        """
+        Whether there is nothing to check.
+        """
+        return not self.restricted and self.expected is None and self.branches is None
+
+    def possible(self, value: Any) -> bool:
+        """
+        Check a value against the possible values of the key.
+
+        Args
+        ----
+            - value (Any): Value to check.
+
+        Returns
+        -------
+            - bool: True if the value is one of the possible values or there are none,
+                    False otherwise.
+        """
+        if self.possible_set is not None:
+            try:
+                return value in self.possible_set
+            except TypeError:
+                pass
+        return self.possible_values is None or value in self.possible_values
+
+    def reason(self, value: Any) -> Optional[str]:
+        """
+        Find why a value is rejected by the possible values or constraints of the key.
+
+        Args
+        ----
+            - value (Any): Value to check.
+
+        Returns
+        -------
+            - Optional[str]: Reason, e.g. "incorrect possible value" or "pattern
+                             mismatch", None if the value is allowed.
+        """
+        if not self.possible(value):
+            return "incorrect possible value"
+        if self.constraints is not None:
+            return self.constraints.reason(value)
+        return None
+
+    def allows(self, value: Any) -> bool:
+        """
+        Check a value against the possible values & constraints of the key.
+
+        Args
+        ----
+            - value (Any): Value to check.
+
+        Returns
+        -------
+            - bool: True if the value is allowed, False otherwise.
+        """
+        return self.reason(value) is None
+
+
+class _DeepChecks(tuple):
+    """
+    Deep checks of a schema's expected keys, in order, & the tables they're looked up
+    from.
+
+    Attributes
+    ----------
+        - by_index (Dict[int, _DeepCheck]): Map of expected key position to its checks.
+        - values (Tuple[Tuple[str, Callable[[Any], Optional[str]]], ...]): (name, reason)
+                                        of the keys whose values are checked.
+        - nested (Tuple[_DeepCheck, ...]): Checks of the keys with nested or conditional
+                                           checks.
+        - depends_on (frozenset): Sibling keys whose value selects a conditional branch.
+    """
+
+    def __init__(self, checks: List[_DeepCheck]):
+        """
+        Build the lookup tables of the checks.
+
+        Args
+        ----
+            - checks (List[_DeepCheck]): Deep checks, in expected key order.
+        """
+        super().__init__()
+        self.by_index: Dict[int, _DeepCheck] = {check.index: check for check in checks}
+        # values are all checked first, in one tight loop, then the nested &
+        # conditional keys: the result is the same as the deep checks only ever AND
+        # together
+        self.values: Tuple[Tuple[str, Callable[[Any], Optional[str]]], ...] = tuple(
+            (check.name, check.checker) for check in checks if check.restricted
+        )
+        self.nested: Tuple[_DeepCheck, ...] = tuple(
+            check
+            for check in checks
+            if check.expected is not None or check.branches is not None
+        )
+        self.depends_on = frozenset(
+            check.depends_on for check in checks if check.branches is not None
+        )
+
+
+class CompiledSchema:
+    """
+    Compiled (nested) expected / optional schema.
+
+    The mode decides which checks a node performs, mirroring the validator: "validate"
+    (`JVal.validate`, unknown keys are rejected), "expected" (`JVal._validate_expected`,
+    used for nested expected keys) & "optional" (`JVal._validate_optional`, used for
+    nested optional keys).
+
+    Attributes
+    ----------
+        - source (Tuple[Tuple[Dict[str, Any], ...], Tuple[Dict[str, Any], ...]]): The
+                                        expected & optional keys the node was compiled
+                                        from.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        expected: Optional[List[Dict[str, Any]]],
+        optional: Optional[List[Dict[str, Any]]],
+    ):
+        """
+        Compile a schema.
+
+        Args
+        ----
+            - mode (str): One of "validate", "expected" or "optional".
+            - expected (Optional[List[Dict[str, Any]]]): Expected keys.
+            - optional (Optional[List[Dict[str, Any]]]): Optional keys.
+        """
+        self.mode = mode
+        self.source = (tuple(expected or ()), tuple(optional or ()))
+        # param name -> [(kind, index, key)]
+        self.by_name: Dict[str, List[Tuple[str, int, Dict[str, Any]]]] = {}
+        for kind, keys in zip(("e", "o"), self.source):
+            for index, key in enumerate(keys):
+                self.by_name.setdefault(key["param_name"], []).append(
+                    (kind, index, key)
+                )
+        self.names = frozenset(self.by_name)
+        self.required: Tuple[Tuple[str, Any], ...] = tuple(
+            (key["param_name"], _widen(key["param_type"])) for key in expected or ()
+        )
+        deep = []
+        for index, key in enumerate(expected or ()):
+            check = _DeepCheck(index, key)
+            if check.empty:
+                continue
+            deep.append(check)
+            if check.branches is not None:
+                # the validator returns the result of the first conditional key, checks
+                # of the keys after it are never reached
+                break
+        self.deep = _DeepChecks(deep)
+        self.optional_checks: Tuple[
+            Tuple[str, Any, Optional[CompiledSchema]], ...
+        ] = tuple(
+            (
+                key["param_name"],
+                _widen(key["param_type"]),
+                _node("optional", None, key["optional"])
+                if key["param_type"] == dict and "optional" in key
+                else None,
+            )
+            for key in optional or ()
+        )
+
+    def expand(self) -> "CompiledSchema":
+        """
+        Compile every conditional branch of the schema & its nested schemas up front,
+        e.g. before forking workers that should share them.
+
+        Returns
+        -------
+            - CompiledSchema: The schema itself.
+        """
+        for check in self.deep:
+            if check.expected is not None:
+                check.expected.expand()
+            if check.branches is not None:
+                for value in check.branches:
+                    check.branches.compile(value).expand()
+        for _, _, nested in self.optional_checks:
+            if nested is not None:
+                nested.expand()
+        return self
+
+    def branch_stats(self) -> Dict[str, Dict[Any, int]]:
+        """
+        Count how often each branch of the schema's conditional keys was selected.
+
+        Counts are kept per node: if this node is shared (see `_node`), selections made
+        through every schema & parent key sharing it are counted together.
+
+        Returns
+        -------
+            - Dict[str, Dict[Any, int]]: Map of conditional key name to map of sibling
+                                         value to count, most selected first.
+        """
+        return {
+            check.name: dict(
+                sorted(
+                    check.branches.stats.snapshot().items(),
+                    key=lambda item: item[1],
+                    reverse=True,
+                )
+            )
+            for check in self.deep
+            if check.branches is not None
+        }
+
+    def validate(self, jobj: Dict[str, Any]) -> bool:
+        """
+        Validate a JSON object against the compiled schema.
+
+        Args
+        ----
+            - jobj (Dict[str, Any]): JSON object to validate.
+
+        Returns
+        -------
+            - bool: True if the JSON object satisfies the schema, False otherwise.
+        """
+        if self.mode == "expected":
+            return self._validate_expected(jobj)
+        if self.mode == "optional":
+            return self._validate_optional(jobj)
+        if not self.names:
+            logger.error("no optional or expected specified")
+            return False
+        names = self.names
+        for parameter in jobj:
+            if parameter not in names:
+                return False
+        if self.optional_checks and not self._validate_optional(jobj):
+            return False
+        return self._validate_expected(jobj)
+
+    def _validate_expected(self, jobj: Dict[str, Any]) -> bool:
+        """
+        Validate the expected keys of a JSON object.
+
+        Args
+        ----
+            - jobj (Dict[str, Any]): JSON object to validate.
+
+        Returns
+        -------
+            - bool: True if the expected keys are satisfied, False otherwise.
+        """
+        for name, _ in self.required:
+            if name not in jobj:
+                logger.error(
+                    "missing expected: %s",
+                    [name for name, _ in self.required if name not in jobj],
+                )
+                return False
+        for name, param_type in self.required:
+            if not isinstance(jobj[name], param_type):
+                logger.error(
+                    "incorrect type for: %s",
+                    [
+                        name
+                        for name, param_type in self.required
+                        if not isinstance(jobj[name], param_type)
+                    ],
+                )
+                return False
+        for name, reason in self.deep.values:
+            rejected = reason(jobj[name])
+            if rejected is not None:
+                logger.error("%s: %s, for param: %s", rejected, jobj[name], name)
+                return False
+        for check in self.deep.nested:
+            if check.expected is not None and not check.expected.validate(
+                jobj[check.name]
+            ):
+                return False
+            if check.branches is not None:
+                return self._validate_conditional(check, jobj)
+        return True
+
+    def _validate_conditional(self, check: _DeepCheck, jobj: Dict[str, Any]) -> bool:
+        """
+        Validate a conditional key against the branch selected by its sibling value.
+
+        Args
+        ----
+            - check (_DeepCheck): Deep checks of the conditional key.
+            - jobj (Dict[str, Any]): JSON object holding the conditional key.
+
+        Returns
+        -------
+            - bool: True if the conditional key satisfies the selected branch, False if
+                    it doesn't or no branch is selected.
+        """
+        branches = check.branches
+        # the schema check guarantees depends_on is an expected key, present by now
+        value = jobj[branches.depends_on]
+        try:
+            # compiled branches are dispatched straight from the dict
+            branch = branches.compiled.get(value) or branches.compile(value)
+        except (KeyError, TypeError):
+            logger.error("no dependence_info for: %s, in param: %s", value, check.name)
+            return False
+        branches.stats.incr(value)
+        return branch.validate(jobj[check.name])
+
+    def _validate_optional(self, jobj: Dict[str, Any]) -> bool:
+        """
+        Validate the optional keys of a JSON object.
+
+        Args
+        ----
+            - jobj (Dict[str, Any]): JSON object to validate.
+
+        Returns
+        -------
+            - bool: True if the optional keys are satisfied, False otherwise.
+        """
+        for name, param_type, nested in self.optional_checks:
+            if name in jobj:
+                if not isinstance(jobj[name], param_type):
+                    logger.error("invalid optional type for param: %s", name)
+                    return False
+                if nested is not None:
+                    return nested.validate(jobj[name])
+        return True
+
+
+def compile_schema(
+    expected: Optional[List[Dict[str, Any]]] = None,
+    optional: Optional[List[Dict[str, Any]]] = None,
+) -> CompiledSchema:
+    """
+    Compile an expected / optional schema for repeated validation.
+
+    Args
+    ----
+        - expected (Optional[List[Dict[str, Any]]]): A list of keys which are python dict
+                                                     objects describing the required
+                                                     parameters of a JSON object
+        - optional (Optional[List[Dict[str, Any]]]): A list of dicts describing the types
+                                                     & names of each JSON parameter that
+                                                     may or may not be in the JSON object
+
+    Returns
+    -------
+        - CompiledSchema: Compiled schema, validating like `JVal.validate`.
+
+    Raises
+    ------
+        - SchemaError: If the schema is malformed.
+    """
+    # the compiled validators rely on the schema being well formed
+    check_schema(expected, optional)
+    return CompiledSchema("validate", expected, optional)
+
+
+def memory_size(
+    schemas: Iterable[CompiledSchema], seen: Optional[Set[int]] = None
+) -> int:
+    """
+    Estimate the memory held by compiled schemas, counting shared objects once.
+
+    Types & other module level objects referenced by the schemas aren't counted.
+
+    Args
+    ----
+        - schemas (Iterable[CompiledSchema]): Compiled schemas.
+        - seen (Optional[Set[int]]): Ids of objects already counted, updated in place.
+
+    Returns
+    -------
+        - int: Size in bytes of the objects reachable from the schemas.
+    """
+    seen = set() if seen is None else seen
+    stack: List[Any] = list(schemas)
+    size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+            if isinstance(obj, _DeepChecks):
+                stack.append(obj.__dict__)
+        elif isinstance(obj, CompiledSchema):
+            stack.append(obj.__dict__)
+        elif isinstance(obj, _DeepCheck):
+            stack.extend(getattr(obj, slot) for slot in _DeepCheck.__slots__)
+        elif isinstance(obj, _Branches):
+            # branches not compiled yet only hold their definition
+            stack.extend((obj.dependence_info, obj.compiled))
+    return size
@@ -0,0 +1,132 @@
+"""
+Input sources: open plain or compressed JSON files as incrementally decompressed streams.
+
+Compression is detected from the file's magic bytes rather than its extension. gzip, bz2
+& xz / lzma are supported out of the box, zstd when either the `compression.zstd`
+(Python 3.14+) or the `zstandard` module is installed. The returned streams decompress
+lazily, so line-delimited (NDJSON) input is validated in constant memory.
+
+Attributes
+----------
+    READ_ERRORS (tuple): Errors raised reading a missing, truncated or corrupt file,
+                         including the zstd decompressor's when zstd is available.
+
+Functions:
+
+    - detect_compression: Detect the compression of a file from its magic bytes.
+    - open_source: Open a plain or compressed file as a binary stream.
+    - read_source: Read the contents of a plain or compressed file.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+from typing import BinaryIO, Optional
+
+from jval.common import COMPRESSION_MAGIC
+
+READ_ERRORS = (OSError, EOFError, lzma.LZMAError)
+
+try:  # pragma: no cover - depends on the interpreter / installed packages
+    from compression import zstd  # type: ignore
+except ImportError:  # pragma: no cover
+    try:
+        import zstandard as zstd  # type: ignore
+    except ImportError:
+        zstd = None
+
+if zstd is not None:  # pragma: no cover
+    READ_ERRORS += (zstd.ZstdError,)
+
+
+def detect_compression(jfile: BinaryIO) -> Optional[str]:
+    """
+    Detect the compression of a seekable binary stream from its magic bytes.
+
+    The stream position is restored before returning.
+
+    Args
+    ----
+        - jfile (BinaryIO): Seekable binary stream.
+
+    Returns
+    -------
+        - Optional[str]: One of "gzip", "bz2", "xz" or "zstd", None for plain input.
+    """
+    position = jfile.tell()
+    head = jfile.read(max(len(magic) for magic in COMPRESSION_MAGIC.values()))
+    jfile.seek(position)
+    for compression, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _open_zstd(jpath: str) -> BinaryIO:
+    """
+    Open a zstd compressed file as an incrementally decompressed stream.
+
+    Args
+    ----
+        - jpath (str): Path to the zstd compressed file.
+
+    Returns
+    -------
+        - BinaryIO: Decompressed binary stream.
+    """
+    if zstd is None:
+        raise ValueError("zstd input requires the 'zstandard' package")
+    if hasattr(zstd, "ZstdFile"):
+        # compression.zstd
+        return zstd.open(jpath, "rb")
+    # zstandard readers aren't buffered, wrap them so readline / iteration work
+    return io.BufferedReader(zstd.open(jpath, "rb"))
+
+
+def open_source(jpath: str) -> BinaryIO:
+    """
+    Open a plain or compressed file as a binary stream of its decompressed contents.
+
+    Args
+    ----
+        - jpath (str): Path to the file.
+
+    Returns
+    -------
+        - BinaryIO: Binary stream of the (decompressed) file contents.
+    """
+    # pylint: disable=consider-using-with
+    jfile = open(jpath, "rb")
+    try:
+        compression = detect_compression(jfile)
+    except BaseException:
+        jfile.close()
+        raise
+    if compression is None:
+        return jfile
+    # let the decompressor own the file so closing the stream closes the file
+    jfile.close()
+    if compression == "gzip":
+        return gzip.open(jpath, "rb")
+    if compression == "bz2":
+        return bz2.open(jpath, "rb")
+    if compression == "xz":
+        return lzma.open(jpath, "rb")
+    return _open_zstd(jpath)
+
+
+def read_source(jpath: str) -> bytes:
+    """
+    Read the (decompressed) contents of a plain or compressed file.
+
+    Args
+    ----
+        - jpath (str): Path to the file.
+
+    Returns
+    -------
+        - bytes: Contents of the file.
+    """
+    with open_source(jpath) as jfile:
+        return jfile.read()
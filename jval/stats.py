@@ -0,0 +1,109 @@
+"""
+Counters that threads update without taking a lock.
+
+Each thread increments its own table of counts & a snapshot sums the tables of every
+thread that ever counted something. Increments therefore never contend with each other,
+which is what lets counters stay on the hot path on free-threaded (no-GIL) builds. The
+tables of threads that have exited are folded into a single table, so short-lived worker
+threads don't pile up tables.
+
+Attributes
+----------
+    STATS (Counters): Process-wide counters, e.g. compiled schema & result cache hits.
+
+Classes:
+
+    - Counters: Per-thread counters with summed snapshots.
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+
+class Counters:
+    """
+    Named counters, kept per thread & summed on demand.
+    """
+
+    def __init__(self):
+        """
+        Create an empty set of counters.
+        """
+        self._local = threading.local()
+        # count tables of live threads, with the thread owning each
+        self._tables: List[Tuple[threading.Thread, Dict[str, int]]] = []
+        # counts of threads that have exited
+        self._retired: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _fold(self):
+        """
+        Fold the tables of exited threads into the retired counts.
+
+        Exited threads can't increment anymore, so their tables are final. Must be
+        called with the lock held.
+        """
+        live = []
+        for thread, table in self._tables:
+            if thread.is_alive():
+                live.append((thread, table))
+                continue
+            for name, count in table.items():
+                self._retired[name] = self._retired.get(name, 0) + count
+        self._tables = live
+
+    def _table(self) -> Dict[str, int]:
+        """
+        Get the calling thread's count table, registering it on first use.
+
+        Returns
+        -------
+            - Dict[str, int]: Counts of the calling thread.
+        """
+        table = getattr(self._local, "table", None)
+        if table is None:
+            table = self._local.table = {}
+            with self._lock:
+                self._fold()
+                self._tables.append((threading.current_thread(), table))
+        return table
+
+    def incr(self, name: str, amount: int = 1) -> int:
+        """
+        Increment a counter of the calling thread.
+
+        Args
+        ----
+            - name (str): Counter name.
+            - amount (int): Amount to add.
+
+        Returns
+        -------
+            - int: The calling thread's new count.
+        """
+        try:
+            table = self._local.table
+        except AttributeError:
+            table = self._table()
+        count = table[name] = table.get(name, 0) + amount
+        return count
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Sum the counts of every thread.
+
+        Returns
+        -------
+            - Dict[str, int]: Counter name to total count.
+        """
+        with self._lock:
+            self._fold()
+            totals = dict(self._retired)
+            tables = [table for _, table in self._tables]
+        for table in tables:
+            for name, count in table.copy().items():
+                totals[name] = totals.get(name, 0) + count
+        return totals
+
+
+STATS = Counters()
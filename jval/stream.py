@@ -0,0 +1,483 @@
+"""
+Incremental decoding of JSON streams.
+
+Functions:
+
+    - iter_array: Decode the elements of a top-level JSON array one at a time.
+    - iter_events: Tokenize a JSON document into a stream of parse events.
+    - iter_concatenated: Decode back-to-back JSON values from a bytes-like buffer.
+"""
+
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple
+
+from jval.common import STREAM_CHUNK_SIZE, STREAM_MAX_VALUE
+
+_WHITESPACE = " \t\n\r"
+_WHITESPACE_BYTES = frozenset(b" \t\n\r")
+_DECODER = json.JSONDecoder()
+# characters an incomplete literal, number or escape can leave after the error position
+_PARTIAL = len("-Infinity")
+
+
+def _truncated(err: json.JSONDecodeError) -> bool:
+    """
+    Check if a decoding error may only be due to the text ending too early.
+
+    Args
+    ----
+        - err (json.JSONDecodeError): Error raised decoding the text.
+
+    Returns
+    -------
+        - bool: True if more text could make the value decode, False if it's malformed.
+    """
+    # unterminated strings are reported at their start, however long they are
+    return (
+        err.msg.startswith("Unterminated string") or len(err.doc) - err.pos < _PARTIAL
+    )
+
+
+class _Buffer:
+    """
+    Sliding text buffer over an incrementally decoded binary stream.
+    """
+
+    def __init__(self, jfile: BinaryIO, chunk_size: int):
+        """
+        Wrap a binary stream.
+
+        Args
+        ----
+            - jfile (BinaryIO): UTF-8 encoded binary stream.
+            - chunk_size (int): Number of bytes read at a time.
+        """
+        self.jfile = jfile
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 0) -> bool:
+        """
+        Read the next chunk, dropping text that was already consumed.
+
+        Args
+        ----
+            - size (int): Number of bytes to read, defaults to the chunk size.
+
+        Returns
+        -------
+            - bool: False if the stream is exhausted, True otherwise.
+        """
+        if self.eof:
+            return False
+        chunk = self.jfile.read(size or self.chunk_size)
+        if not chunk:
+            # positions stay valid when nothing more could be read
+            self.eof = True
+            self.text += self.decoder.decode(b"", final=True)
+            return False
+        self.text = self.text[self.pos :] + self.decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self) -> str:
+        """
+        Advance past whitespace.
+
+        Returns
+        -------
+            - str: The next non whitespace character, empty at the end of the stream.
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def _check_size(self):
+        """
+        Refuse to read more for a value already spanning `STREAM_MAX_VALUE` characters.
+
+        Raises
+        ------
+            - json.JSONDecodeError: If the value at the current position is too large.
+        """
+        if len(self.text) - self.pos >= STREAM_MAX_VALUE:
+            raise json.JSONDecodeError("Value too large", self.text, self.pos)
+
+    def decode(self) -> Any:
+        """
+        Decode the JSON value starting at the current position.
+
+        Values that are cut off by the end of the buffer (or numbers ending near it,
+        which could still continue with more digits or an exponent) are retried with
+        more input. The amount read doubles with every retry so decoding a value
+        spanning many chunks stays linear. Malformed values are reported right away
+        rather than after reading the rest of the stream.
+
+        Returns
+        -------
+            - Any: Decoded value.
+
+        Raises
+        ------
+            - json.JSONDecodeError: If the value is malformed or spans more than
+                                    `STREAM_MAX_VALUE` characters.
+        """
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as err:
+                if not _truncated(err):
+                    raise
+                self._check_size()
+                if self.fill(size):
+                    size *= 2
+                    continue
+                raise
+            if (
+                len(self.text) - end <= 2
+                and isinstance(value, (int, float))
+                and not isinstance(value, bool)
+            ):
+                self._check_size()
+                if self.fill(size):
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_array(jfile: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Decode the elements of a top-level JSON array one at a time.
+
+    The stream is read in chunks into a sliding buffer & each element is decoded with
+    `json.JSONDecoder.raw_decode` as soon as it is complete, so memory use is bounded
+    by the chunk size & the size of the largest element, not the size of the array.
+
+    Args
+    ----
+        - jfile (BinaryIO): UTF-8 encoded binary stream containing a JSON array.
+        - chunk_size (int): Number of bytes read at a time.
+
+    Returns
+    -------
+        - Iterator[Any]: Decoded elements in array order.
+
+    Raises
+    ------
+        - json.JSONDecodeError: If the stream is not a well formed JSON array.
+    """
+    buffer = _Buffer(jfile, chunk_size)
+    if buffer.skip_whitespace() != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer.text, buffer.pos)
+    buffer.pos += 1
+    if buffer.skip_whitespace() == "]":
+        return
+    while True:
+        yield buffer.decode()
+        delimiter = buffer.skip_whitespace()
+        if delimiter == "]":
+            return
+        if delimiter != ",":
+            raise json.JSONDecodeError(
+                "Expecting ',' delimiter", buffer.text, buffer.pos
+            )
+        buffer.pos += 1
+        buffer.skip_whitespace()
+
+
+def _scalar_event(value: Any) -> str:
+    """
+    Name the parse event of a decoded scalar.
+
+    Args
+    ----
+        - value (Any): Decoded string, number, boolean or null.
+
+    Returns
+    -------
+        - str: One of "string", "number", "boolean" or "null".
+    """
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "boolean"
+    if value is None:
+        return "null"
+    return "number"
+
+
+def _after_value(
+    buffer: _Buffer, stack: List[str], char: str, state: str
+) -> Tuple[Optional[Tuple[str, Any]], Optional[str]]:
+    """
+    Parse what follows a value: a comma, the end of its container or of the document.
+
+    Args
+    ----
+        - buffer (_Buffer): Buffer positioned at the next character.
+        - stack (List[str]): Open containers, "{" or "[".
+        - char (str): Next character, empty at the end of the stream.
+        - state (str): Current parser state.
+
+    Returns
+    -------
+        - Tuple[Optional[Tuple[str, Any]], Optional[str]]: Event (if any) & next state,
+                                                           None once the document ends.
+
+    Raises
+    ------
+        - json.JSONDecodeError: If the character can't follow a value.
+    """
+    if not stack:
+        if char:
+            raise json.JSONDecodeError("Extra data", buffer.text, buffer.pos)
+        return None, None
+    if char == ",":
+        buffer.pos += 1
+        return None, "key" if stack[-1] == "{" else "value"
+    if char == "}" and stack[-1] == "{":
+        buffer.pos += 1
+        stack.pop()
+        return ("end_map", None), state
+    if char == "]" and stack[-1] == "[":
+        buffer.pos += 1
+        stack.pop()
+        return ("end_array", None), state
+    raise json.JSONDecodeError("Expecting ',' delimiter", buffer.text, buffer.pos)
+
+
+def _key(
+    buffer: _Buffer, stack: List[str], char: str, state: str
+) -> Tuple[Optional[Tuple[str, Any]], Optional[str]]:
+    """
+    Parse an object key & its colon, or the end of an empty object.
+
+    Args
+    ----
+        - buffer (_Buffer): Buffer positioned at the next character.
+        - stack (List[str]): Open containers, "{" or "[".
+        - char (str): Next character, empty at the end of the stream.
+        - state (str): "key", or "key_or_end" right after an opening brace.
+
+    Returns
+    -------
+        - Tuple[Optional[Tuple[str, Any]], Optional[str]]: Event & next state.
+
+    Raises
+    ------
+        - json.JSONDecodeError: If no key (or closing brace) is found.
+    """
+    if char == "}" and state == "key_or_end":
+        buffer.pos += 1
+        stack.pop()
+        return ("end_map", None), "after_value"
+    if char != '"':
+        raise json.JSONDecodeError(
+            "Expecting property name enclosed in double quotes",
+            buffer.text,
+            buffer.pos,
+        )
+    key = buffer.decode()
+    if buffer.skip_whitespace() != ":":
+        raise json.JSONDecodeError("Expecting ':' delimiter", buffer.text, buffer.pos)
+    buffer.pos += 1
+    return ("map_key", key), "value"
+
+
+def _value(
+    buffer: _Buffer, stack: List[str], char: str, state: str
+) -> Tuple[Optional[Tuple[str, Any]], Optional[str]]:
+    """
+    Parse a value: a scalar or the start of a container, or the end of an empty array.
+
+    Args
+    ----
+        - buffer (_Buffer): Buffer positioned at the next character.
+        - stack (List[str]): Open containers, "{" or "[".
+        - char (str): Next character, empty at the end of the stream.
+        - state (str): "value", or "value_or_end" right after an opening bracket.
+
+    Returns
+    -------
+        - Tuple[Optional[Tuple[str, Any]], Optional[str]]: Event & next state.
+
+    Raises
+    ------
+        - json.JSONDecodeError: If no value is found.
+    """
+    if char == "]" and state == "value_or_end":
+        buffer.pos += 1
+        stack.pop()
+        return ("end_array", None), "after_value"
+    if char == "{":
+        buffer.pos += 1
+        stack.append("{")
+        return ("start_map", None), "key_or_end"
+    if char == "[":
+        buffer.pos += 1
+        stack.append("[")
+        return ("start_array", None), "value_or_end"
+    if not char:
+        raise json.JSONDecodeError("Expecting value", buffer.text, buffer.pos)
+    value = buffer.decode()
+    return (_scalar_event(value), value), "after_value"
+
+
+# parser state -> handler parsing the next token in that state
+_PARSERS = {
+    "value": _value,
+    "value_or_end": _value,
+    "key": _key,
+    "key_or_end": _key,
+    "after_value": _after_value,
+}
+
+
+def iter_events(
+    jfile: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Tokenize a JSON document into a stream of parse events without building it.
+
+    Events are (event, value) tuples where event is one of "start_map", "map_key",
+    "end_map", "start_array", "end_array", "string", "number", "boolean" or "null". Only
+    keys & scalars carry a value. Memory use is bounded by the chunk size, the largest
+    scalar & the nesting depth of the document.
+
+    Args
+    ----
+        - jfile (BinaryIO): UTF-8 encoded binary stream containing a JSON document.
+        - chunk_size (int): Number of bytes read at a time.
+
+    Returns
+    -------
+        - Iterator[Tuple[str, Any]]: Parse events in document order.
+
+    Raises
+    ------
+        - json.JSONDecodeError: If the stream is not a well formed JSON document.
+    """
+    buffer = _Buffer(jfile, chunk_size)
+    # open containers, "{" or "["
+    stack: List[str] = []
+    # "value", "key", "key_or_end", "value_or_end" or "after_value", None at the end
+    state: Optional[str] = "value"
+    while state is not None:
+        char = buffer.skip_whitespace()
+        if char == "," and state == "after_value" and stack:
+            # the most common token, handled inline
+            buffer.pos += 1
+            state = "key" if stack[-1] == "{" else "value"
+            continue
+        event, state = _PARSERS[state](buffer, stack, char, state)
+        if event is not None:
+            yield event
+
+
+def _window_values(text: str, last: bool) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Decode the values of a window of text that lie entirely inside it.
+
+    Args
+    ----
+        - text (str): Decoded window.
+        - last (bool): True if the window ends at the end of the buffer.
+
+    Returns
+    -------
+        - Iterator[Tuple[int, int, Any]]: (start, end, value) for every complete value,
+                                          in characters of the window.
+
+    Raises
+    ------
+        - json.JSONDecodeError: If the window holds malformed JSON.
+    """
+    index = 0
+    while True:
+        while index < len(text) and text[index] in _WHITESPACE:
+            index += 1
+        if index == len(text):
+            return
+        try:
+            value, end = _DECODER.raw_decode(text, index)
+        except json.JSONDecodeError as err:
+            if last or not _truncated(err):
+                raise
+            return
+        if (
+            not last
+            and len(text) - end <= 2
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+        ):
+            # the number may continue past the window
+            return
+        yield index, end, value
+        index = end
+
+
+def iter_concatenated(
+    buffer: Any, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Decode back-to-back JSON values (optionally separated by whitespace) from a buffer.
+
+    The buffer is never split or copied as a whole: windows of it are decoded to text
+    through a memoryview, values are decoded from each window at increasing offsets with
+    `json.JSONDecoder.raw_decode` & windows grow only while a single value doesn't fit
+    (up to `STREAM_MAX_VALUE` bytes), malformed values are reported right away.
+    Offsets & lengths are in bytes, so they can be used to slice the original buffer.
+
+    Args
+    ----
+        - buffer (Any): bytes, bytearray, memoryview, mmap or any other bytes-like object
+                        holding UTF-8 encoded JSON values.
+        - chunk_size (int): Size of the decoded windows in bytes.
+
+    Returns
+    -------
+        - Iterator[Tuple[int, int, Any]]: (offset, length, value) for every value.
+
+    Raises
+    ------
+        - json.JSONDecodeError: If the buffer holds malformed JSON or a value larger
+                                than `STREAM_MAX_VALUE` bytes.
+    """
+    view = memoryview(buffer).cast("B")
+    size = len(view)
+    offset = 0
+    window_size = chunk_size
+    while True:
+        while offset < size and view[offset] in _WHITESPACE_BYTES:
+            offset += 1
+        if offset >= size:
+            return
+        window_end = min(size, offset + window_size)
+        last = window_end == size
+        # a multi-byte character cut at the end of the window is left for the next one
+        text, _ = codecs.utf_8_decode(view[offset:window_end], "strict", last)
+        ascii_only = text.isascii()
+        index = 0
+        for start, end, value in _window_values(text, last):
+            # whitespace is ASCII, one byte per character
+            offset += start - index
+            length = end - start if ascii_only else len(text[start:end].encode())
+            yield offset, length, value
+            offset += length
+            index = end
+        if index:
+            window_size = chunk_size
+        elif window_size >= STREAM_MAX_VALUE:
+            raise json.JSONDecodeError("Value too large", text, index)
+        else:
+            # grow the window only while a single value doesn't fit into it
+            window_size = min(window_size * 2, STREAM_MAX_VALUE)
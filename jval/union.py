@@ -0,0 +1,372 @@
+"""
+Unions of schemas (anyOf / oneOf) compiled into a decision tree.
+
+Trying an object against each alternative of a union in turn repeats the presence &
+type checks the alternatives share & runs every alternative even when a glance at the
+object rules most of them out. A `SchemaUnion` instead:
+
+    - checks the keys every alternative requires with the same type once, up front,
+      & validates the alternatives without them,
+    - walks a decision tree whose nodes test the presence of a key (alternatives that
+      require it or don't allow it are pruned), which of a set of keys each required by
+      different alternatives is present (all but those requiring it are pruned) or the
+      type of a key's value (alternatives expecting another type are pruned),
+    - & only fully validates the alternatives left at the leaf it reaches.
+
+Type nodes are expanded lazily, once per value type seen, so the tree stays small.
+
+Classes:
+
+    - SchemaUnion: anyOf / oneOf union of schemas.
+"""
+
+import copy
+import logging
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from jval.prewarm import compiled
+from jval.schema import CompiledSchema
+
+logger = logging.getLogger(__name__)
+
+# (kind, name) of the tests made on the way to a node, kind "p" (presence) or "t" (type)
+Tests = FrozenSet[Tuple[str, str]]
+
+
+class _Node:  # pylint: disable=too-few-public-methods
+    """
+    Decision tree node: a presence, key or type test or a leaf of candidates.
+    """
+
+    __slots__ = (
+        "kind",
+        "name",
+        "candidates",
+        "tests",
+        "split",
+        "by_key",
+        "by_type",
+    )
+
+    def __init__(self, candidates: Tuple[int, ...], tests: Tests):
+        """
+        Create a leaf of candidates, tests are added by the union.
+
+        Args
+        ----
+            - candidates (Tuple[int, ...]): Indexes of the alternatives left.
+            - tests (Tests): Tests made on the way to the node.
+        """
+        # "leaf", "presence", "key" or "type"
+        self.kind = "leaf"
+        self.name: Optional[str] = None
+        self.candidates = candidates
+        self.tests = tests
+        # (present, absent) child nodes, for presence tests
+        self.split: Optional[Tuple[_Node, _Node]] = None
+        # key -> child node, for key tests
+        self.by_key: Optional[Dict[str, _Node]] = None
+        # value type -> child node, for type tests
+        self.by_type: Optional[Dict[type, _Node]] = None
+
+
+class SchemaUnion:
+    """
+    Union of schemas an object matches if it matches any (or exactly one) of them.
+    """
+
+    def __init__(self, alternatives: Sequence[Any], one_of: bool = False):
+        """
+        Compile the alternatives & the decision tree choosing between them.
+
+        Args
+        ----
+            - alternatives (Sequence[Any]): (expected, optional) pairs or compiled
+                                            schemas.
+            - one_of (bool): Match objects that match exactly one alternative (oneOf)
+                             rather than at least one (anyOf).
+        """
+        self.one_of = one_of
+        self.alternatives: Tuple[CompiledSchema, ...] = tuple(
+            schema if isinstance(schema, CompiledSchema) else compiled(*schema)
+            for schema in alternatives
+        )
+        # name -> widened type of the keys every alternative requires alike
+        types = [dict(schema.required) for schema in self.alternatives]
+        self.shared: Tuple[Tuple[str, Any], ...] = ()
+        if self.alternatives:
+            self.shared = tuple(
+                (name, param_type)
+                for name, param_type in self.alternatives[0].required
+                if all(
+                    name in required and required[name] == param_type
+                    for required in types[1:]
+                )
+            )
+        shared = {name for name, _ in self.shared}
+        # the alternatives without the shared checks
+        self._residual: List[CompiledSchema] = []
+        for schema in self.alternatives:
+            residual = copy.copy(schema)
+            residual.required = tuple(
+                (name, param_type)
+                for name, param_type in schema.required
+                if name not in shared
+            )
+            self._residual.append(residual)
+        self._types = types
+        self._names = [
+            schema.names if schema.mode == "validate" else None
+            for schema in self.alternatives
+        ]
+        self.root = self._build(
+            tuple(range(len(self.alternatives))),
+            frozenset(("t", name) for name in shared),
+        )
+
+    def _build(self, candidates: Tuple[int, ...], tests: Tests) -> _Node:
+        """
+        Build the subtree choosing between some alternatives.
+
+        Args
+        ----
+            - candidates (Tuple[int, ...]): Indexes of the alternatives left.
+            - tests (Tests): Tests made on the way to the subtree.
+
+        Returns
+        -------
+            - _Node: Root of the subtree.
+        """
+        node = _Node(candidates, tests)
+        if len(candidates) <= 1:
+            return node
+        names = {name for index in candidates for name in self._types[index]}
+        for index in candidates:
+            if self._names[index] is not None:
+                names.update(self._names[index])
+        groups = self._partition(candidates, names, tests)
+        if groups is not None:
+            node.kind = "key"
+            tests = tests | {("p", name) for name in groups}
+            node.by_key = {
+                name: self._build(group, tests) for name, group in groups.items()
+            }
+            return node
+        # (largest side, name, present, absent) of the splits pruning something
+        splits = []
+        for name in sorted(names):
+            if ("p", name) in tests:
+                continue
+            present, absent = self._split(candidates, name)
+            worst = max(len(present), len(absent))
+            if worst < len(candidates):
+                splits.append((worst, name, present, absent))
+        if splits:
+            # the first of the most even splits
+            _, node.name, present, absent = min(splits, key=lambda split: split[0])
+            node.kind = "presence"
+            tests = tests | {("p", node.name)}
+            node.split = (self._build(present, tests), self._build(absent, tests))
+            return node
+        for name in sorted(names):
+            if ("t", name) in tests:
+                continue
+            if all(name in self._types[index] for index in candidates) and (
+                len({repr(self._types[index][name]) for index in candidates}) > 1
+            ):
+                node.kind = "type"
+                node.name = name
+                node.by_type = {}
+                node.tests = tests | {("t", name)}
+                return node
+        return node
+
+    def _partition(
+        self, candidates: Tuple[int, ...], names: Set[str], tests: Tests
+    ) -> Optional[Dict[str, Tuple[int, ...]]]:
+        """
+        Find keys each required by different alternatives & allowed by no other.
+
+        An object can then only match the alternatives requiring whichever of the keys
+        it has, found with one lookup per key rather than a chain of presence tests.
+
+        Args
+        ----
+            - candidates (Tuple[int, ...]): Indexes of the alternatives left.
+            - names (Set[str]): Keys named by the alternatives.
+            - tests (Tests): Tests made on the way to the node.
+
+        Returns
+        -------
+            - Optional[Dict[str, Tuple[int, ...]]]: Alternatives requiring each key,
+                                                    None if there are no such keys or
+                                                    fewer than three of them.
+        """
+        if any(self._names[index] is None for index in candidates):
+            return None
+        owners = {
+            name: tuple(index for index in candidates if name in self._types[index])
+            for name in names
+            if ("p", name) not in tests
+        }
+        groups: Dict[str, Tuple[int, ...]] = {}
+        covered: Set[int] = set()
+        for name in sorted(owners, key=lambda name: (len(owners[name]), name)):
+            if owners[name] and covered.isdisjoint(owners[name]):
+                groups[name] = owners[name]
+                covered.update(owners[name])
+        if len(covered) < len(candidates) or len(groups) < 3:
+            return None
+        for name, group in groups.items():
+            for index in group:
+                if any(
+                    other != name and other in self._names[index] for other in groups
+                ):
+                    return None
+        return groups
+
+    def _split(
+        self, candidates: Tuple[int, ...], name: str
+    ) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """
+        Split alternatives on the presence of a key.
+
+        Args
+        ----
+            - candidates (Tuple[int, ...]): Indexes of the alternatives left.
+            - name (str): Key.
+
+        Returns
+        -------
+            - Tuple[Tuple[int, ...], Tuple[int, ...]]: Alternatives an object can match
+                                                       with & without the key.
+        """
+        present = tuple(
+            index
+            for index in candidates
+            if self._names[index] is None or name in self._names[index]
+        )
+        absent = tuple(index for index in candidates if name not in self._types[index])
+        return present, absent
+
+    def _typed(self, node: _Node, kind: type) -> _Node:
+        """
+        Get the child of a type test for a value type, building it on first use.
+
+        Args
+        ----
+            - node (_Node): Type test.
+            - kind (type): Type of the tested value.
+
+        Returns
+        -------
+            - _Node: Child node.
+        """
+        child = node.by_type.get(kind)
+        if child is None:
+            candidates = tuple(
+                index
+                for index in node.candidates
+                if issubclass(kind, self._types[index][node.name])
+            )
+            # threads expanding the same type concurrently all get the first child
+            child = node.by_type.setdefault(kind, self._build(candidates, node.tests))
+        return child
+
+    def candidates(self, jobj: Any) -> Tuple[int, ...]:
+        """
+        Walk the decision tree to find the alternatives an object may match.
+
+        Args
+        ----
+            - jobj (Any): JSON object.
+
+        Returns
+        -------
+            - Tuple[int, ...]: Indexes of the alternatives left to validate, empty if
+                               the shared checks or the tree rule them all out.
+        """
+        if not isinstance(jobj, Mapping):
+            logger.error("not an object: %s", type(jobj).__name__)
+            return ()
+        for name, param_type in self.shared:
+            if name not in jobj or not isinstance(jobj[name], param_type):
+                logger.error("missing or incorrect type for: %s", name)
+                return ()
+        node = self.root
+        while node.kind != "leaf":
+            if node.kind == "presence":
+                node = node.split[node.name not in jobj]
+            elif node.kind == "key":
+                keys = jobj if len(jobj) < len(node.by_key) else node.by_key
+                for name in keys:
+                    if name in node.by_key and name in jobj:
+                        node = node.by_key[name]
+                        break
+                else:
+                    logger.error("none of the keys: %s", list(node.by_key))
+                    return ()
+            else:
+                if node.name not in jobj:
+                    return ()
+                node = self._typed(node, type(jobj[node.name]))
+        return node.candidates
+
+    def matches(self, jobj: Any) -> List[int]:
+        """
+        Find the alternatives an object matches.
+
+        With `one_of` every alternative left is validated, otherwise validation stops
+        at the first match.
+
+        Args
+        ----
+            - jobj (Any): JSON object.
+
+        Returns
+        -------
+            - List[int]: Indexes of the matching alternatives, in order.
+        """
+        found = []
+        for index in self.candidates(jobj):
+            if self._residual[index].validate(jobj):
+                found.append(index)
+                if not self.one_of:
+                    break
+        return found
+
+    def match(self, jobj: Any) -> Optional[int]:
+        """
+        Find the alternative an object matches.
+
+        Args
+        ----
+            - jobj (Any): JSON object.
+
+        Returns
+        -------
+            - Optional[int]: Index of the first (anyOf) or only (oneOf) matching
+                             alternative, None if there is none.
+        """
+        found = self.matches(jobj)
+        if not found:
+            return None
+        if self.one_of and len(found) > 1:
+            logger.error("more than one alternative matched: %s", found)
+            return None
+        return found[0]
+
+    def validate(self, jobj: Any) -> bool:
+        """
+        Validate an object against the union.
+
+        Args
+        ----
+            - jobj (Any): JSON object to validate.
+
+        Returns
+        -------
+            - bool: True if the object matches the union, False otherwise.
+        """
+        return self.match(jobj) is not None
@@ -0,0 +1,171 @@
+"""
+Watch mode: incrementally revalidate JSON files in a directory tree as they change.
+
+The watcher polls the tree with `os.scandir` and keeps a cheap stat signature
+(mtime, size, inode) and the last validation result for every file in memory. Only
+files whose signature changed since the previous poll are passed to `fvalidate`, so a
+poll over a large, mostly unchanged tree costs one `stat` per file and no decoding.
+
+Optionally a content hash is kept as well; when a file is touched without its content
+changing the cached result is reused instead of revalidating it.
+
+Classes:
+
+    - Watcher: Poll a directory tree & revalidate changed files.
+"""
+
+import fnmatch
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jval.cache import file_digest
+
+logger = logging.getLogger(__name__)
+
+
+class Watcher:
+    """
+    Poll a directory tree and revalidate JSON files whose stat signature changed.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        validator: Any,
+        root: str,
+        expected: Optional[List[Dict[str, Any]]] = None,
+        optional: Optional[List[Dict[str, Any]]] = None,
+        pattern: str = "*.json",
+        use_hash: bool = False,
+    ):
+        """
+        Instantiate the watcher.
+
+        Args
+        ----
+            - validator (JVal): Validator used to (re)validate changed files.
+            - root (str): Directory tree to watch.
+            - expected (Optional[List[Dict[str, Any]]]): Expected keys of the schema.
+            - optional (Optional[List[Dict[str, Any]]]): Optional keys of the schema.
+            - pattern (str): Glob pattern file names must match to be validated.
+            - use_hash (bool): Also compare content hashes so files that were touched but
+                               not modified are not revalidated.
+        """
+        self.validator = validator
+        self.root = root
+        self.schema = (expected, optional)
+        self.pattern = pattern
+        self.use_hash = use_hash
+        # path -> ((mtime_ns, size, inode), content digest if use_hash is set)
+        self._seen: Dict[str, Tuple[Tuple[int, int, int], Optional[str]]] = {}
+        # path -> last validation result
+        self.results: Dict[str, bool] = {}
+
+    def _scan(self) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Walk the tree and collect the stat signature of every matching file.
+
+        Returns
+        -------
+            - Dict[str, Tuple[int, int, int]]: Map of path to (mtime_ns, size, inode).
+        """
+        signatures = {}
+        pending = [self.root]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif fnmatch.fnmatch(entry.name, self.pattern):
+                            try:
+                                stat = entry.stat()
+                            except FileNotFoundError:
+                                # removed between listing & stat
+                                continue
+                            signatures[entry.path] = (
+                                stat.st_mtime_ns,
+                                stat.st_size,
+                                stat.st_ino,
+                            )
+            except (FileNotFoundError, NotADirectoryError, PermissionError) as err:
+                logger.error("unable to scan: %s", err)
+        return signatures
+
+    def _revalidate(self, path: str) -> bool:
+        """
+        Validate a single file, treating unreadable or undecodable files as invalid.
+
+        Args
+        ----
+            - path (str): Path to the file.
+
+        Returns
+        -------
+            - bool: True if the file satisfies the schema, False otherwise.
+        """
+        try:
+            return self.validator.fvalidate(path, *self.schema)
+        except (OSError, ValueError) as err:
+            logger.error("unable to validate: %s, %s", path, err)
+            return False
+
+    def poll(self) -> Dict[str, Optional[bool]]:
+        """
+        Rescan the tree once and revalidate files that changed since the last poll.
+
+        Returns
+        -------
+            - Dict[str, Optional[bool]]: Map of changed paths to their new result. Paths
+                                         that were removed map to None.
+        """
+        signatures = self._scan()
+        changed: Dict[str, Optional[bool]] = {}
+        for path, signature in signatures.items():
+            seen = self._seen.get(path, (None, None))
+            if seen[0] == signature:
+                continue
+            digest = None
+            if self.use_hash:
+                try:
+                    digest = file_digest(path)
+                except OSError:
+                    continue
+                if seen[1] == digest and path in self.results:
+                    # touched but content unchanged
+                    self._seen[path] = (signature, digest)
+                    continue
+            self._seen[path] = (signature, digest)
+            self.results[path] = changed[path] = self._revalidate(path)
+        # forget removed files
+        for path in set(self._seen) - set(signatures):
+            del self._seen[path]
+            self.results.pop(path, None)
+            changed[path] = None
+        return changed
+
+    def watch(
+        self,
+        interval: float = 1.0,
+        callback: Optional[Callable[[Dict[str, Optional[bool]]], Any]] = None,
+        stop: Optional[threading.Event] = None,
+    ):
+        """
+        Poll the tree until stopped, reporting changes after every poll.
+
+        Args
+        ----
+            - interval (float): Seconds to sleep between polls.
+            - callback (Optional[Callable]): Called with the result of every poll that
+                                             detected changes.
+            - stop (Optional[threading.Event]): Event that ends the loop once set.
+        """
+        stop = stop if stop is not None else threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            changed = self.poll()
+            if changed and callback is not None:
+                callback(changed)
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
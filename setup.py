@@ -24,7 +24,7 @@ setup(
     author="Abenezer Mamo",
     author_email="hi@abenezer.sh",
     license="MIT",
-    packages=find_packages(exclude=("tests",)),
+    packages=find_packages(exclude=("tests", "benchmarks")),
     python_requires='>=3.6',
     zip_safe=False,
 )
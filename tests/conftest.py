@@ -0,0 +1,113 @@
+"""
+    shared fixtures for jval tests
+"""
+# the schema fixture mirrors the schema of the original test suite
+# pylint: disable=duplicate-code
+import copy
+
+import pytest
+
+
+@pytest.fixture
+def port_schema():
+    """small schema with a single expected key"""
+    return [{"param_name": "port", "param_type": int}]
+
+
+@pytest.fixture
+def schema():
+    """schema with simple, nested, conditional & optional keys"""
+    expected = [
+        {
+            "param_name": "source_type",
+            "param_type": str,
+            "possible_values": ["local", "azure_storage"],
+        },
+        {
+            "param_name": "source_info",
+            "param_type": dict,
+            "conditional": {
+                "depends_on": "source_type",
+                "dependence_info": {
+                    "local": {
+                        "expected": [{"param_name": "file_path", "param_type": str}],
+                        "optional": [{"param_name": "dir_path", "param_type": str}],
+                    },
+                    "azure_storage": {
+                        "expected": [
+                            {"param_name": "connection_string", "param_type": str}
+                        ],
+                        "optional": [{"param_name": "file_name", "param_type": str}],
+                    },
+                },
+            },
+        },
+        {
+            "param_name": "store_info",
+            "param_type": dict,
+            "expected": [
+                {"param_name": "host", "param_type": str},
+                {"param_name": "port", "param_type": int},
+            ],
+        },
+    ]
+    optional = [
+        {"param_name": "tags", "param_type": list},
+        {
+            "param_name": "extra",
+            "param_type": dict,
+            "optional": [{"param_name": "note", "param_type": str}],
+        },
+    ]
+    return expected, optional
+
+
+@pytest.fixture
+def document():
+    """document valid against the schema, conditional key before its dependency"""
+    return {
+        "source_info": {"file_path": "/tmp", "dir_path": "/"},
+        "source_type": "local",
+        "store_info": {"host": "localhost", "port": 5432, "ignored": {"deep": [1]}},
+        "tags": [{"a": [1, 2, {"b": None}]}, "x"],
+        "extra": {"note": "hi"},
+    }
+
+
+# changes turning the document into its valid & invalid variants, None keeps it as is
+MUTATIONS = (
+    None,
+    lambda doc: doc.pop("source_type"),
+    lambda doc: doc.update(source_type="gcp"),
+    lambda doc: doc.update(source_type="azure_storage"),
+    lambda doc: doc.update(
+        source_type="azure_storage", source_info={"connection_string": "x"}
+    ),
+    lambda doc: doc["source_info"].update(unknown=1),
+    lambda doc: doc["store_info"].update(port="5432"),
+    lambda doc: doc["store_info"].pop("host"),
+    lambda doc: doc.update(unknown={"big": list(range(100))}),
+    lambda doc: doc.update(tags="not a list"),
+    lambda doc: doc.update(extra={"note": 1}),
+    lambda doc: doc.update(source_info=[]),
+)
+
+
+def _mutated(original, mutate):
+    """copy of the document with a mutation applied"""
+    mutated = copy.deepcopy(original)
+    if mutate is not None:
+        mutate(mutated)
+    return mutated
+
+
+@pytest.fixture(params=range(len(MUTATIONS)))
+def variant(request, document):  # pylint: disable=redefined-outer-name
+    """a valid or invalid variant of the document, one test per variant"""
+    return _mutated(document, MUTATIONS[request.param])
+
+
+@pytest.fixture
+def variants(document):  # pylint: disable=redefined-outer-name
+    """every valid & invalid variant of the document"""
+    return [_mutated(document, mutate) for mutate in MUTATIONS]
@@ -0,0 +1,114 @@
+"""
+    tests for jval validation of Python objects & mappings
+"""
+import dataclasses
+import enum
+import types
+from collections import OrderedDict
+
+from jval import JVal
+from jval.adapters import AttributeMapping
+from jval.schema import compile_schema
+
+
+@dataclasses.dataclass
+class StoreInfo:
+    """nested dataclass record"""
+
+    host: str
+    port: int
+
+
+class Store:  # pylint: disable=too-few-public-methods
+    """slotted record"""
+
+    __slots__ = ("store_type", "store_info")
+
+    def __init__(self, store_type, store_info):
+        self.store_type = store_type
+        self.store_info = store_info
+
+
+STORE_INFO = [
+    {"param_name": "host", "param_type": str},
+    {"param_name": "port", "param_type": int},
+]
+STORE_SCHEMA = [
+    {"param_name": "store_type", "param_type": str, "possible_values": ["pg"]},
+    {"param_name": "store_info", "param_type": dict, "expected": STORE_INFO},
+]
+
+
+def test_validate_mappings():
+    """test any mapping is validated & accepted where a dict is expected"""
+    jobj = types.MappingProxyType(
+        OrderedDict(
+            store_type="pg",
+            store_info=types.MappingProxyType({"host": "localhost", "port": 5432}),
+        )
+    )
+    assert JVal().validate(jobj, expected=STORE_SCHEMA) is True
+    assert compile_schema(STORE_SCHEMA).validate(jobj) is True
+
+
+def test_ovalidate_objects():
+    """test attribute-bearing objects are validated through a mapping view"""
+    assert JVal().ovalidate(Store("pg", StoreInfo("localhost", 5432)), STORE_SCHEMA)
+    invalid = Store("pg", StoreInfo("localhost", "5432"))
+    assert not JVal().ovalidate(invalid, STORE_SCHEMA)
+    # unset slots count as missing
+    assert not JVal().ovalidate(Store.__new__(Store), STORE_SCHEMA)
+
+
+def test_attribute_mapping_view():
+    """test the mapping view exposes set attributes without copying"""
+    info = StoreInfo("localhost", 5432)
+    view = AttributeMapping(Store("pg", info))
+    assert list(view) == ["store_type", "store_info"]
+    assert view["store_info"].obj is info
+    plain = types.SimpleNamespace(a=1)
+    assert dict(AttributeMapping(plain)) == {"a": 1}
+
+
+class Color(enum.Enum):
+    """enum field value"""
+
+    RED = "red"
+    BLUE = "blue"
+
+
+class Point:  # pylint: disable=too-few-public-methods
+    """custom class field value"""
+
+    def __init__(self, left, top):
+        self.left = left
+        self.top = top
+
+
+@dataclasses.dataclass
+class Shape:
+    """record with enum, custom class & nested record fields"""
+
+    color: Color
+    origin: Point
+    store_info: StoreInfo
+
+
+def test_ovalidate_leaves_non_dict_values_alone():
+    """test objects are only viewed as mappings where the schema expects a dict"""
+    expected = [
+        {"param_name": "color", "param_type": Color, "possible_values": [Color.RED]},
+        {"param_name": "origin", "param_type": Point},
+        STORE_SCHEMA[1],
+    ]
+    shape = Shape(Color.RED, Point(1, 2), StoreInfo("localhost", 5432))
+    as_dict = {
+        "color": Color.RED,
+        "origin": shape.origin,
+        "store_info": {"host": "localhost", "port": 5432},
+    }
+    assert JVal().validate(as_dict, expected=expected) is True
+    assert JVal().ovalidate(shape, expected) is True
+    assert JVal().ovalidate(dataclasses.replace(shape, color=Color.BLUE), expected) is (
+        JVal().validate(dict(as_dict, color=Color.BLUE), expected=expected)
+    )
@@ -0,0 +1,86 @@
+"""
+    tests for jval archive validation
+"""
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from jval import JVal
+
+MEMBERS = {
+    "a.json": {"port": 1},
+    "dir/b.json": {"port": "1"},
+    "c.json": {"port": 3},
+    "notes.txt": {"port": "ignored"},
+}
+
+
+def _write_zip(apath):
+    """write the test members to a zip archive"""
+    with zipfile.ZipFile(apath, "w") as archive:
+        for name, jobj in MEMBERS.items():
+            archive.writestr(name, json.dumps(jobj))
+        archive.writestr("broken.json", "{")
+
+
+def _write_tar(apath):
+    """write the test members to a gzipped tar archive"""
+    with tarfile.open(apath, "w:gz") as archive:
+        for name, jobj in list(MEMBERS.items()) + [("broken.json", "{")]:
+            data = jobj.encode() if isinstance(jobj, str) else json.dumps(jobj).encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+@pytest.mark.parametrize(
+    "suffix, writer", [(".zip", _write_zip), (".tar.gz", _write_tar)]
+)
+@pytest.mark.parametrize("processes", [None, 2])
+def test_avalidate_reports_members(  # pylint: disable=too-many-arguments
+    tmp_path,
+    port_schema,
+    suffix,
+    writer,
+    processes,
+):
+    """test every JSON member is validated & reported in archive order"""
+    apath = str(tmp_path / ("bundle" + suffix))
+    writer(apath)
+    report = JVal().avalidate(apath, expected=port_schema, processes=processes)
+    assert list(report.items()) == [
+        ("a.json", True),
+        ("dir/b.json", False),
+        ("c.json", True),
+        ("broken.json", False),
+    ]
+
+
+def test_fvalidate_archive(tmp_path, port_schema):
+    """test fvalidate accepts archives & requires every member to be valid"""
+    apath = str(tmp_path / "bundle.zip")
+    with zipfile.ZipFile(apath, "w") as archive:
+        archive.writestr("a.json", json.dumps({"port": 1}))
+    assert JVal().fvalidate(apath, expected=port_schema) is True
+    _write_zip(apath)
+    assert JVal().fvalidate(apath, expected=port_schema) is False
+
+
+def test_avalidate_non_object_members(tmp_path, port_schema):
+    """test members that aren't JSON objects are reported as invalid"""
+    apath = str(tmp_path / "bundle.zip")
+    with zipfile.ZipFile(apath, "w") as archive:
+        archive.writestr("a.json", json.dumps({"port": 1}))
+        archive.writestr("five.json", "5")
+        archive.writestr("null.json", "null")
+        archive.writestr("list.json", "[]")
+    assert JVal().avalidate(apath, expected=port_schema) == {
+        "a.json": True,
+        "five.json": False,
+        "null.json": False,
+        "list.json": False,
+    }
+    assert JVal().fvalidate(apath, expected=port_schema) is False
@@ -0,0 +1,112 @@
+"""
+    tests for jval validation of NumPy structured arrays
+"""
+import pytest
+
+from jval import JVal
+from jval.arrays import validate_records
+from jval.schema import compile_schema
+
+np = pytest.importorskip("numpy")
+
+STORE = np.dtype([("host", "U16"), ("port", "i8")])
+SOURCE = np.dtype([("file_path", "U16"), ("connection_string", "U16")])
+
+
+def _row(value, dtype):
+    """convert a row the way validate_records sees it"""
+    if dtype.names is not None:
+        return {name: _row(value[name], dtype[name]) for name in dtype.names}
+    return value if dtype.kind == "O" else value.item()
+
+
+def _matches_validate(records, expected, optional=None):
+    """validate_records gives the same results as validate on each converted row"""
+    mask = JVal().validate_records(records, expected=expected, optional=optional)
+    assert mask.dtype == bool and mask.shape == records.shape
+    assert mask.tolist() == [
+        JVal().validate(_row(row, records.dtype), expected=expected, optional=optional)
+        for row in records
+    ]
+    return mask
+
+
+def test_validate_records_matches_validate(schema):
+    """test column wise checks match row wise validation, conditional keys included"""
+    expected, optional = schema
+    # nested checks after a conditional key are never reached, move them before it
+    expected = [expected[0], expected[2], expected[1]]
+    dtype = np.dtype(
+        [
+            ("source_type", "U16"),
+            ("source_info", [("file_path", "U16")]),
+            ("store_info", STORE),
+            ("extra", [("note", "U8")]),
+        ]
+    )
+    records = np.array(
+        [
+            ("local", ("/tmp",), ("localhost", 5432), ("hi",)),
+            ("gcp", ("/tmp",), ("localhost", 5432), ("hi",)),
+            ("azure_storage", ("/tmp",), ("localhost", 5432), ("hi",)),
+        ],
+        dtype=dtype,
+    )
+    assert _matches_validate(records, expected, optional).tolist() == [
+        True,
+        False,
+        False,
+    ]
+    # a conditional branch selecting different sub-schemas per group of rows
+    branches = np.array(
+        [("local", ("/tmp", "")), ("azure_storage", ("", "conn"))],
+        dtype=[("source_type", "U16"), ("source_info", SOURCE)],
+    )
+    _matches_validate(branches, [schema[0][1], schema[0][0]])
+
+
+def test_validate_records_field_checks(port_schema):
+    """test types are checked per field & object fields per row"""
+    records = np.array([(1,), (2,)], dtype=[("port", "i4")])
+    assert _matches_validate(records, port_schema).all()
+    floats = np.array([(1.0,), (2.0,)], dtype=[("port", "f8")])
+    assert not _matches_validate(floats, port_schema).any()
+    objects = np.array([(1,), ("2",), (None,)], dtype=[("port", "O")])
+    assert _matches_validate(objects, port_schema).tolist() == [True, False, False]
+    unknown = np.array([(1, 2)], dtype=[("port", "i4"), ("other", "i4")])
+    assert not _matches_validate(unknown, port_schema).any()
+
+
+def test_validate_records_possible_values():
+    """test possible values are checked in bulk & row by row where they must be"""
+    expected = [{"param_name": "code", "param_type": int, "possible_values": [1, 3]}]
+    records = np.array([(code,) for code in range(5)], dtype=[("code", "i8")])
+    assert _matches_validate(records, expected).tolist() == [
+        False,
+        True,
+        False,
+        True,
+        False,
+    ]
+    mixed = [{"param_name": "code", "param_type": str, "possible_values": ["a", 1]}]
+    strings = np.array([("a",), ("1",)], dtype=[("code", "U4")])
+    assert _matches_validate(strings, mixed).tolist() == [True, False]
+    grid = np.zeros((2, 3), dtype=[("code", "i8")])
+    assert validate_records(grid, compile_schema(expected)).shape == (2, 3)
+
+
+@pytest.mark.parametrize("kind", ["U16", "O"])
+def test_validate_records_branch_stats(schema, kind):
+    """test branches are counted once per row selecting them, like row wise"""
+    expected = schema[0][:2]
+    dtype = [("source_type", kind), ("source_info", SOURCE)]
+    records = np.array(
+        [("local", ("/tmp", ""))] * 3 + [("azure_storage", ("", "conn"))],
+        dtype=dtype,
+    )
+    columns, rows = compile_schema(expected), compile_schema(expected)
+    validate_records(records, columns)
+    for row in records:
+        rows.validate(_row(row, records.dtype))
+    assert columns.branch_stats() == rows.branch_stats()
+    assert columns.branch_stats() == {"source_info": {"local": 3, "azure_storage": 1}}
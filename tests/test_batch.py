@@ -0,0 +1,48 @@
+"""
+    tests for jval columnar batch validation
+"""
+import types
+
+import pytest
+
+from jval import JVal
+from jval.batch import validate_batch
+from jval.schema import compile_schema
+
+
+def test_validate_batch_matches_validate(schema, variants):
+    """test column wise validation gives the same results as the validator"""
+    expected, optional = schema
+    batch = variants + [[], "x", types.MappingProxyType(variants[0])]
+    assert JVal().validate_batch(batch, expected=expected, optional=optional) == [
+        isinstance(jobj, (dict, types.MappingProxyType))
+        and JVal().validate(jobj, expected=expected, optional=optional)
+        for jobj in batch
+    ]
+
+
+def test_validate_batch_optional_cut_off():
+    """test optional keys after a present nested optional key aren't checked"""
+    optional = [
+        {"param_name": "a", "param_type": dict, "optional": []},
+        {"param_name": "b", "param_type": int},
+    ]
+    batch = [{"a": {}, "b": "x"}, {"b": "x"}, {"a": 1}, {}]
+    assert validate_batch(batch, compile_schema(optional=optional)) == [
+        JVal().validate(jobj, optional=optional) for jobj in batch
+    ]
+    assert validate_batch(batch, compile_schema()) == [False] * 4
+
+
+@pytest.mark.parametrize(
+    "values", [[True, 1, 2, 2.0, 3.0], [3.0, 2.0, 2, 1, True], [1, True, 1.0, False]]
+)
+def test_batch_numeric_constraints_keep_bools_apart(values):
+    """test bools, ints & floats that compare equal are checked separately"""
+    expected = [
+        {"param_name": "c", "param_type": (int, float), "multiple_of": 2},
+    ]
+    jobjs = [{"c": value} for value in values]
+    results = JVal().validate_batch(jobjs, expected=expected)
+    assert results == [JVal().validate(jobj, expected=expected) for jobj in jobjs]
+    assert results == [isinstance(value, bool) or value % 2 == 0 for value in values]
@@ -0,0 +1,66 @@
+"""
+    tests for jval persistent result cache
+"""
+import json
+
+import pytest
+
+from jval import JVal, ResultCache
+from jval.cache import main
+from jval.schema import fingerprint
+
+
+@pytest.fixture
+def json_file(tmp_path):
+    """valid JSON file"""
+    jpath = tmp_path / "data.json"
+    jpath.write_text(json.dumps({"port": 1}), encoding="utf-8")
+    return str(jpath)
+
+
+@pytest.mark.parametrize("key", ["stat", "hash"])
+def test_cache_hit_skips_decoding(  # pylint: disable=too-many-arguments
+    tmp_path,
+    json_file,  # pylint: disable=redefined-outer-name
+    port_schema,
+    monkeypatch,
+    key,
+):
+    """test unchanged files are answered from the cache"""
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), key=key)
+    validator = JVal(cache=cache)
+    assert validator.fvalidate(json_file, expected=port_schema) is True
+    assert len(cache) == 1
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("decoded a cached file")
+
+    monkeypatch.setattr("jval.json.load", _fail)
+    assert validator.fvalidate(json_file, expected=port_schema) is True
+
+
+def test_cache_invalidates_on_schema_change(
+    tmp_path, json_file, port_schema  # pylint: disable=redefined-outer-name
+):
+    """test a changed schema does not reuse cached results"""
+    validator = JVal(cache=ResultCache(str(tmp_path / "cache.sqlite")))
+    assert validator.fvalidate(json_file, expected=port_schema) is True
+    port_schema[0]["param_type"] = str
+    assert fingerprint(port_schema) != fingerprint(
+        [{"param_name": "port", "param_type": int}]
+    )
+    assert validator.fvalidate(json_file, expected=port_schema) is False
+
+
+def test_cache_prune(tmp_path, capsys):
+    """test pruning keeps only the most recently used results"""
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path)
+    for index in range(10):
+        cache.put("schema", f"file-{index}", True)
+    assert cache.prune(max_entries=4) == 6
+    assert cache.get("schema", "file-9") is True
+    assert cache.get("schema", "file-0") is None
+    cache.close()
+    assert main([path, "--max-entries", "1"]) == 0
+    assert "pruned 3 results" in capsys.readouterr().out
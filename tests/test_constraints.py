@@ -0,0 +1,327 @@
+"""
+    tests for jval string & numeric constraints
+"""
+import io
+import json
+
+import pytest
+
+from jval import JVal, SchemaError, check_schema
+from jval.arrays import validate_records
+from jval.batch import validate_batch
+from jval.constraints import FORMATS, compile_constraints
+from jval.decode import decode_validated
+from jval.encode import encode_validated
+from jval.errors import ValidationError
+from jval.events import EventValidator
+from jval.schema import compile_schema
+
+
+@pytest.mark.parametrize(
+    "name, good, bad",
+    [
+        (
+            "email",
+            ["a@b.io", "first.last+tag@mail.example.com"],
+            ["a@b", "@b.io", "a b@c.io", "a@@b.io", "a@b..io"],
+        ),
+        (
+            "uuid",
+            [
+                "123e4567-e89b-12d3-a456-426614174000",
+                "123E4567-E89B-12D3-A456-42661417400F",
+            ],
+            [
+                "123e4567e89b12d3a456426614174000",
+                "123e4567-e89b-12d3-a456-42661417400g",
+            ],
+        ),
+        (
+            "date",
+            ["2024-02-29", "1999-12-31"],
+            ["2023-02-29", "2024-02-30", "2024-04-31", "2024-13-01", "24-01-01"],
+        ),
+        (
+            "date-time",
+            ["2024-01-31T23:59:59Z", "2000-02-29 00:00:00.25+01:00"],
+            ["2024-01-31T24:00:00Z", "2024-01-31T23:59:59", "2024-01-31"],
+        ),
+    ],
+)
+def test_formats(name, good, bad):
+    """test each format accepts & rejects the expected strings"""
+    assert all(FORMATS[name](value) for value in good)
+    assert not any(FORMATS[name](value) for value in bad)
+
+
+def test_constraints_compiled_once():
+    """test keys with the same constraints share compiled constraints"""
+    first = {"param_name": "a", "param_type": str, "pattern": "^x", "max_length": 3}
+    second = {"param_name": "b", "param_type": str, "max_length": 3, "pattern": "^x"}
+    assert compile_constraints(first) is compile_constraints(second)
+    assert compile_constraints({"param_name": "c", "param_type": str}) is None
+    constraints = compile_constraints(first)
+    assert constraints.reason("xy") is None
+    assert constraints.reason("xyzw") == "incorrect length"
+    assert constraints.reason("yx") == "pattern mismatch"
+    # only strings are constrained
+    assert constraints.reason(None) is None
+
+
+def test_constraints_follow_key_changes():
+    """test a key modified in place gets the constraints it holds now"""
+    key = {"param_name": "a", "param_type": str, "pattern": "^y", "max_length": 2}
+    assert JVal().validate({"a": "yy"}, expected=[key]) is True
+    key["max_length"] = 1
+    assert JVal().validate({"a": "yy"}, expected=[key]) is False
+    assert compile_constraints(key).reason("yy") == "incorrect length"
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("format", "ipv4"),
+        ("pattern", "("),
+        ("minimum", "1"),
+        ("max_length", 1.5),
+        ("multiple_of", 0),
+        ("minimum", [1]),
+    ],
+)
+def test_malformed_constraints_schema_error(field, value):
+    """test malformed constraints raise a SchemaError before any value is checked"""
+    expected = [
+        {"param_name": "a", "param_type": int},
+        {"param_name": "b", "param_type": (int, str), field: value},
+    ]
+    with pytest.raises(SchemaError):
+        JVal().validate({"a": "not an int", "b": 1}, expected=expected)
+
+
+EXPECTED = [
+    {
+        "param_name": "user_id",
+        "param_type": (str, type(None)),
+        "format": "uuid",
+    },
+    {
+        "param_name": "code",
+        "param_type": str,
+        "pattern": "^[A-Z]{2}[0-9]+$",
+        "min_length": 3,
+        "max_length": 6,
+    },
+    {
+        "param_name": "contact",
+        "param_type": dict,
+        "expected": [{"param_name": "email", "param_type": str, "format": "email"}],
+    },
+]
+VALID = {
+    "user_id": "123e4567-e89b-12d3-a456-426614174000",
+    "code": "AB12",
+    "contact": {"email": "a@b.io"},
+}
+
+
+@pytest.mark.parametrize(
+    "change, valid",
+    [
+        ({}, True),
+        ({"user_id": None}, True),
+        ({"user_id": "not-a-uuid"}, False),
+        ({"code": "AB1234"}, True),
+        ({"code": "AB12345"}, False),
+        ({"code": "ab12"}, False),
+        ({"contact": {"email": "nobody"}}, False),
+    ],
+)
+def test_constraints_checked_by_every_validator(change, valid):
+    """test every validator applies the constraints alike"""
+    doc = dict(VALID, **change)
+    compiled = compile_schema(EXPECTED)
+    assert JVal().validate(doc, expected=EXPECTED) is valid
+    assert compiled.validate(doc) is valid
+    assert validate_batch([doc, VALID], compiled) == [valid, True]
+    text = json.dumps(doc)
+    jfile = io.BytesIO(text.encode())
+    assert EventValidator(EXPECTED).validate(jfile, chunk_size=7) is valid
+    if valid:
+        assert decode_validated(text, compiled) == doc
+        assert encode_validated(doc, compiled) == text.encode()
+    else:
+        with pytest.raises(ValidationError):
+            decode_validated(text, compiled)
+        with pytest.raises(ValidationError):
+            encode_validated(doc, compiled)
+
+
+def test_constraint_reason_reported():
+    """test the violated constraint is the reason of validation errors"""
+    compiled = compile_schema(EXPECTED)
+    with pytest.raises(ValidationError) as error:
+        encode_validated(dict(VALID, code="ab12"), compiled)
+    assert error.value.reason == "pattern mismatch"
+    assert error.value.path == ("code",)
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("pattern", "("),
+        ("min_length", -1),
+        ("max_length", True),
+        ("format", "ipv4"),
+    ],
+)
+def test_invalid_constraints_rejected(field, value):
+    """test malformed constraints are fatal schema problems"""
+    with pytest.raises(SchemaError):
+        check_schema([{"param_name": "a", "param_type": str, field: value}])
+
+
+def test_unreachable_constraints_flagged():
+    """test constraints that can never fail are flagged but not fatal"""
+    expected = [
+        {"param_name": "a", "param_type": int, "min_length": 1},
+        {"param_name": "b", "param_type": str, "min_length": 2, "max_length": 1},
+    ]
+    check_schema(expected)
+    with pytest.raises(SchemaError):
+        check_schema(expected, strict=True)
+
+
+def test_constraints_checked_on_records():
+    """test constraints are checked on structured array columns"""
+    numpy = pytest.importorskip("numpy")
+    expected = [EXPECTED[1]]
+    records = numpy.array([("AB12",), ("ab12",), ("AB1234567",)], [("code", "U16")])
+    assert JVal().validate_records(records, expected=expected).tolist() == [
+        True,
+        False,
+        False,
+    ]
+
+
+NUMERIC = [
+    {"param_name": "port", "param_type": int, "minimum": 1, "maximum": 65535},
+    {"param_name": "step", "param_type": (int, float, bool), "multiple_of": 0.1},
+    {"param_name": "even", "param_type": int, "multiple_of": 2, "minimum": 0},
+]
+NUMBERS = {"port": 80, "step": 0.3, "even": 4}
+
+
+@pytest.mark.parametrize(
+    "change, valid",
+    [
+        ({}, True),
+        ({"port": 65535, "step": 3, "even": 0}, True),
+        ({"step": True}, True),
+        ({"port": 0}, False),
+        ({"port": 65536}, False),
+        ({"step": 0.35}, False),
+        ({"step": float("inf")}, False),
+        ({"even": 3}, False),
+        ({"even": -2}, False),
+    ],
+)
+def test_numeric_constraints_checked_by_every_validator(change, valid):
+    """test every validator applies numeric constraints alike"""
+    doc = dict(NUMBERS, **change)
+    compiled = compile_schema(NUMERIC)
+    assert JVal().validate(doc, expected=NUMERIC) is valid
+    assert compiled.validate(doc) is valid
+    assert validate_batch([doc, NUMBERS], compiled) == [valid, True]
+    jfile = io.BytesIO(json.dumps(doc).encode())
+    assert EventValidator(NUMERIC).validate(jfile, chunk_size=5) is valid
+    if not valid:
+        with pytest.raises(ValidationError):
+            encode_validated(doc, compiled)
+
+
+def test_numeric_constraints_over_columns():
+    """test whole columns give the same results as checking each value"""
+    numpy = pytest.importorskip("numpy")
+    compiled = compile_schema(NUMERIC)
+    rows = [
+        (port, step, even)
+        for port in (0, 1, 80, 70000)
+        for step in (0.1, 0.25, 0.3, 7.0, float("nan"))
+        for even in (-4, 0, 2, 3)
+    ]
+    docs = [dict(zip(("port", "step", "even"), row)) for row in rows]
+    expected = [compiled.validate(doc) for doc in docs]
+    assert validate_batch(docs, compiled) == expected
+    records = numpy.array(rows, [("port", "i8"), ("step", "f8"), ("even", "i4")])
+    assert validate_records(records, compiled).tolist() == expected
+    # columns within bounds are checked without visiting each value
+    port, step, even = (compile_constraints(key) for key in NUMERIC)
+    assert port.column_ok([1, 80, 65535]) and not port.column_ok([1, 0])
+    assert not port.column_ok([1, "80"]) and not step.column_ok([0.3])
+    assert even.column_ok([0, 4, 10]) and not even.column_ok([0, 4, 9])
+    assert not compile_constraints({"minimum": 0.0}).column_ok([1.0, float("nan")])
+    valid = [
+        dict(NUMBERS, port=port, even=even * 2)
+        for port in range(1, 500)
+        for even in range(3)
+    ]
+    assert validate_batch(valid, compiled) == [True] * len(valid)
+
+
+def test_numeric_constraints_huge_ints():
+    """test ints too large for a float are checked without overflowing"""
+    huge = 10**400
+    expected = [
+        {"param_name": "big", "param_type": (int, float), "multiple_of": 0.5},
+        {"param_name": "top", "param_type": (int, float), "maximum": huge},
+    ]
+    check_schema(expected, strict=True)
+    compiled = compile_schema(expected)
+    docs = [
+        {"big": huge, "top": huge},
+        {"big": 1.5, "top": huge + 1},
+        {"big": 0.25, "top": 1.5},
+        {"big": float("nan"), "top": float("nan")},
+    ]
+    results = [True, False, False, False]
+    assert [JVal().validate(doc, expected=expected) for doc in docs] == results
+    assert [compiled.validate(doc) for doc in docs] == results
+    assert validate_batch(docs, compiled) == results
+    assert validate_batch(docs[:1] * 3, compiled) == [True] * 3
+    assert not compile_constraints(expected[1]).column_ok([huge, 1.5])
+
+
+@pytest.mark.parametrize(
+    "value, multiple_of, valid",
+    [
+        (600000000.5, 1, False),
+        (1e12 + 0.5, 1, False),
+        (1e9 + 0.25, 0.5, False),
+        (1e12 + 0.3, 0.1, True),
+        (1e9 + 0.5, 0.5, True),
+        (600000000.0, 1, True),
+    ],
+)
+def test_multiple_of_large_values(value, multiple_of, valid):
+    """test large values are multiples exactly, not within a tolerance growing with them"""
+    expected = [
+        {"param_name": "a", "param_type": (int, float), "multiple_of": multiple_of}
+    ]
+    doc = {"a": value}
+    compiled = compile_schema(expected)
+    assert JVal().validate(doc, expected=expected) is valid
+    assert compiled.validate(doc) is valid
+    assert validate_batch([doc, doc], compiled) == [valid, valid]
+    numpy = pytest.importorskip("numpy")
+    records = numpy.array([(value,), (value,)], [("a", "f8")])
+    assert validate_records(records, compiled).tolist() == [valid, valid]
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("minimum", "1"), ("maximum", float("nan")), ("multiple_of", 0)],
+)
+def test_invalid_numeric_constraints_rejected(field, value):
+    """test malformed numeric constraints are fatal schema problems"""
+    with pytest.raises(SchemaError):
+        check_schema([{"param_name": "a", "param_type": int, field: value}])
@@ -0,0 +1,49 @@
+"""
+    tests for jval validation while decoding
+"""
+import json
+
+import pytest
+
+from jval import JVal
+from jval.decode import decode_validated
+from jval.errors import ValidationError
+from jval.schema import compile_schema
+
+
+def test_fvalidate_early_reject_matches_validate(tmp_path, schema, variant):
+    """test validating while decoding gives the same results as the validator"""
+    expected, optional = schema
+    jpath = str(tmp_path / "data.json")
+    with open(jpath, "w", encoding="utf-8") as jfile:
+        json.dump(variant, jfile)
+    assert JVal().fvalidate(
+        jpath, expected=expected, optional=optional, early_reject=True
+    ) is JVal().validate(variant, expected=expected, optional=optional)
+
+
+@pytest.mark.parametrize(
+    "text, path",
+    [
+        ('{"unknown": 1, "source_type": [[[', ("unknown",)),
+        ('{"source_type": {"huge": [[[', ("source_type",)),
+        ('{"source_type": "gcp", "store_info": [[[', ("source_type",)),
+        (
+            '{"source_type": "local", "source_info": {"nope": 1, "x": [[[',
+            ("source_info", "nope"),
+        ),
+        ('{"store_info": "localhost", "tags": [[[', ("store_info",)),
+    ],
+)
+def test_decode_validated_rejects_before_rest(schema, text, path):
+    """test decoding stops at the first certain violation, the rest is never read"""
+    with pytest.raises(ValidationError) as err:
+        decode_validated(text, compile_schema(*schema))
+    assert err.value.path == path
+
+
+def test_decode_validated_returns_document(schema, document):
+    """test valid documents are decoded completely & branches aren't counted"""
+    compiled = compile_schema(*schema)
+    assert decode_validated(json.dumps(document), compiled) == document
+    assert compiled.branch_stats() == {"source_info": {}}
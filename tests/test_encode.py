@@ -0,0 +1,66 @@
+"""
+    tests for jval validation while encoding
+"""
+import json
+import types
+
+import pytest
+
+from jval import JVal
+from jval.encode import encode_validated
+from jval.errors import ValidationError
+from jval.schema import compile_schema
+
+
+def test_dumps_validated_matches_validate(schema, variant):
+    """test validating while encoding matches validate followed by dumps"""
+    expected, optional = schema
+    compiled = compile_schema(expected, optional)
+    if JVal().validate(variant, expected=expected, optional=optional):
+        assert (
+            JVal().dumps_validated(variant, expected=expected, optional=optional)
+            == JVal().dumps_validated(variant, compiled)
+            == json.dumps(variant).encode()
+        )
+    else:
+        with pytest.raises(ValidationError):
+            JVal().dumps_validated(variant, expected=expected, optional=optional)
+        with pytest.raises(ValidationError):
+            JVal().dumps_validated(variant, compiled)
+
+
+@pytest.mark.parametrize(
+    "mutate, path",
+    [
+        (lambda doc: doc.update(unknown=1), ("unknown",)),
+        (lambda doc: doc.pop("store_info"), ("store_info",)),
+        (
+            lambda doc: doc["source_info"].update(file_path=1),
+            ("source_info", "file_path"),
+        ),
+        (lambda doc: doc.update(source_type="gcp"), ("source_info",)),
+    ],
+)
+def test_encode_validated_error_path(schema, document, mutate, path):
+    """test the error points at the offending value"""
+    mutate(document)
+    with pytest.raises(ValidationError) as err:
+        encode_validated(document, compile_schema(*schema))
+    assert err.value.path == path
+
+
+def test_encode_validated_mapping(schema, document):
+    """test mappings other than dicts are encoded like dicts"""
+    compiled = compile_schema(*schema)
+    proxied = dict(document)
+    proxied["source_info"] = types.MappingProxyType(document["source_info"])
+    assert encode_validated(proxied, compiled) == json.dumps(document).encode()
+    # the branch is counted once, however the object was encoded
+    assert compiled.branch_stats() == {"source_info": {document["source_type"]: 1}}
+
+
+def test_dumps_validated_compiled_with_optional(schema, document):
+    """test optional keys can't be given along with a compiled schema"""
+    expected, optional = schema
+    with pytest.raises(ValueError):
+        JVal().dumps_validated(document, compile_schema(expected, optional), optional)
@@ -0,0 +1,36 @@
+"""
+    tests for jval event driven validation
+"""
+import io
+import json
+
+import pytest
+
+from jval import JVal
+from jval.events import EventValidator
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 16])
+def test_event_validator_matches_validate(schema, variant, chunk_size):
+    """test event driven results match decoding & validating"""
+    expected, optional = schema
+    jfile = io.BytesIO(json.dumps(variant).encode())
+    assert EventValidator(expected, optional).validate(
+        jfile, chunk_size=chunk_size
+    ) is JVal().validate(variant, expected=expected, optional=optional)
+
+
+def test_event_validator_stops_at_unknown_key(schema):
+    """test reading stops at the first unknown top-level key"""
+    expected, optional = schema
+    # everything after the unknown key is malformed & never read
+    jfile = io.BytesIO(b'{"unknown": 1, "source_type": ' + b"[" * 1000)
+    assert EventValidator(expected, optional).validate(jfile, chunk_size=16) is False
+
+
+def test_fvalidate_events(tmp_path, schema, document):
+    """test files are validated from parse events"""
+    expected, optional = schema
+    jpath = tmp_path / "big.json"
+    jpath.write_text(json.dumps(document))
+    assert JVal().fvalidate_events(str(jpath), expected, optional) is True
@@ -0,0 +1,105 @@
+"""
+    tests for jval schema checks
+"""
+import pytest
+
+from jval import SchemaError, SchemaRegistry, check_schema
+from jval.metaschema import schema_problems
+from jval.schema import compile_schema
+
+
+@pytest.mark.parametrize(
+    "expected, reason, path",
+    [
+        ([1], "key is not a dict", ("expected", 0)),
+        ([{"param_type": str}], "missing param_name", ("expected", 0)),
+        ([{"param_name": "a"}], "missing param_type", ("expected", "a")),
+        (
+            [{"param_name": "a", "param_type": "str"}],
+            "param_type is not a type: 'str'",
+            ("expected", "a"),
+        ),
+        (
+            [{"param_name": "a", "param_type": dict, "conditional_keys": {}}],
+            "unknown field: conditional_keys",
+            ("expected", "a"),
+        ),
+        (
+            [
+                {
+                    "param_name": "a",
+                    "param_type": dict,
+                    "conditional": {"depends_on": "b", "dependence_info": {"x": {}}},
+                },
+                {"param_name": "b", "param_type": str},
+            ],
+            "missing expected & optional",
+            ("expected", "a", "conditional", "dependence_info", "x"),
+        ),
+        (
+            [
+                {
+                    "param_name": "a",
+                    "param_type": dict,
+                    "conditional": {"depends_on": "b", "dependence_info": {}},
+                }
+            ],
+            "depends_on is not an expected key: b",
+            ("expected", "a", "conditional"),
+        ),
+        (
+            [
+                {
+                    "param_name": "a",
+                    "param_type": dict,
+                    "expected": [{"param_name": "b", "param_type": int, "typo": 1}],
+                }
+            ],
+            "unknown field: typo",
+            ("expected", "a", "expected", "b"),
+        ),
+    ],
+)
+def test_fatal_problems(expected, reason, path):
+    """test malformed schemas are rejected when compiled or registered"""
+    with pytest.raises(SchemaError) as err:
+        compile_schema(expected)
+    assert (err.value.reason, err.value.path) == (reason, path)
+    with pytest.raises(SchemaError):
+        SchemaRegistry().register("broken", "1", expected)
+
+
+def test_unreachable_checks(schema):
+    """test checks that can never run are reported, fatal only when strict"""
+    expected, optional = schema
+    problems = schema_problems(expected, optional)
+    assert [(problem.reason, problem.fatal) for problem in problems] == [
+        ("checks after conditional key source_info are never run", False)
+    ]
+    optional = [{"param_name": "tag", "param_type": str, "possible_values": ["x"]}]
+    expected = [
+        {"param_name": "kind", "param_type": str, "possible_values": ["a", 1]},
+        {
+            "param_name": "info",
+            "param_type": dict,
+            "conditional": {
+                "depends_on": "kind",
+                "dependence_info": {
+                    "a": {"expected": None, "optional": optional},
+                    "b": {"expected": None, "optional": optional},
+                },
+            },
+        },
+    ]
+    assert [problem.reason for problem in schema_problems(expected, optional)] == [
+        "possible value of the wrong type: 1",
+        "possible_values is never checked on an optional key",
+        "possible_values is never checked on an optional key",
+        "possible_values is never checked on an optional key",
+        "unreachable branch, kind can't be: 'b'",
+    ]
+    check_schema(expected, optional)
+    with pytest.raises(SchemaError):
+        check_schema(expected, optional, strict=True)
+    jobj = {"kind": "a", "info": {"tag": "y"}, "tag": "z"}
+    assert compile_schema(expected, optional).validate(jobj)
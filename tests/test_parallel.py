@@ -0,0 +1,54 @@
+"""
+    tests for jval parallel validation over shared memory
+"""
+import json
+
+import pytest
+
+from jval import JVal
+from jval.parallel import available_backends
+
+
+@pytest.mark.parametrize(
+    "processes, backend",
+    [(None, "process"), (3, "process"), (3, "thread"), (2, "interpreter")],
+)
+def test_validate_ndjson_matches_validate(schema, variants, processes, backend):
+    """test lines validated by parallel workers match the validator"""
+    if backend not in available_backends():
+        pytest.skip(f"{backend} backend not supported by this interpreter")
+    expected, optional = schema
+    lines = [json.dumps(variant) for variant in variants * 5]
+    lines[3:3] = ["", "not json", "  "]
+    buffer = "\n".join(lines).encode()
+    results = JVal().validate_ndjson(
+        buffer,
+        expected=expected,
+        optional=optional,
+        processes=processes,
+        backend=backend,
+    )
+    assert results == [
+        (
+            number,
+            line != "not json"
+            and JVal().validate(json.loads(line), expected=expected, optional=optional),
+        )
+        for number, line in enumerate(lines, start=1)
+        if line.strip()
+    ]
+
+
+def test_validate_ndjson_edges(port_schema):
+    """test empty buffers & trailing newlines"""
+    assert not JVal().validate_ndjson(b"", expected=port_schema, processes=2)
+    assert JVal().validate_ndjson(
+        bytearray(b'{"port": 1}\n{"port": "1"}\n'), expected=port_schema, processes=4
+    ) == [(1, True), (2, False)]
+
+
+def test_validate_ndjson_backends(port_schema):
+    """test unsupported backends are rejected"""
+    assert available_backends()[:2] == ("thread", "process")
+    with pytest.raises(ValueError):
+        JVal().validate_ndjson(b"{}", expected=port_schema, backend="fiber")
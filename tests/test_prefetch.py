@@ -0,0 +1,108 @@
+"""
+    tests for jval validation of many files with read-ahead
+"""
+import gzip
+import io
+import json
+import lzma
+import tarfile
+import threading
+import time
+
+from jval import JVal
+from jval.cache import ResultCache
+from jval.prefetch import prefetch
+
+
+def test_fvalidate_many(tmp_path, port_schema):
+    """test every file is validated, unreadable & malformed files are invalid"""
+    paths = {}
+    for index in range(20):
+        jpath = tmp_path / f"{index}.json"
+        jpath.write_text(f'{{"port": {index}}}' if index % 3 else '{"port": "x"}')
+        paths[str(jpath)] = bool(index % 3)
+    (tmp_path / "bad.json").write_text("{")
+    paths[str(tmp_path / "bad.json")] = False
+    paths[str(tmp_path / "missing.json")] = False
+    validator = JVal(cache=ResultCache(str(tmp_path / "cache.sqlite")))
+    for _ in range(2):
+        results = list(validator.fvalidate_many(paths, expected=port_schema, threads=4))
+        assert dict(results) == paths and len(results) == len(paths)
+
+
+def test_fvalidate_many_truncated_and_non_object_files(tmp_path, port_schema):
+    """test truncated archives & documents that aren't objects are invalid"""
+    document = json.dumps({"port": 1, "pad": "x" * 4096}).encode()
+    for name, compress in (("a.json.gz", gzip.compress), ("a.json.xz", lzma.compress)):
+        compressed = compress(document)
+        (tmp_path / name).write_bytes(compressed[: len(compressed) // 2])
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w:gz") as tar:
+        for index in range(3):
+            member = tarfile.TarInfo(f"{index}.json")
+            member.size = len(document)
+            tar.addfile(member, io.BytesIO(document))
+    compressed = archive.getvalue()
+    (tmp_path / "a.tar.gz").write_bytes(compressed[: len(compressed) // 2])
+    (tmp_path / "list.json").write_text("[1]")
+    (tmp_path / "ok.json").write_text('{"port": 1}')
+    paths = sorted(str(jpath) for jpath in tmp_path.iterdir())
+    expected = {jpath: jpath.endswith("ok.json") for jpath in paths}
+    optional = [{"param_name": "pad", "param_type": str}]
+    results = JVal().fvalidate_many(paths, port_schema, optional, threads=2)
+    assert dict(results) == expected
+
+
+def test_fvalidate_many_non_object_archive_members(tmp_path, port_schema):
+    """test an archive with a member that isn't an object doesn't abort the batch"""
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        for name, data in (("a.json", b'{"port": 1}'), ("b.json", b"null")):
+            member = tarfile.TarInfo(name)
+            member.size = len(data)
+            tar.addfile(member, io.BytesIO(data))
+    (tmp_path / "a.tar").write_bytes(archive.getvalue())
+    (tmp_path / "ok.json").write_text('{"port": 1}')
+    paths = sorted(str(jpath) for jpath in tmp_path.iterdir())
+    results = JVal().fvalidate_many(paths, port_schema, threads=2)
+    assert dict(results) == {jpath: jpath.endswith("ok.json") for jpath in paths}
+
+
+def test_prefetch_completion_order_bounded():
+    """test reads are yielded as they complete with a bounded number in flight"""
+    in_flight = []
+    lock = threading.Lock()
+    active = [0]
+
+    def read(delay):
+        with lock:
+            active[0] += 1
+            in_flight.append(active[0])
+        time.sleep(float(delay))
+        with lock:
+            active[0] -= 1
+        return delay
+
+    delays = ["0.05", "0.0", "0.0", "0.0"]
+    order = [path for path, _ in prefetch(delays, read, threads=4, read_ahead=4)]
+    assert order[-1] == "0.05"
+    assert max(in_flight) <= 4
+    many = [str(0.001)] * 50
+    assert len(list(prefetch(many, read, threads=8, read_ahead=3))) == 50
+    assert max(in_flight) <= 4
+
+
+def test_prefetch_shares_threads():
+    """test calls reuse the same reader threads instead of starting new ones"""
+    idents = set()
+
+    def read(_):
+        idents.add(threading.get_ident())
+        time.sleep(0.001)
+
+    for _ in range(10):
+        assert len(list(prefetch(range(16), read, threads=2))) == 16
+    before = threading.active_count()
+    list(prefetch(range(16), read, threads=2))
+    assert threading.active_count() == before
+    assert len(idents) <= 8
@@ -0,0 +1,69 @@
+"""
+    tests for jval compiled schema cache & prewarming
+"""
+import gc
+
+from jval import JVal
+from jval.prewarm import compiled, prewarm, prewarm_from_env
+
+SCHEMAS = {
+    "env_port": ([{"param_name": "env_port", "param_type": int}], None),
+    "env_host": ([{"param_name": "env_host", "param_type": str}], None),
+}
+MALFORMED = [
+    ([{"param_name": "env_bad", "param_type": int, "possible_values": "x"}], None),
+    "not a pair",
+    ([{"param_name": "env_good", "param_type": int}], None),
+]
+
+
+def test_compiled_is_cached(schema):
+    """test schemas are compiled once & shared by equal schemas"""
+    expected, optional = schema
+    assert compiled(expected, optional) is compiled(list(expected), list(optional))
+    assert compiled(expected) is not compiled(expected, optional)
+
+
+def test_compiled_after_in_place_change():
+    """test a schema modified in place isn't answered with its old compiled form"""
+    expected = [{"param_name": "changed", "param_type": int}]
+    assert compiled(expected).validate({"changed": 1})
+    expected[0]["param_type"] = str
+    assert compiled(expected).validate({"changed": "1"})
+    assert not compiled(expected).validate({"changed": 1})
+
+
+def test_prewarm_freezes():
+    """test prewarmed schemas are used by the validator & frozen out of the gc"""
+    expected = [{"param_name": "frozen", "param_type": int}]
+    before = compiled(expected)
+    try:
+        assert prewarm([(expected, None)]) == 1
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+    assert prewarm([(expected, None)], freeze=False) == 0
+    assert compiled(expected) is before
+    assert JVal().validate_batch([{"frozen": 1}], expected=expected) == [True]
+
+
+def test_prewarm_from_env(monkeypatch):
+    """test schemas named by the environment variable are prewarmed"""
+    monkeypatch.setenv(
+        "JVAL_PREWARM", "tests.test_prewarm:SCHEMAS, tests.test_prewarm:missing"
+    )
+    try:
+        assert prewarm_from_env() == 2
+    finally:
+        gc.unfreeze()
+    monkeypatch.setenv("JVAL_PREWARM", "")
+    assert prewarm_from_env() == 0
+
+
+def test_prewarm_from_env_skips_malformed(monkeypatch):
+    """test malformed schemas are skipped instead of failing the import"""
+    monkeypatch.setenv("JVAL_PREWARM", "tests.test_prewarm:MALFORMED")
+    try:
+        assert prewarm_from_env() == 1
+    finally:
+        gc.unfreeze()
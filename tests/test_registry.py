@@ -0,0 +1,143 @@
+"""
+    tests for jval schema registry
+"""
+import json
+import os
+
+import pytest
+
+from jval import SchemaRegistry
+from jval.registry import load_definition
+from jval.schema import memory_size
+
+
+def _write(path, definition, mtime_ns=None):
+    """write a schema definition to a file"""
+    with open(path, "w", encoding="utf-8") as sfile:
+        json.dump(definition, sfile)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_registry_versions(port_schema):
+    """test lookups default to the latest version in natural order"""
+    registry = SchemaRegistry()
+    registry.register("port", "2", expected=port_schema)
+    registry.register(
+        "port", "10", expected=[{"param_name": "port", "param_type": str}]
+    )
+    assert "port" in registry and "host" not in registry
+    assert registry.versions("port") == ["2", "10"]
+    assert registry.validate({"port": "1"}, "port")
+    assert registry.validate({"port": 1}, "port", "2")
+    assert not registry.validate({"port": 1}, "port")
+    with pytest.raises(KeyError):
+        registry.get("host")
+
+
+def test_registry_compiles_once(port_schema):
+    """test schemas are compiled on first use only"""
+    registry = SchemaRegistry()
+    registry.register("port", "1", expected=port_schema)
+    assert registry.get("port") is registry.get("port")
+    assert registry.stats.snapshot() == {"misses": 1, "hits": 1}
+    registry.register("port", "1", expected=[{"param_name": "port", "param_type": str}])
+    assert registry.validate({"port": "1"}, "port")
+
+
+def test_registry_evicts_by_entries(port_schema):
+    """test the least recently used compiled schemas are evicted"""
+    registry = SchemaRegistry(max_entries=10)
+    for version in range(10):
+        registry.register("port", str(version), expected=port_schema)
+    kept = registry.get("port", "0")
+    for version in range(1, 10):
+        registry.get("port", str(version))
+    registry.get("port", "0")
+    registry.register("port", "10", expected=port_schema)
+    registry.get("port", "10")
+    # evicted down to 90% of the budget, oldest first
+    assert registry.stats.snapshot()["evictions"] == 2
+    assert registry.get("port", "0") is kept
+    assert len(registry) == 11
+
+
+def test_registry_evicts_by_bytes(schema):
+    """test compiled schemas are kept within a memory budget"""
+    expected, optional = schema
+    registry = SchemaRegistry(max_bytes=1)
+    registry.register("source", "1", expected=expected, optional=optional)
+    assert memory_size([registry.get("source")]) > 1
+    assert registry.stats.snapshot()["evictions"] == 1
+    registry.get("source")
+    assert registry.stats.snapshot()["misses"] == 2
+
+
+def test_load_definition(tmp_path, schema, document):
+    """test type names are resolved at every level"""
+    expected, optional = schema
+    names = {str: "str", int: "int", dict: "dict", list: "list"}
+
+    def spell(keys):
+        """replace types by their names"""
+        spelled = []
+        for key in keys:
+            key = dict(key, param_type=names[key["param_type"]])
+            for nested in ("expected", "optional"):
+                if nested in key:
+                    key[nested] = spell(key[nested])
+            if "conditional" in key:
+                key["conditional"] = dict(
+                    key["conditional"],
+                    dependence_info={
+                        value: {name: spell(keys) for name, keys in info.items()}
+                        for value, info in key["conditional"]["dependence_info"].items()
+                    },
+                )
+            spelled.append(key)
+        return spelled
+
+    _write(
+        tmp_path / "source@1.json",
+        {"expected": spell(expected), "optional": spell(optional)},
+    )
+    assert load_definition(str(tmp_path / "source@1.json")) == (expected, optional)
+    registry = SchemaRegistry(str(tmp_path))
+    assert registry.validate(document, "source")
+
+
+def test_registry_reload(tmp_path):
+    """test reloads pick up added, changed & removed files"""
+    _write(
+        tmp_path / "port@1.json",
+        {"expected": [{"param_name": "port", "param_type": "int"}]},
+    )
+    _write(tmp_path / "ignored.txt", {})
+    registry = SchemaRegistry(str(tmp_path))
+    assert registry.versions("port") == ["1"]
+    old = registry.get("port")
+    assert registry.reload() == 0
+    _write(
+        tmp_path / "port@1.json",
+        {"expected": [{"param_name": "port", "param_type": ["int", "str"]}]},
+        mtime_ns=0,
+    )
+    _write(
+        tmp_path / "host@1.json",
+        {"expected": [{"param_name": "host", "param_type": "str"}]},
+    )
+    assert registry.reload() == 2
+    # validations in flight keep the schema they hold
+    assert not old.validate({"port": "1"})
+    assert registry.validate({"port": "1"}, "port")
+    assert registry.validate({"host": "localhost"}, "host")
+    # unloadable definitions keep their previous version
+    _write(
+        tmp_path / "port@1.json",
+        {"expected": [{"param_name": "port", "param_type": "integer"}]},
+        mtime_ns=1,
+    )
+    os.remove(tmp_path / "host@1.json")
+    assert registry.reload() == 1
+    assert "host" not in registry
+    assert registry.validate({"port": "1"}, "port")
@@ -0,0 +1,142 @@
+"""
+    tests for jval discriminator routing
+"""
+import json
+import zipfile
+
+import pytest
+
+from jval import JVal, Router
+from jval.cache import ResultCache
+from jval.schema import compile_schema
+
+
+@pytest.fixture
+def router():
+    """router over two event types"""
+    return Router(
+        "type",
+        {
+            "click": (
+                [
+                    {"param_name": "type", "param_type": str},
+                    {"param_name": "x", "param_type": int},
+                ],
+                None,
+            ),
+            "view": compile_schema(
+                [
+                    {"param_name": "type", "param_type": str},
+                    {"param_name": "page", "param_type": str},
+                ]
+            ),
+        },
+    )
+
+
+@pytest.fixture
+def events():
+    """mixed valid & invalid events"""
+    return [
+        {"type": "click", "x": 1},
+        {"type": "view", "page": "/"},
+        {"type": "click", "page": "/"},
+        {"type": "view", "page": 1},
+        {"type": "scroll"},
+        {"type": ["click"], "x": 1},
+        {"x": 1},
+        "click",
+        {"type": "view", "page": "/about"},
+    ]
+
+
+def test_router_validate(router, events):  # pylint: disable=redefined-outer-name
+    """test objects are validated against the schema their discriminator selects"""
+    results = [True, True, False, False, False, False, False, False, True]
+    assert [router.validate(event) for event in events] == results
+    assert router.schema_for(events[1]) is router.table["view"]
+    assert router.schema_for(events[4]) is None
+
+
+def test_router_batch(router, events):  # pylint: disable=redefined-outer-name
+    """test batches give the same results as routing objects one by one"""
+    assert router.validate_batch(events) == [router.validate(event) for event in events]
+    assert JVal().validate_batch(events, router=router) == router.validate_batch(events)
+
+
+def test_router_streams(
+    tmp_path, router, events  # pylint: disable=redefined-outer-name
+):
+    """test routers work with the streaming validators"""
+    results = [router.validate(event) for event in events]
+    with open(tmp_path / "events.json", "w", encoding="utf-8") as jfile:
+        json.dump(events, jfile)
+    with open(tmp_path / "events.ndjson", "w", encoding="utf-8") as jfile:
+        jfile.write("\n".join(json.dumps(event) for event in events))
+    validator = JVal()
+    array = validator.fvalidate_array(str(tmp_path / "events.json"), router=router)
+    assert [result for _, result in array] == results
+    ndjson = validator.fvalidate_ndjson(str(tmp_path / "events.ndjson"), router=router)
+    assert [result for _, result in ndjson] == results
+    buffer = " ".join(json.dumps(event) for event in events).encode()
+    assert [
+        result for _, _, result in validator.validate_buffer(buffer, router=router)
+    ] == results
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_router_validate_ndjson(
+    router, events, backend  # pylint: disable=redefined-outer-name
+):
+    """test routers work with the parallel NDJSON validator"""
+    buffer = "\n".join(json.dumps(event) for event in events).encode()
+    results = [(line, router.validate(event)) for line, event in enumerate(events, 1)]
+    for processes in (1, 2):
+        assert (
+            JVal().validate_ndjson(
+                buffer, processes=processes, backend=backend, router=router
+            )
+            == results
+        )
+
+
+def test_router_archives(
+    tmp_path, router, events  # pylint: disable=redefined-outer-name
+):
+    """test routers work with archives & many-file validation"""
+    with zipfile.ZipFile(tmp_path / "events.zip", "w") as archive:
+        for index, event in enumerate(events):
+            archive.writestr(f"{index}.json", json.dumps(event))
+    paths = []
+    for index, event in enumerate(events):
+        paths.append(str(tmp_path / f"{index}.json"))
+        with open(paths[-1], "w", encoding="utf-8") as jfile:
+            json.dump(event, jfile)
+    results = {
+        f"{index}.json": router.validate(event) for index, event in enumerate(events)
+    }
+    validator = JVal()
+    for processes in (None, 2):
+        assert (
+            validator.avalidate(
+                str(tmp_path / "events.zip"), processes=processes, router=router
+            )
+            == results
+        )
+    many = dict(validator.fvalidate_many(paths, router=router))
+    assert many == {str(tmp_path / name): result for name, result in results.items()}
+    assert dict(
+        validator.fvalidate_many([str(tmp_path / "events.zip")], router=router)
+    ) == {str(tmp_path / "events.zip"): False}
+
+
+def test_router_cache_key(tmp_path, router):  # pylint: disable=redefined-outer-name
+    """test cached results of routed & plain validation are kept apart"""
+    jpath = str(tmp_path / "click.json")
+    with open(jpath, "w", encoding="utf-8") as jfile:
+        json.dump({"type": "click", "x": 1}, jfile)
+    validator = JVal(cache=ResultCache(str(tmp_path / "cache.sqlite")))
+    plain = [{"param_name": "page", "param_type": str}]
+    for _ in range(2):
+        assert dict(validator.fvalidate_many([jpath], router=router)) == {jpath: True}
+        assert dict(validator.fvalidate_many([jpath], plain)) == {jpath: False}
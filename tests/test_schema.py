@@ -0,0 +1,106 @@
+"""
+    tests for jval compiled schemas
+"""
+from jval import JVal
+from jval.schema import compile_schema, memory_size
+from jval.stats import STATS
+
+
+def test_compiled_schema_matches_validate(schema, variant):
+    """test compiled schemas give the same results as the validator"""
+    expected, optional = schema
+    assert compile_schema(expected, optional).validate(variant) is JVal().validate(
+        variant, expected=expected, optional=optional
+    )
+
+
+def test_compiled_schema_skips_unreachable_checks():
+    """test keys after the first conditional key are only presence & type checked"""
+    expected = [
+        {
+            "param_name": "info",
+            "param_type": dict,
+            "conditional": {
+                "depends_on": "kind",
+                "dependence_info": {"a": {"expected": [], "optional": []}},
+            },
+        },
+        {"param_name": "kind", "param_type": str, "possible_values": ["b"]},
+    ]
+    compiled = compile_schema(expected)
+    assert [check.name for check in compiled.deep] == ["info"]
+    assert compiled.validate({"info": {}, "kind": "a"}) is JVal().validate(
+        {"info": {}, "kind": "a"}, expected=expected
+    )
+
+
+def test_conditional_branches_compiled_lazily(schema, document):
+    """test branches are compiled on first use & counted each time they're selected"""
+    expected, optional = schema
+    compiled = compile_schema(expected, optional)
+    branches = compiled.deep[-1].branches
+    assert len(branches) == 2 and "local" in branches and not branches.compiled
+    size = memory_size([compiled])
+    assert compiled.validate(document)
+    assert compiled.validate(document)
+    assert list(branches.compiled) == [document["source_type"]]
+    assert memory_size([compiled]) > size
+    assert compiled.branch_stats() == {"source_info": {document["source_type"]: 2}}
+    assert compiled.expand() is compiled
+    assert len(branches.compiled) == 2
+    assert compiled.branch_stats() == {"source_info": {document["source_type"]: 2}}
+
+
+def test_identical_nested_schemas_shared():
+    """test identical nested schemas compile to one node & saved memory is counted"""
+
+    def block(name):
+        """nested key with the same connection block"""
+        return {
+            "param_name": name,
+            "param_type": dict,
+            "expected": [
+                {"param_name": "host", "param_type": str},
+                {"param_name": "port", "param_type": int, "possible_values": [1, 2]},
+            ],
+        }
+
+    before = STATS.snapshot().get("interned_bytes", 0)
+    first = compile_schema([block("source"), block("sink")])
+    second = compile_schema([block("store")])
+    assert first.deep[0].expected is first.deep[1].expected is second.deep[0].expected
+    saved = STATS.snapshot()["interned_bytes"] - before
+    assert saved >= memory_size([second.deep[0].expected])
+    assert memory_size([first]) < memory_size([second]) * 2
+    other = compile_schema(
+        [dict(block("store"), expected=[{"param_name": "host", "param_type": bytes}])]
+    )
+    assert other.deep[0].expected is not second.deep[0].expected
+    assert first.validate({"source": {"host": "h", "port": 1}, "sink": {}}) is False
+
+
+def test_shared_node_branch_stats():
+    """test branch counts of a shared node add up selections through every parent"""
+    port = {"expected": [{"param_name": "port", "param_type": int}], "optional": []}
+    nested = {
+        "param_name": "conn",
+        "param_type": dict,
+        "expected": [
+            {"param_name": "proto", "param_type": str},
+            {
+                "param_name": "settings",
+                "param_type": dict,
+                "conditional": {
+                    "depends_on": "proto",
+                    "dependence_info": {"tcp": port, "udp": port},
+                },
+            },
+        ],
+    }
+    first = compile_schema([nested])
+    second = compile_schema([dict(nested)])
+    shared = first.deep[0].expected
+    assert shared is second.deep[0].expected
+    for parent, proto in ((first, "tcp"), (second, "tcp"), (second, "udp")):
+        assert parent.validate({"conn": {"proto": proto, "settings": {"port": 1}}})
+    assert shared.branch_stats() == {"settings": {"tcp": 2, "udp": 1}}
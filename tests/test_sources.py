@@ -0,0 +1,76 @@
+"""
+    tests for jval compressed input sources
+"""
+import bz2
+import gzip
+import json
+import lzma
+
+import pytest
+
+from jval import JVal, sources
+from jval.sources import detect_compression, open_source
+
+COMPRESSORS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open, None: open}
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS))
+def test_open_source_detects_compression(tmp_path, compression):
+    """test compressed files are detected & decompressed"""
+    jpath = str(tmp_path / "data")
+    with COMPRESSORS[compression](jpath, "wb") as jfile:
+        jfile.write(b'{"port": 1}')
+    with open(jpath, "rb") as jfile:
+        assert detect_compression(jfile) == compression
+        assert jfile.tell() == 0
+    with open_source(jpath) as jfile:
+        assert jfile.read() == b'{"port": 1}'
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS))
+def test_fvalidate_compressed(tmp_path, port_schema, compression):
+    """test single documents are validated from compressed files"""
+    jpath = str(tmp_path / "data.json.z")
+    with COMPRESSORS[compression](jpath, "wb") as jfile:
+        jfile.write(b'{"port": 1}')
+    assert JVal().fvalidate(jpath, expected=port_schema) is True
+
+
+def test_fvalidate_ndjson_compressed(tmp_path, port_schema):
+    """test line-delimited documents are validated line by line"""
+    jpath = str(tmp_path / "data.ndjson.gz")
+    with gzip.open(jpath, "wt", encoding="utf-8") as jfile:
+        jfile.write(json.dumps({"port": 1}) + "\n")
+        jfile.write("\n")
+        jfile.write(json.dumps({"port": "1"}) + "\n")
+        jfile.write("{broken\n")
+    assert list(JVal().fvalidate_ndjson(jpath, expected=port_schema)) == [
+        (1, True),
+        (3, False),
+        (4, False),
+    ]
+
+
+def test_fvalidate_ndjson_non_object_lines(tmp_path, port_schema):
+    """test lines that are valid JSON but not objects are invalid"""
+    jpath = tmp_path / "data.ndjson"
+    jpath.write_text('[1]\n"port"\n{"port": 1}\nnull\n')
+    assert list(JVal().fvalidate_ndjson(str(jpath), expected=port_schema)) == [
+        (1, False),
+        (2, False),
+        (3, True),
+        (4, False),
+    ]
+
+
+def test_corrupt_zstd_read_error(tmp_path, port_schema):
+    """test corrupt zstd files raise one of READ_ERRORS & are reported as invalid"""
+    if sources.zstd is None:
+        pytest.skip("zstd is not available")
+    assert sources.zstd.ZstdError in sources.READ_ERRORS
+    jpath = str(tmp_path / "data.json.zst")
+    with open(jpath, "wb") as jfile:
+        jfile.write(b"\x28\xb5\x2f\xfd" + b"\xff" * 64)
+    with pytest.raises(sources.READ_ERRORS):
+        sources.read_source(jpath)
+    assert dict(JVal().fvalidate_many([jpath], port_schema)) == {jpath: False}
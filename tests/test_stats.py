@@ -0,0 +1,101 @@
+"""
+    tests for jval thread safety & per-thread counters
+"""
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from jval import JVal
+from jval.cache import ResultCache
+from jval.prewarm import compiled
+from jval.stats import Counters
+
+
+def test_counters_sum_threads():
+    """test counts incremented from many threads add up"""
+    counters = Counters()
+
+    def count(_):
+        for _ in range(1000):
+            counters.incr("calls")
+        return counters.incr("calls", 0)
+
+    with ThreadPoolExecutor(8) as pool:
+        per_thread = list(pool.map(count, range(16)))
+    assert counters.snapshot() == {"calls": 16000}
+    assert all(calls % 1000 == 0 for calls in per_thread)
+
+
+def test_threads_share_compiled_schema(schema, variants):
+    """test threads racing to compile a schema agree on one copy & results"""
+    raced = [{"param_name": "raced", "param_type": int}]
+    with ThreadPoolExecutor(8) as pool:
+        schemas = set(pool.map(lambda _: id(compiled(raced)), range(64)))
+        results = list(
+            pool.map(lambda _: JVal().validate_batch(variants, *schema), range(64))
+        )
+    assert len(schemas) == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_result_cache_threads(tmp_path, port_schema):
+    """test the result cache can be used from many threads at once"""
+    paths = []
+    for index in range(32):
+        jpath = tmp_path / f"{index}.json"
+        jpath.write_text(f'{{"port": {index}}}' if index % 2 else '{"port": "x"}')
+        paths.append(str(jpath))
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    validator = JVal(cache=cache)
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(3):
+            results = list(
+                pool.map(lambda path: validator.fvalidate(path, port_schema), paths)
+            )
+            assert results == [bool(index % 2) for index in range(32)]
+    assert len(cache) == 32
+    cache.close()
+
+
+def test_counters_fold_exited_threads():
+    """test counts of exited threads survive their tables being folded"""
+    counters = Counters()
+    for _ in range(20):
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda _: counters.incr("calls"), range(8)))
+        assert counters.snapshot()["calls"] % 8 == 0
+    counters.incr("calls")
+    assert counters.snapshot() == {"calls": 161}
+
+
+def test_result_cache_closes_exited_threads(tmp_path, monkeypatch):
+    """test connections of exited threads are closed & their hits kept"""
+    connections = []
+    sqlite_connect = sqlite3.connect
+
+    def connect(*args, **kwargs):
+        connections.append(sqlite_connect(*args, **kwargs))
+        return connections[-1]
+
+    monkeypatch.setattr("jval.cache.sqlite3.connect", connect)
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_entries=None)
+    for index in range(4):
+        cache.put("schema", f"file-{index}", True)
+    for _ in range(20):
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda _: cache.get("schema", "file-0"), range(8)))
+    # hits recorded by exited threads still count as recent use
+    assert cache.prune(max_entries=1) == 3
+    assert cache.get("schema", "file-0") is True
+    # only the calling thread's connection is left open
+    assert sum(map(_is_open, connections)) == 1
+    cache.close()
+    assert not any(map(_is_open, connections))
+
+
+def _is_open(conn):
+    """whether a connection is still open"""
+    try:
+        conn.total_changes  # pylint: disable=pointless-statement
+    except sqlite3.ProgrammingError:
+        return False
+    return True
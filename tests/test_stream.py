@@ -0,0 +1,97 @@
+"""
+    tests for jval streaming validation
+"""
+import io
+import json
+import mmap
+
+import pytest
+
+from jval import JVal
+from jval.stream import iter_array, iter_concatenated
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 16])
+def test_iter_array_chunk_boundaries(chunk_size):
+    """test elements are decoded regardless of where chunks split them"""
+    elements = [{"port": 1}, 12345, "ünïcode", [1, [2]], None, True, -1.5e3, {}]
+    data = ("﻿ [ " + " ,\n ".join(json.dumps(e) for e in elements) + " ] ").encode()
+    assert list(iter_array(io.BytesIO(data), chunk_size=chunk_size)) == elements
+
+
+@pytest.mark.parametrize("data", [b"", b"{}", b"[1 2]", b"[1,", b"[{]"])
+def test_iter_array_malformed(data):
+    """test malformed arrays raise decode errors"""
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array(io.BytesIO(data), chunk_size=2))
+
+
+def test_iter_array_malformed_read_stops(monkeypatch):
+    """test malformed values are reported without reading the rest of the stream"""
+    data = b'[{"a": 1 "b": 2}, ' + b"1, " * 100_000 + b"1]"
+    jfile = io.BytesIO(data)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array(jfile, chunk_size=64))
+    assert jfile.tell() < 1024
+    # values cut off by the end of the buffer only grow it up to the limit
+    monkeypatch.setattr("jval.stream.STREAM_MAX_VALUE", 256)
+    assert list(iter_array(io.BytesIO(b'["' + b"x" * 200 + b'"]'), 16)) == ["x" * 200]
+    jfile = io.BytesIO(b'["' + b"x" * 100_000 + b'"]')
+    with pytest.raises(json.JSONDecodeError, match="Value too large"):
+        list(iter_array(jfile, chunk_size=16))
+    assert jfile.tell() < 1024
+
+
+def test_fvalidate_array(tmp_path, port_schema):
+    """test every element of a top-level array is validated"""
+    jpath = tmp_path / "export.json"
+    jpath.write_text(json.dumps([{"port": 1}, {"port": "1"}, 3, {"port": 4}]))
+    assert list(JVal().fvalidate_array(str(jpath), expected=port_schema)) == [
+        (0, True),
+        (1, False),
+        (2, False),
+        (3, True),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 16])
+def test_iter_concatenated_offsets(chunk_size):
+    """test values are decoded in place with byte offsets into the buffer"""
+    elements = [{"port": 1}, {"ü": "é" * 3}, 12345, [1, [2]], None, -1.5e3]
+    data = "".join(
+        json.dumps(e, ensure_ascii=False) + " " * (i % 2)
+        for i, e in enumerate(elements)
+    ).encode()
+    decoded = list(iter_concatenated(memoryview(data), chunk_size=chunk_size))
+    assert [value for _, _, value in decoded] == elements
+    for offset, length, value in decoded:
+        assert json.loads(data[offset : offset + length]) == value
+
+
+def test_iter_concatenated_window_growth(monkeypatch):
+    """test windows only grow for values cut off by their end, up to the limit"""
+    decoded = []
+    with pytest.raises(json.JSONDecodeError) as err:
+        for value in iter_concatenated(b'{"a": 1} {"a" 1} ' + b"1 " * 100_000, 16):
+            decoded.append(value)
+    assert decoded == [(0, 8, {"a": 1})] and err.value.pos < 16
+    monkeypatch.setattr("jval.stream.STREAM_MAX_VALUE", 256)
+    data = b'"' + b"x" * 200 + b'" 1'
+    assert [value for _, _, value in iter_concatenated(data, 16)] == ["x" * 200, 1]
+    with pytest.raises(json.JSONDecodeError, match="Value too large"):
+        list(iter_concatenated(b'"' + b"x" * 100_000 + b'"', 16))
+
+
+def test_validate_buffer_mmap(tmp_path, port_schema):
+    """test concatenated objects are validated straight from an mmap"""
+    jpath = tmp_path / "log.json"
+    jpath.write_bytes(b'{"port": 1}{"port": "2"}\n{"port": 3}[]')
+    with open(jpath, "rb") as jfile, mmap.mmap(
+        jfile.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buffer:
+        assert list(JVal().validate_buffer(buffer, expected=port_schema)) == [
+            (0, 11, True),
+            (11, 13, False),
+            (25, 11, True),
+            (36, 2, False),
+        ]
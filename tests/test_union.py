@@ -0,0 +1,122 @@
+"""
+    tests for jval schema unions
+"""
+import itertools
+
+import pytest
+
+from jval import JVal, SchemaUnion
+
+ALTERNATIVES = [
+    (
+        [
+            {"param_name": "kind", "param_type": str},
+            {"param_name": "path", "param_type": str},
+        ],
+        [{"param_name": "mode", "param_type": int}],
+    ),
+    (
+        [
+            {"param_name": "kind", "param_type": str},
+            {"param_name": "url", "param_type": str},
+        ],
+        [{"param_name": "timeout", "param_type": (int, float)}],
+    ),
+    (
+        [
+            {"param_name": "kind", "param_type": str},
+            {"param_name": "url", "param_type": dict},
+        ],
+        None,
+    ),
+    (
+        [
+            {"param_name": "kind", "param_type": str},
+            {"param_name": "url", "param_type": str},
+            {"param_name": "token", "param_type": str},
+        ],
+        None,
+    ),
+]
+
+
+def _objects():
+    """objects made of every combination of a few values per key"""
+    values = {
+        "kind": [None, "a", 1],
+        "path": [None, "/", 1],
+        "url": [None, "u", {}],
+        "token": [None, "t"],
+        "timeout": [None, 1.5, "1"],
+    }
+    for combination in itertools.product(*values.values()):
+        yield {
+            name: value for name, value in zip(values, combination) if value is not None
+        }
+    yield "kind"
+
+
+@pytest.mark.parametrize("one_of", [False, True])
+def test_union_matches_each_alternative(one_of):
+    """test the decision tree finds the same alternatives as trying each in turn"""
+    union = SchemaUnion(ALTERNATIVES, one_of=one_of)
+    validator = JVal()
+    for jobj in _objects():
+        found = [
+            index
+            for index, (expected, optional) in enumerate(ALTERNATIVES)
+            if isinstance(jobj, dict)
+            and validator.validate(jobj, expected=expected, optional=optional)
+        ]
+        if one_of:
+            assert union.matches(jobj) == found
+            assert union.match(jobj) == (found[0] if len(found) == 1 else None)
+        else:
+            assert union.match(jobj) == (found[0] if found else None)
+        assert union.validate(jobj) == (union.match(jobj) is not None)
+
+
+def test_union_tree():
+    """test shared checks are hoisted & alternatives pruned before validation"""
+    union = SchemaUnion(ALTERNATIVES)
+    assert union.shared == (("kind", str),)
+    assert union.alternatives[0].required[0][0] == "kind"
+    # the shared checks rule out objects before the tree is walked
+    assert union.candidates({"path": "/"}) == ()
+    assert union.candidates({"kind": 1, "path": "/"}) == ()
+    # a single alternative is left to validate once the tree has been walked
+    for jobj in ({"kind": "a", "path": "/"}, {"kind": "a", "url": {}}):
+        assert len(union.candidates(jobj)) == 1
+    assert union.match({"kind": "a", "url": {}}) == 2
+    assert union.match({"kind": "a", "url": "u", "token": "t"}) == 3
+    assert union.match({"kind": "a", "url": "u", "timeout": 1}) == 1
+    assert union.match({"url": "u"}) is None
+
+
+def test_union_one_of():
+    """test oneOf rejects objects matching several alternatives"""
+    twice = ([{"param_name": "a", "param_type": int}], None)
+    assert SchemaUnion([twice, twice]).match({"a": 1}) == 0
+    assert SchemaUnion([twice, twice], one_of=True).match({"a": 1}) is None
+    assert SchemaUnion([]).match({"a": 1}) is None
+
+
+def test_union_key_test():
+    """test alternatives told apart by a key of their own are found in one step"""
+    alternatives = [
+        (
+            [
+                {"param_name": "id", "param_type": int},
+                {"param_name": name, "param_type": int},
+            ],
+            None,
+        )
+        for name in "abcd"
+    ]
+    union = SchemaUnion(alternatives)
+    assert union.root.kind == "key"
+    assert sorted(union.root.by_key) == ["a", "b", "c", "d"]
+    assert union.match({"id": 1, "c": 1}) == 2
+    assert union.match({"id": 1, "c": "1"}) is None
+    assert union.match({"id": 1, "a": 1, "c": 1}) is None
+    assert union.match({"id": 1}) is None
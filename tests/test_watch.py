@@ -0,0 +1,69 @@
+"""
+    tests for jval watch mode
+"""
+import json
+import os
+
+from jval import JVal
+
+
+def _write(path, jobj):
+    """write a JSON object to a file"""
+    with open(path, "w", encoding="utf-8") as jfile:
+        json.dump(jobj, jfile)
+
+
+def test_watcher_initial_poll(tmp_path, port_schema):
+    """test first poll validates every matching file"""
+    os.makedirs(tmp_path / "nested")
+    _write(tmp_path / "valid.json", {"port": 1})
+    _write(tmp_path / "nested" / "invalid.json", {"port": "1"})
+    _write(tmp_path / "ignored.txt", {"port": "1"})
+    watcher = JVal().watcher(str(tmp_path), expected=port_schema)
+    changed = watcher.poll()
+    assert changed == {
+        str(tmp_path / "valid.json"): True,
+        str(tmp_path / "nested" / "invalid.json"): False,
+    }
+
+
+def test_watcher_only_revalidates_changed(tmp_path, port_schema):
+    """test subsequent polls only report changed & removed files"""
+    _write(tmp_path / "one.json", {"port": 1})
+    _write(tmp_path / "two.json", {"port": 2})
+    watcher = JVal().watcher(str(tmp_path), expected=port_schema)
+    watcher.poll()
+    assert not watcher.poll()
+    _write(tmp_path / "one.json", {"port": "broken"})
+    os.utime(tmp_path / "one.json", ns=(0, 0))
+    os.remove(tmp_path / "two.json")
+    changed = watcher.poll()
+    assert changed == {
+        str(tmp_path / "one.json"): False,
+        str(tmp_path / "two.json"): None,
+    }
+    assert watcher.results == {str(tmp_path / "one.json"): False}
+
+
+def test_watcher_hash_skips_touched(tmp_path, port_schema):
+    """test touched files with unchanged content are not revalidated"""
+    _write(tmp_path / "one.json", {"port": 1})
+    watcher = JVal().watcher(str(tmp_path), expected=port_schema, use_hash=True)
+    watcher.poll()
+    os.utime(tmp_path / "one.json", ns=(0, 0))
+    assert not watcher.poll()
+
+
+def test_watcher_non_object_files(tmp_path, port_schema):
+    """test files that aren't JSON objects are invalid & don't end the watch"""
+    for name, jobj in (("null.json", None), ("five.json", 5), ("list.json", [])):
+        _write(tmp_path / name, jobj)
+    _write(tmp_path / "valid.json", {"port": 1})
+    watcher = JVal().watcher(str(tmp_path), expected=port_schema)
+    assert watcher.poll() == {
+        str(tmp_path / "null.json"): False,
+        str(tmp_path / "five.json"): False,
+        str(tmp_path / "list.json"): False,
+        str(tmp_path / "valid.json"): True,
+    }
+    assert JVal().fvalidate(str(tmp_path / "list.json"), expected=port_schema) is False